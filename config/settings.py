@@ -18,6 +18,9 @@ MANAGERS = ADMINS
 
 BASE_URL = 'http://pokeapi.co'
 
+# Seconds clients and caches may reuse an API response before revalidating its ETag
+API_CACHE_MAX_AGE = 60 * 60
+
 # Hosts/domain names that are valid for this site; required if DEBUG is False
 # See https://docs.djangoproject.com/en/1.5/ref/settings/#allowed-hosts
 ALLOWED_HOSTS = ['.pokeapi.co', 'localhost', '127.0.0.1']
@@ -47,6 +50,7 @@ SECRET_KEY = '4nksdock439320df*(^x2_scm-o$*py3e@-awu-n^hipkm%2l$sw$&2l#'
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'pokemon_v2.middleware.DataVersionETagMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -122,7 +126,7 @@ REST_FRAMEWORK = {
         'drf_ujson.renderers.UJSONRenderer',
     ),
 
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    'DEFAULT_PAGINATION_CLASS': 'pokemon_v2.pagination.PokeapiPagination',
 
     'PAGE_SIZE': 20,
 
@@ -1,4 +1,8 @@
-#  To build out the data you'll need to jump into the Django shell
+#  To build out the data run
+#
+#     $ python manage.py build_data
+#
+#  or jump into the Django shell
 #
 #     $ python manage.py shell
 #
@@ -9,81 +13,471 @@
 #
 #  Each time the build script is run it will iterate over each table in the database,
 #  wipe it and rewrite each row using the data found in data/v2/csv.
+#
+#  On PostgreSQL a full rebuild is faster with
+#
+#     $ build_all(defer_indexes=True)
+#
+#  which drops the secondary indexes and foreign keys while loading and recreates
+#  them once all the data is in place.
+#
+#  When only a few CSV rows changed use
+#
+#     $ build_all(incremental=True)
+#
+#  instead. Tables are then compared against the CSV files and only the rows that
+#  were added, changed or removed are written, so untouched tables are never emptied.
+#
+#  To refresh a PostgreSQL database that is serving traffic use
+#
+#     $ build_all(shadow=True)
+#
+#  The data is then loaded into a copy of the tables in a separate schema and swapped
+#  in within one transaction, so the API never sees empty or half-built tables.
+#
+#  A full build ends by rendering the detail response of every resource into the
+#  ResourceDocument table, which the API serves them from. Partial builds that change
+#  any rows drop the documents instead, unless they are asked to render them with
+#
+#     $ build_all(only=["moves"], documents=True)
+#
+#  Every build records a hash of the CSV files as the DataVersion, which the API uses
+#  to know when data it derived and cached has gone stale.
 
 
-import csv
 import os
 import os.path
 import re
 import json
-from django.db import connection
+import time
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache
+from cachalot.api import invalidate
+from cachalot.settings import cachalot_settings
+from django.apps import apps
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from pokemon_v2.datacache import DATA_CACHE
+from pokemon_v2.documents import materialize_documents
 from pokemon_v2.models import *
+from .csv_cache import corpus_hash, read_csv
+from .markup import render_plain
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
 
 
 # why this way? how about use `__file__`
 DATA_LOCATION = "data/v2/csv/"
 DATA_LOCATION2 = os.path.join(os.path.dirname(__file__), "csv")
-GROUP_RGX = r"\[(.*?)\]\{(.*?)\}"
-SUB_RGX = r"\[.*?\]\{.*?\}"
 
-DB_CURSOR = connection.cursor()
 DB_VENDOR = connection.vendor
 
 
 MEDIA_DIR = "/media/sprites/{0}"
 IMAGE_DIR = os.getcwd() + "/data/v2/sprites/"
-RESOURCE_IMAGES = []
+SPRITE_MANIFEST = os.path.join(os.path.dirname(__file__), ".sprite-manifest.json")
+
+# Sprite keys and the sub directory each of them is looked up in
+POKEMON_SPRITE_VARIANTS = (
+    ("front_default", ""),
+    ("front_female", "female/"),
+    ("front_shiny", "shiny/"),
+    ("front_shiny_female", "shiny/female/"),
+    ("back_default", "back/"),
+    ("back_female", "back/female/"),
+    ("back_shiny", "back/shiny/"),
+    ("back_shiny_female", "back/shiny/female/"),
+)
+POKEMON_FORM_SPRITE_VARIANTS = (
+    ("front_default", ""),
+    ("front_shiny", "shiny/"),
+    ("back_default", "back/"),
+    ("back_shiny", "back/shiny/"),
+)
+
+
+def scan_sprites():
+    directories = {}
+    images = []
+    for root, _, files in os.walk(IMAGE_DIR):
+        directories[root.replace(IMAGE_DIR, "")] = os.stat(root).st_mtime_ns
+        for file in files:
+            image_path = os.path.join(root.replace(IMAGE_DIR, ""), file)
+            image_path = image_path.replace("\\", "/")  # convert Windows-style path to Unix
+            images.append(image_path)
+    return {"directories": directories, "images": images}
+
+
+def sprite_manifest_is_fresh(manifest):
+    # Adding or removing a file changes the modification time of its directory
+    try:
+        return bool(manifest["directories"]) and all(
+            os.stat(os.path.join(IMAGE_DIR, directory)).st_mtime_ns == mtime
+            for directory, mtime in manifest["directories"].items()
+        )
+    except OSError:
+        return False
+
+
+@lru_cache(maxsize=None)
+def resource_images():
+    """
+    Returns the set of sprite paths relative to IMAGE_DIR. The listing is kept in
+    SPRITE_MANIFEST and the sprite tree is only walked again once one of its
+    directories has changed.
+    """
+    try:
+        with open(SPRITE_MANIFEST, "rt", encoding="utf8") as manifest_file:
+            manifest = json.load(manifest_file)
+    except (OSError, ValueError):
+        manifest = None
+
+    if manifest is None or not sprite_manifest_is_fresh(manifest):
+        manifest = scan_sprites()
+        try:
+            with open(SPRITE_MANIFEST, "wt", encoding="utf8") as manifest_file:
+                json.dump(manifest, manifest_file)
+        except OSError:
+            pass  # e.g. a read-only checkout, the tree is walked again next time
 
-for root, dirs, files in os.walk(IMAGE_DIR):
-    for file in files:
-        image_path = os.path.join(root.replace(IMAGE_DIR, ""), file)
-        image_path = image_path.replace("\\", "/")  # convert Windows-style path to Unix
-        RESOURCE_IMAGES.append(image_path)
+    return frozenset(manifest["images"])
 
 
 def file_path_or_none(file_name):
-    return MEDIA_DIR.format(file_name) if file_name in RESOURCE_IMAGES else None
+    return MEDIA_DIR.format(file_name) if file_name in resource_images() else None
 
 
-def with_iter(context, iterable=None):
-    if iterable is None:
-        iterable = context
-    with context:
-        for value in iterable:
-            yield value
+def sprite_variants(directory, variants, file_name):
+    return {
+        key: file_path_or_none(directory + sub_directory + file_name)
+        for key, sub_directory in variants
+    }
 
 
 def load_data(file_name):
-    # with_iter closes the file when it has finished
-    return csv.reader(
-        with_iter(open(DATA_LOCATION + file_name, "rt", encoding="utf8")), delimiter=","
-    )
+    # Rows come from the parse-once cache, integer columns already hold ints
+    return iter(read_csv(DATA_LOCATION + file_name))
+
+
+# Number of column values a single INSERT batch should carry. Narrow tables such as
+# PokemonMove get large batches, wide ones such as PokemonSpecies smaller ones.
+BATCH_VALUE_BUDGET = 20000
+
+# Explicit batch sizes for models where the budget heuristic is not a good fit.
+BATCH_SIZES = {}
+
+
+def batch_size_for(model_class):
+    if model_class in BATCH_SIZES:
+        return BATCH_SIZES[model_class]
+    return max(1, BATCH_VALUE_BUDGET // len(model_class._meta.concrete_fields))
+
+
+def dependent_models(model):
+    """
+    Returns the model followed by every model that references it through a foreign
+    key, directly or transitively. These are the rows a cascading delete would reach.
+    """
+    dependents = [model]
+    for current in dependents:
+        for relation in current._meta.related_objects:
+            if relation.related_model not in dependents:
+                dependents.append(relation.related_model)
+    return dependents
 
 
 def clear_table(model):
+    cursor = connection.cursor()
     table_name = model._meta.db_table
-    model.objects.all().delete()
     print("building " + table_name)
-    # Reset DB auto increments to start at 1
-    if DB_VENDOR == "sqlite":
-        DB_CURSOR.execute(
-            "DELETE FROM sqlite_sequence WHERE name = " + "'" + table_name + "'"
-        )
+    quote_name = connection.ops.quote_name
+    if DB_VENDOR == "postgresql":
+        # TRUNCATE ... CASCADE empties the referencing tables as well, like the ORM
+        # cascade did, without loading any rows into Python
+        cursor.execute(
+            "TRUNCATE TABLE " + quote_name(table_name) + " RESTART IDENTITY CASCADE"
+        )
+        return
+
+    # Delete the referencing tables first so immediate foreign key checks pass
+    # when no transaction is open
+    for dependent in reversed(dependent_models(model)):
+        dependent_table = dependent._meta.db_table
+        cursor.execute("DELETE FROM " + quote_name(dependent_table))
+        # Reset DB auto increments to start at 1
+        if DB_VENDOR == "sqlite":
+            cursor.execute(
+                "DELETE FROM sqlite_sequence WHERE name = %s", [dependent_table]
+            )
+
+
+SECONDARY_INDEXES_SQL = """
+    SELECT indexname, indexdef FROM pg_indexes
+    WHERE schemaname = current_schema() AND tablename = %s
+    AND indexname NOT IN (
+        SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass
+    )
+"""
+
+FOREIGN_KEYS_SQL = """
+    SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+    WHERE conrelid = %s::regclass AND contype = 'f'
+"""
+
+
+@contextmanager
+def deferred_indexes(model_list):
+    """
+    Drops the secondary indexes and foreign key constraints of the given models while
+    the block runs, then recreates every index and validates every constraint once at
+    the end. Loading into bare tables is much cheaper than maintaining the b-trees and
+    checking references row by row. Only PostgreSQL is supported; elsewhere the block
+    simply runs as is.
+
+    When the block fails they are still put back if the partly loaded rows allow it,
+    but the error of the block is the one raised.
+    """
+    if DB_VENDOR != "postgresql":
+        yield
+        return
+
+    model_list = list(model_list)
+    cursor = connection.cursor()
+    quote_name = connection.ops.quote_name
+    foreign_keys = []
+    indexes = []
+    with transaction.atomic():
+        for model in model_list:
+            table_name = model._meta.db_table
+            cursor.execute(FOREIGN_KEYS_SQL, [table_name])
+            for name, definition in cursor.fetchall():
+                foreign_keys.append((table_name, name, definition))
+        for table_name, name, definition in foreign_keys:
+            cursor.execute(
+                "ALTER TABLE %s DROP CONSTRAINT %s"
+                % (quote_name(table_name), quote_name(name))
+            )
+        for model in model_list:
+            table_name = model._meta.db_table
+            cursor.execute(SECONDARY_INDEXES_SQL, [table_name, table_name])
+            for name, definition in cursor.fetchall():
+                indexes.append(definition)
+                cursor.execute("DROP INDEX " + quote_name(name))
+    print("deferred %d indexes and %d foreign keys" % (len(indexes), len(foreign_keys)))
+
+    def restore():
+        print("recreating indexes and foreign keys")
+        with transaction.atomic():
+            for definition in indexes:
+                cursor.execute(definition)
+            for table_name, name, definition in foreign_keys:
+                cursor.execute(
+                    "ALTER TABLE %s ADD CONSTRAINT %s %s"
+                    % (quote_name(table_name), quote_name(name), definition)
+                )
+
+    try:
+        yield
+    except BaseException:
+        try:
+            restore()
+        except Exception as error:  # pylint: disable=broad-except
+            print("could not recreate the indexes and foreign keys: %s" % error)
+        raise
+    restore()
+
+
+SHADOW_SCHEMA = "pokeapi_shadow"
+RETIRED_SCHEMA = "pokeapi_retired"
+
+
+@contextmanager
+def cache_frozen(model_list):
+    """
+    Keeps cachalot from invalidating (or caching) the given models' tables while the
+    block runs, then invalidates them once if it succeeded.
+    """
+    uncachable_tables = frozenset(cachalot_settings.CACHALOT_UNCACHABLE_TABLES).union(
+        model._meta.db_table for model in model_list
+    )
+    try:
+        with override_settings(CACHALOT_UNCACHABLE_TABLES=uncachable_tables):
+            cachalot_settings.load()
+            yield
+    finally:
+        # Reads the configured settings again
+        cachalot_settings.load()
+    invalidate(*model_list)
+
+
+def count_rows(schema, table_name):
+    cursor = connection.cursor()
+    quote_name = connection.ops.quote_name
+    cursor.execute(
+        "SELECT COUNT(*) FROM %s.%s" % (quote_name(schema), quote_name(table_name))
+    )
+    return cursor.fetchone()[0]
+
+
+@contextmanager
+def shadow_schema(model_list):
+    """
+    Creates empty copies of the given models' tables in SHADOW_SCHEMA and points the
+    connection at them while the block runs, ahead of the live schema for the tables
+    that aren't copied. Afterwards the copies are checked and moved into the live
+    schema in a single transaction, while the tables they replace are dropped. The
+    live tables keep serving until that swap.
+    """
+    if DB_VENDOR != "postgresql":
+        raise ValueError("Shadow builds are only supported on PostgreSQL")
+
+    model_list = list(model_list)
+    cursor = connection.cursor()
+    quote_name = connection.ops.quote_name
+    shadow = quote_name(SHADOW_SCHEMA)
+    retired = quote_name(RETIRED_SCHEMA)
+
+    cursor.execute("SHOW search_path")
+    search_path = cursor.fetchone()[0]
+    cursor.execute("SELECT current_schema()")
+    live_schema = cursor.fetchone()[0]
+    live = quote_name(live_schema)
+
+    cursor.execute("DROP SCHEMA IF EXISTS %s CASCADE" % shadow)
+    cursor.execute("CREATE SCHEMA " + shadow)
+    cursor.execute("SET search_path TO %s, %s" % (shadow, live))
+    try:
+        with connection.schema_editor() as schema_editor:
+            for model in model_list:
+                schema_editor.create_model(model)
+        yield
+    finally:
+        cursor.execute("SET search_path TO " + search_path)
+
+    for model in model_list:
+        table_name = model._meta.db_table
+        shadow_rows = count_rows(SHADOW_SCHEMA, table_name)
+        if not shadow_rows and count_rows(live_schema, table_name):
+            raise RuntimeError(
+                "Shadow build left %s empty, keeping the live tables" % table_name
+            )
+
+    print("swapping in %d tables from %s" % (len(model_list), SHADOW_SCHEMA))
+    with transaction.atomic():
+        cursor.execute("DROP SCHEMA IF EXISTS %s CASCADE" % retired)
+        cursor.execute("CREATE SCHEMA " + retired)
+        for model in model_list:
+            table_name = quote_name(model._meta.db_table)
+            cursor.execute(
+                "ALTER TABLE %s.%s SET SCHEMA %s" % (live, table_name, retired)
+            )
+            cursor.execute(
+                "ALTER TABLE %s.%s SET SCHEMA %s" % (shadow, table_name, live)
+            )
+        cursor.execute("DROP SCHEMA %s CASCADE" % retired)
+        cursor.execute("DROP SCHEMA %s CASCADE" % shadow)
+
+
+def row_values(fields, obj):
+    return tuple(field.to_python(getattr(obj, field.attname)) for field in fields)
+
+
+def sync_table(model_class, objs):
+    """
+    Brings the table of model_class in line with objs while writing as little as
+    possible. Rows whose CSV carries an id are matched on that id and updated in place
+    when their values differ. Rows without an id (name and mapping tables) are matched
+    on their full contents, so a changed row shows up as a delete plus an insert.
+    """
+    table_name = model_class._meta.db_table
+    fields = [field for field in model_class._meta.concrete_fields if not field.primary_key]
+    attnames = [field.attname for field in fields]
+
+    existing = {}
+    for row in model_class.objects.values_list("pk", *attnames).iterator():
+        existing.setdefault(row[1:], []).append(row[0])
+
+    inserts = []
+    updates = []
+    if objs and all(obj.pk is not None for obj in objs):
+        current = {pk: values for values, pks in existing.items() for pk in pks}
+        for obj in objs:
+            values = row_values(fields, obj)
+            if obj.pk not in current:
+                inserts.append(obj)
+            elif current[obj.pk] != values:
+                updates.append((obj.pk, dict(zip(attnames, values))))
+            current.pop(obj.pk, None)
+        deletes = list(current)
     else:
-        DB_CURSOR.execute(
-            "SELECT setval(pg_get_serial_sequence("
-            + "'"
-            + table_name
-            + "'"
-            + ",'id'), 1, false);"
-        )
+        for obj in objs:
+            pks = existing.get(row_values(fields, obj))
+            if pks:
+                pks.pop()
+            else:
+                obj.pk = None
+                inserts.append(obj)
+        deletes = [pk for pks in existing.values() for pk in pks]
+
+    if not (inserts or updates or deletes):
+        return 0
+
+    print(
+        "syncing %s: %d inserted, %d updated, %d deleted"
+        % (table_name, len(inserts), len(updates), len(deletes))
+    )
+    # Deleting through the ORM keeps the cascade to referencing rows; there are
+    # few enough changed rows for that to be cheap
+    for start in range(0, len(deletes), 500):
+        model_class.objects.filter(pk__in=deletes[start : start + 500]).delete()
+    for pk, values in updates:
+        model_class.objects.filter(pk=pk).update(**values)
+    model_class.objects.bulk_create(inserts, batch_size=batch_size_for(model_class))
+    return len(inserts) + len(updates) + len(deletes)
+
+
+class BuildStage:
+    """
+    The state of a running stage, handed to its build function: whether its tables
+    are synced instead of rebuilt (see sync_generic), how many rows it built from the
+    CSV files and how many rows it wrote.
+    """
+
+    def __init__(self, incremental=False):
+        self.incremental = incremental
+        self.rows = 0
+        self.written = 0
+
+
+def sync_generic(stage, model_classes, file_name, csv_record_to_objects):
+    objs = {model_class: [] for model_class in model_classes}
 
+    csv_data = load_data(file_name)
+    next(csv_data, None)  # skip header
+
+    for csv_record in csv_data:
+        for obj in csv_record_to_objects(csv_record):
+            objs[type(obj)].append(obj)
+            stage.rows += 1
+
+    for model_class in model_classes:
+        stage.written += sync_table(model_class, objs[model_class])
+
+
+def build_generic(stage, model_classes, file_name, csv_record_to_objects):
+    if stage.incremental:
+        sync_generic(stage, model_classes, file_name, csv_record_to_objects)
+        return
 
-def build_generic(model_classes, file_name, csv_record_to_objects):
     batches = {}
+    batch_sizes = {}
     for model_class in model_classes:
         clear_table(model_class)
         batches[model_class] = []  # one batch per model class
+        batch_sizes[model_class] = batch_size_for(model_class)
 
     csv_data = load_data(file_name)
     next(csv_data, None)  # skip header
@@ -92,9 +486,11 @@ def build_generic(model_classes, file_name, csv_record_to_objects):
         for obj in csv_record_to_objects(csv_record):
             model_class = type(obj)
             batches[model_class].append(obj)
+            stage.rows += 1
+            stage.written += 1
 
             # Limit the batch size
-            if len(batches[model_class]) > 200:
+            if len(batches[model_class]) >= batch_sizes[model_class]:
                 model_class.objects.bulk_create(batches[model_class])
                 batches[model_class] = []
 
@@ -111,17 +507,9 @@ def scrub_str(string):
     Becomes:
         dragon tail will effect the opponents HP.
 
-    If you find this results in weird strings please take a stab at improving or re-writing.
+    The rendering itself lives in data/v2/markup.py, which make-database.py shares.
     """
-    groups = re.findall(GROUP_RGX, string)
-    for group in groups:
-        if group[0]:
-            sub = group[0]
-        else:
-            sub = group[1].split(":")[1]
-            sub = sub.replace("-", " ")
-        string = re.sub(SUB_RGX, sub, string, 1)
-    return string
+    return render_plain(string)
 
 
 ##############
@@ -129,7 +517,7 @@ def scrub_str(string):
 ##############
 
 
-def _build_languages():
+def _build_languages(stage):
     def csv_record_to_objects(info):
         yield Language(
             id=int(info[0]),
@@ -140,14 +528,14 @@ def _build_languages():
             order=info[5],
         )
 
-    build_generic((Language,), "languages.csv", csv_record_to_objects)
+    build_generic(stage, (Language,), "languages.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield LanguageName(
             language_id=int(info[0]), local_language_id=int(info[1]), name=info[2]
         )
 
-    build_generic((LanguageName,), "language_names.csv", csv_record_to_objects)
+    build_generic(stage, (LanguageName,), "language_names.csv", csv_record_to_objects)
 
 
 ############
@@ -155,16 +543,16 @@ def _build_languages():
 ############
 
 
-def _build_regions():
+def _build_regions(stage):
     def csv_record_to_objects(info):
         yield Region(id=int(info[0]), name=info[1])
 
-    build_generic((Region,), "regions.csv", csv_record_to_objects)
+    build_generic(stage, (Region,), "regions.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield RegionName(region_id=int(info[0]), language_id=int(info[1]), name=info[2])
 
-    build_generic((RegionName,), "region_names.csv", csv_record_to_objects)
+    build_generic(stage, (RegionName,), "region_names.csv", csv_record_to_objects)
 
 
 ################
@@ -172,18 +560,20 @@ def _build_regions():
 ################
 
 
-def _build_generations():
+def _build_generations(stage):
     def csv_record_to_objects(info):
         yield Generation(id=int(info[0]), region_id=int(info[1]), name=info[2])
 
-    build_generic((Generation,), "generations.csv", csv_record_to_objects)
+    build_generic(stage, (Generation,), "generations.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield GenerationName(
             generation_id=int(info[0]), language_id=int(info[1]), name=info[2]
         )
 
-    build_generic((GenerationName,), "generation_names.csv", csv_record_to_objects)
+    build_generic(
+        stage, (GenerationName,), "generation_names.csv", csv_record_to_objects
+    )
 
 
 #############
@@ -191,7 +581,7 @@ def _build_generations():
 #############
 
 
-def _build_versions():
+def _build_versions(stage):
     def csv_record_to_objects(info):
         yield VersionGroup(
             id=int(info[0]),
@@ -200,26 +590,26 @@ def _build_versions():
             order=int(info[3]),
         )
 
-    build_generic((VersionGroup,), "version_groups.csv", csv_record_to_objects)
+    build_generic(stage, (VersionGroup,), "version_groups.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield VersionGroupRegion(version_group_id=int(info[0]), region_id=int(info[1]))
 
     build_generic(
-        (VersionGroupRegion,), "version_group_regions.csv", csv_record_to_objects
+        stage, (VersionGroupRegion,), "version_group_regions.csv", csv_record_to_objects
     )
 
     def csv_record_to_objects(info):
         yield Version(id=int(info[0]), version_group_id=int(info[1]), name=info[2])
 
-    build_generic((Version,), "versions.csv", csv_record_to_objects)
+    build_generic(stage, (Version,), "versions.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield VersionName(
             version_id=int(info[0]), language_id=int(info[1]), name=info[2]
         )
 
-    build_generic((VersionName,), "version_names.csv", csv_record_to_objects)
+    build_generic(stage, (VersionName,), "version_names.csv", csv_record_to_objects)
 
 
 ##################
@@ -227,11 +617,13 @@ def _build_versions():
 ##################
 
 
-def _build_damage_classes():
+def _build_damage_classes(stage):
     def csv_record_to_objects(info):
         yield MoveDamageClass(id=int(info[0]), name=info[1])
 
-    build_generic((MoveDamageClass,), "move_damage_classes.csv", csv_record_to_objects)
+    build_generic(
+        stage, (MoveDamageClass,), "move_damage_classes.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield MoveDamageClassName(
@@ -244,6 +636,7 @@ def _build_damage_classes():
         )
 
     build_generic(
+        stage,
         (MoveDamageClassName, MoveDamageClassDescription),
         "move_damage_class_prose.csv",
         csv_record_to_objects,
@@ -255,7 +648,7 @@ def _build_damage_classes():
 ###########
 
 
-def _build_stats():
+def _build_stats(stage):
     def csv_record_to_objects(info):
         yield Stat(
             id=int(info[0]),
@@ -265,17 +658,19 @@ def _build_stats():
             game_index=int(info[4]) if info[4] else 0,
         )
 
-    build_generic((Stat,), "stats.csv", csv_record_to_objects)
+    build_generic(stage, (Stat,), "stats.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield StatName(stat_id=int(info[0]), language_id=int(info[1]), name=info[2])
 
-    build_generic((StatName,), "stat_names.csv", csv_record_to_objects)
+    build_generic(stage, (StatName,), "stat_names.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield PokeathlonStat(id=int(info[0]), name=info[1])
 
-    build_generic((PokeathlonStat,), "pokeathlon_stats.csv", csv_record_to_objects)
+    build_generic(
+        stage, (PokeathlonStat,), "pokeathlon_stats.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield PokeathlonStatName(
@@ -283,7 +678,7 @@ def _build_stats():
         )
 
     build_generic(
-        (PokeathlonStatName,), "pokeathlon_stat_names.csv", csv_record_to_objects
+        stage, (PokeathlonStatName,), "pokeathlon_stat_names.csv", csv_record_to_objects
     )
 
 
@@ -292,7 +687,7 @@ def _build_stats():
 # ###############
 
 
-def _build_abilities():
+def _build_abilities(stage):
     def csv_record_to_objects(info):
         yield Ability(
             id=int(info[0]),
@@ -301,21 +696,23 @@ def _build_abilities():
             is_main_series=bool(int(info[3])),
         )
 
-    build_generic((Ability,), "abilities.csv", csv_record_to_objects)
+    build_generic(stage, (Ability,), "abilities.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield AbilityName(
             ability_id=int(info[0]), language_id=int(info[1]), name=info[2]
         )
 
-    build_generic((AbilityName,), "ability_names.csv", csv_record_to_objects)
+    build_generic(stage, (AbilityName,), "ability_names.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield AbilityChange(
             id=int(info[0]), ability_id=int(info[1]), version_group_id=int(info[2])
         )
 
-    build_generic((AbilityChange,), "ability_changelog.csv", csv_record_to_objects)
+    build_generic(
+        stage, (AbilityChange,), "ability_changelog.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield AbilityEffectText(
@@ -325,7 +722,9 @@ def _build_abilities():
             effect=scrub_str(info[3]),
         )
 
-    build_generic((AbilityEffectText,), "ability_prose.csv", csv_record_to_objects)
+    build_generic(
+        stage, (AbilityEffectText,), "ability_prose.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield AbilityChangeEffectText(
@@ -335,7 +734,10 @@ def _build_abilities():
         )
 
     build_generic(
-        (AbilityChangeEffectText,), "ability_changelog_prose.csv", csv_record_to_objects
+        stage,
+        (AbilityChangeEffectText,),
+        "ability_changelog_prose.csv",
+        csv_record_to_objects,
     )
 
     def csv_record_to_objects(info):
@@ -347,7 +749,7 @@ def _build_abilities():
         )
 
     build_generic(
-        (AbilityFlavorText,), "ability_flavor_text.csv", csv_record_to_objects
+        stage, (AbilityFlavorText,), "ability_flavor_text.csv", csv_record_to_objects
     )
 
 
@@ -356,13 +758,15 @@ def _build_abilities():
 ####################
 
 
-def _build_characteristics():
+def _build_characteristics(stage):
     def csv_record_to_objects(info):
         yield Characteristic(
             id=int(info[0]), stat_id=int(info[1]), gene_mod_5=int(info[2])
         )
 
-    build_generic((Characteristic,), "characteristics.csv", csv_record_to_objects)
+    build_generic(
+        stage, (Characteristic,), "characteristics.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield CharacteristicDescription(
@@ -372,7 +776,10 @@ def _build_characteristics():
         )
 
     build_generic(
-        (CharacteristicDescription,), "characteristic_text.csv", csv_record_to_objects
+        stage,
+        (CharacteristicDescription,),
+        "characteristic_text.csv",
+        csv_record_to_objects,
     )
 
 
@@ -381,18 +788,18 @@ def _build_characteristics():
 ###############
 
 
-def _build_egg_groups():
+def _build_egg_groups(stage):
     def csv_record_to_objects(info):
         yield EggGroup(id=int(info[0]), name=info[1])
 
-    build_generic((EggGroup,), "egg_groups.csv", csv_record_to_objects)
+    build_generic(stage, (EggGroup,), "egg_groups.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield EggGroupName(
             egg_group_id=int(info[0]), language_id=int(info[1]), name=info[2]
         )
 
-    build_generic((EggGroupName,), "egg_group_prose.csv", csv_record_to_objects)
+    build_generic(stage, (EggGroupName,), "egg_group_prose.csv", csv_record_to_objects)
 
 
 #################
@@ -400,11 +807,11 @@ def _build_egg_groups():
 #################
 
 
-def _build_growth_rates():
+def _build_growth_rates(stage):
     def csv_record_to_objects(info):
         yield GrowthRate(id=int(info[0]), name=info[1], formula=info[2])
 
-    build_generic((GrowthRate,), "growth_rates.csv", csv_record_to_objects)
+    build_generic(stage, (GrowthRate,), "growth_rates.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield GrowthRateDescription(
@@ -412,7 +819,7 @@ def _build_growth_rates():
         )
 
     build_generic(
-        (GrowthRateDescription,), "growth_rate_prose.csv", csv_record_to_objects
+        stage, (GrowthRateDescription,), "growth_rate_prose.csv", csv_record_to_objects
     )
 
 
@@ -421,23 +828,27 @@ def _build_growth_rates():
 # ###########
 
 
-def _build_items():
+def _build_items(stage):
     def csv_record_to_objects(info):
         yield ItemPocket(id=int(info[0]), name=info[1])
 
-    build_generic((ItemPocket,), "item_pockets.csv", csv_record_to_objects)
+    build_generic(stage, (ItemPocket,), "item_pockets.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield ItemPocketName(
             item_pocket_id=int(info[0]), language_id=int(info[1]), name=info[2]
         )
 
-    build_generic((ItemPocketName,), "item_pocket_names.csv", csv_record_to_objects)
+    build_generic(
+        stage, (ItemPocketName,), "item_pocket_names.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield ItemFlingEffect(id=int(info[0]), name=info[1])
 
-    build_generic((ItemFlingEffect,), "item_fling_effects.csv", csv_record_to_objects)
+    build_generic(
+        stage, (ItemFlingEffect,), "item_fling_effects.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield ItemFlingEffectEffectText(
@@ -447,6 +858,7 @@ def _build_items():
         )
 
     build_generic(
+        stage,
         (ItemFlingEffectEffectText,),
         "item_fling_effect_prose.csv",
         csv_record_to_objects,
@@ -455,14 +867,16 @@ def _build_items():
     def csv_record_to_objects(info):
         yield ItemCategory(id=int(info[0]), item_pocket_id=int(info[1]), name=info[2])
 
-    build_generic((ItemCategory,), "item_categories.csv", csv_record_to_objects)
+    build_generic(stage, (ItemCategory,), "item_categories.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield ItemCategoryName(
             item_category_id=int(info[0]), language_id=int(info[1]), name=info[2]
         )
 
-    build_generic((ItemCategoryName,), "item_category_prose.csv", csv_record_to_objects)
+    build_generic(
+        stage, (ItemCategoryName,), "item_category_prose.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield Item(
@@ -474,7 +888,7 @@ def _build_items():
             item_fling_effect_id=int(info[5]) if info[5] != "" else None,
         )
 
-    build_generic((Item,), "items.csv", csv_record_to_objects)
+    build_generic(stage, (Item,), "items.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         if re.search(r"^data-card", info[1]):
@@ -492,12 +906,12 @@ def _build_items():
             id=int(info[0]), item_id=int(info[0]), sprites=json.dumps(sprites)
         )
 
-    build_generic((ItemSprites,), "items.csv", csv_record_to_objects)
+    build_generic(stage, (ItemSprites,), "items.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield ItemName(item_id=int(info[0]), language_id=int(info[1]), name=info[2])
 
-    build_generic((ItemName,), "item_names.csv", csv_record_to_objects)
+    build_generic(stage, (ItemName,), "item_names.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield ItemEffectText(
@@ -507,14 +921,16 @@ def _build_items():
             effect=scrub_str(info[3]),
         )
 
-    build_generic((ItemEffectText,), "item_prose.csv", csv_record_to_objects)
+    build_generic(stage, (ItemEffectText,), "item_prose.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield ItemGameIndex(
             item_id=int(info[0]), generation_id=int(info[1]), game_index=int(info[2])
         )
 
-    build_generic((ItemGameIndex,), "item_game_indices.csv", csv_record_to_objects)
+    build_generic(
+        stage, (ItemGameIndex,), "item_game_indices.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield ItemFlavorText(
@@ -524,12 +940,14 @@ def _build_items():
             flavor_text=info[3],
         )
 
-    build_generic((ItemFlavorText,), "item_flavor_text.csv", csv_record_to_objects)
+    build_generic(
+        stage, (ItemFlavorText,), "item_flavor_text.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield ItemAttribute(id=int(info[0]), name=info[1])
 
-    build_generic((ItemAttribute,), "item_flags.csv", csv_record_to_objects)
+    build_generic(stage, (ItemAttribute,), "item_flags.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield ItemAttributeName(
@@ -542,6 +960,7 @@ def _build_items():
         )
 
     build_generic(
+        stage,
         (ItemAttributeName, ItemAttributeDescription),
         "item_flag_prose.csv",
         csv_record_to_objects,
@@ -550,7 +969,9 @@ def _build_items():
     def csv_record_to_objects(info):
         yield ItemAttributeMap(item_id=int(info[0]), item_attribute_id=int(info[1]))
 
-    build_generic((ItemAttributeMap,), "item_flag_map.csv", csv_record_to_objects)
+    build_generic(
+        stage, (ItemAttributeMap,), "item_flag_map.csv", csv_record_to_objects
+    )
 
 
 ###########
@@ -558,7 +979,7 @@ def _build_items():
 ###########
 
 
-def _build_types():
+def _build_types(stage):
     def csv_record_to_objects(info):
         yield Type(
             id=int(info[0]),
@@ -567,19 +988,21 @@ def _build_types():
             move_damage_class_id=int(info[3]) if info[3] != "" else None,
         )
 
-    build_generic((Type,), "types.csv", csv_record_to_objects)
+    build_generic(stage, (Type,), "types.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield TypeName(type_id=int(info[0]), language_id=int(info[1]), name=info[2])
 
-    build_generic((TypeName,), "type_names.csv", csv_record_to_objects)
+    build_generic(stage, (TypeName,), "type_names.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield TypeGameIndex(
             type_id=int(info[0]), generation_id=int(info[1]), game_index=int(info[2])
         )
 
-    build_generic((TypeGameIndex,), "type_game_indices.csv", csv_record_to_objects)
+    build_generic(
+        stage, (TypeGameIndex,), "type_game_indices.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield TypeEfficacy(
@@ -588,7 +1011,7 @@ def _build_types():
             damage_factor=int(info[2]),
         )
 
-    build_generic((TypeEfficacy,), "type_efficacy.csv", csv_record_to_objects)
+    build_generic(stage, (TypeEfficacy,), "type_efficacy.csv", csv_record_to_objects)
 
 
 #############
@@ -596,11 +1019,11 @@ def _build_types():
 #############
 
 
-def _build_contests():
+def _build_contests(stage):
     def csv_record_to_objects(info):
         yield ContestType(id=int(info[0]), name=info[1])
 
-    build_generic((ContestType,), "contest_types.csv", csv_record_to_objects)
+    build_generic(stage, (ContestType,), "contest_types.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield ContestTypeName(
@@ -611,12 +1034,14 @@ def _build_contests():
             color=info[4],
         )
 
-    build_generic((ContestTypeName,), "contest_type_names.csv", csv_record_to_objects)
+    build_generic(
+        stage, (ContestTypeName,), "contest_type_names.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield ContestEffect(id=int(info[0]), appeal=int(info[1]), jam=int(info[2]))
 
-    build_generic((ContestEffect,), "contest_effects.csv", csv_record_to_objects)
+    build_generic(stage, (ContestEffect,), "contest_effects.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield ContestEffectEffectText(
@@ -629,6 +1054,7 @@ def _build_contests():
         )
 
     build_generic(
+        stage,
         (ContestEffectEffectText, ContestEffectFlavorText),
         "contest_effect_prose.csv",
         csv_record_to_objects,
@@ -638,7 +1064,7 @@ def _build_contests():
         yield SuperContestEffect(id=int(info[0]), appeal=int(info[1]))
 
     build_generic(
-        (SuperContestEffect,), "super_contest_effects.csv", csv_record_to_objects
+        stage, (SuperContestEffect,), "super_contest_effects.csv", csv_record_to_objects
     )
 
     def csv_record_to_objects(info):
@@ -649,6 +1075,7 @@ def _build_contests():
         )
 
     build_generic(
+        stage,
         (SuperContestEffectFlavorText,),
         "super_contest_effect_prose.csv",
         csv_record_to_objects,
@@ -660,11 +1087,11 @@ def _build_contests():
 ###########
 
 
-def _build_moves():
+def _build_moves(stage):
     def csv_record_to_objects(info):
         yield MoveEffect(id=int(info[0]))
 
-    build_generic((MoveEffect,), "move_effects.csv", csv_record_to_objects)
+    build_generic(stage, (MoveEffect,), "move_effects.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield MoveEffectEffectText(
@@ -675,7 +1102,7 @@ def _build_moves():
         )
 
     build_generic(
-        (MoveEffectEffectText,), "move_effect_prose.csv", csv_record_to_objects
+        stage, (MoveEffectEffectText,), "move_effect_prose.csv", csv_record_to_objects
     )
 
     def csv_record_to_objects(info):
@@ -684,7 +1111,7 @@ def _build_moves():
         )
 
     build_generic(
-        (MoveEffectChange,), "move_effect_changelog.csv", csv_record_to_objects
+        stage, (MoveEffectChange,), "move_effect_changelog.csv", csv_record_to_objects
     )
 
     def csv_record_to_objects(info):
@@ -695,6 +1122,7 @@ def _build_moves():
         )
 
     build_generic(
+        stage,
         (MoveEffectChangeEffectText,),
         "move_effect_changelog_prose.csv",
         csv_record_to_objects,
@@ -703,7 +1131,9 @@ def _build_moves():
     def csv_record_to_objects(info):
         yield MoveLearnMethod(id=int(info[0]), name=info[1])
 
-    build_generic((MoveLearnMethod,), "pokemon_move_methods.csv", csv_record_to_objects)
+    build_generic(
+        stage, (MoveLearnMethod,), "pokemon_move_methods.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield VersionGroupMoveLearnMethod(
@@ -711,6 +1141,7 @@ def _build_moves():
         )
 
     build_generic(
+        stage,
         (VersionGroupMoveLearnMethod,),
         "version_group_pokemon_move_methods.csv",
         csv_record_to_objects,
@@ -727,6 +1158,7 @@ def _build_moves():
         )
 
     build_generic(
+        stage,
         (MoveLearnMethodName, MoveLearnMethodDescription),
         "pokemon_move_method_prose.csv",
         csv_record_to_objects,
@@ -735,7 +1167,7 @@ def _build_moves():
     def csv_record_to_objects(info):
         yield MoveTarget(id=int(info[0]), name=info[1])
 
-    build_generic((MoveTarget,), "move_targets.csv", csv_record_to_objects)
+    build_generic(stage, (MoveTarget,), "move_targets.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield MoveTargetName(
@@ -746,6 +1178,7 @@ def _build_moves():
         )
 
     build_generic(
+        stage,
         (MoveTargetName, MoveTargetDescription),
         "move_target_prose.csv",
         csv_record_to_objects,
@@ -770,12 +1203,12 @@ def _build_moves():
             super_contest_effect_id=int(info[14]) if info[14] != "" else None,
         )
 
-    build_generic((Move,), "moves.csv", csv_record_to_objects)
+    build_generic(stage, (Move,), "moves.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield MoveName(move_id=int(info[0]), language_id=int(info[1]), name=info[2])
 
-    build_generic((MoveName,), "move_names.csv", csv_record_to_objects)
+    build_generic(stage, (MoveName,), "move_names.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield MoveFlavorText(
@@ -785,7 +1218,9 @@ def _build_moves():
             flavor_text=info[3],
         )
 
-    build_generic((MoveFlavorText,), "move_flavor_text.csv", csv_record_to_objects)
+    build_generic(
+        stage, (MoveFlavorText,), "move_flavor_text.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         _move_effect = None
@@ -807,12 +1242,14 @@ def _build_moves():
             move_effect_chance=int(info[7]) if info[7] != "" else None,
         )
 
-    build_generic((MoveChange,), "move_changelog.csv", csv_record_to_objects)
+    build_generic(stage, (MoveChange,), "move_changelog.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield MoveBattleStyle(id=int(info[0]), name=info[1])
 
-    build_generic((MoveBattleStyle,), "move_battle_styles.csv", csv_record_to_objects)
+    build_generic(
+        stage, (MoveBattleStyle,), "move_battle_styles.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield MoveBattleStyleName(
@@ -820,18 +1257,23 @@ def _build_moves():
         )
 
     build_generic(
-        (MoveBattleStyleName,), "move_battle_style_prose.csv", csv_record_to_objects
+        stage,
+        (MoveBattleStyleName,),
+        "move_battle_style_prose.csv",
+        csv_record_to_objects,
     )
 
     def csv_record_to_objects(info):
         yield MoveAttribute(id=int(info[0]), name=info[1])
 
-    build_generic((MoveAttribute,), "move_flags.csv", csv_record_to_objects)
+    build_generic(stage, (MoveAttribute,), "move_flags.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield MoveAttributeMap(move_id=int(info[0]), move_attribute_id=int(info[1]))
 
-    build_generic((MoveAttributeMap,), "move_flag_map.csv", csv_record_to_objects)
+    build_generic(
+        stage, (MoveAttributeMap,), "move_flag_map.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield MoveAttributeName(
@@ -844,6 +1286,7 @@ def _build_moves():
         )
 
     build_generic(
+        stage,
         (MoveAttributeName, MoveAttributeDescription),
         "move_flag_prose.csv",
         csv_record_to_objects,
@@ -852,7 +1295,9 @@ def _build_moves():
     def csv_record_to_objects(info):
         yield MoveMetaAilment(id=int(info[0]), name=info[1])
 
-    build_generic((MoveMetaAilment,), "move_meta_ailments.csv", csv_record_to_objects)
+    build_generic(
+        stage, (MoveMetaAilment,), "move_meta_ailments.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield MoveMetaAilmentName(
@@ -860,14 +1305,17 @@ def _build_moves():
         )
 
     build_generic(
-        (MoveMetaAilmentName,), "move_meta_ailment_names.csv", csv_record_to_objects
+        stage,
+        (MoveMetaAilmentName,),
+        "move_meta_ailment_names.csv",
+        csv_record_to_objects,
     )
 
     def csv_record_to_objects(info):
         yield MoveMetaCategory(id=int(info[0]), name=info[1])
 
     build_generic(
-        (MoveMetaCategory,), "move_meta_categories.csv", csv_record_to_objects
+        stage, (MoveMetaCategory,), "move_meta_categories.csv", csv_record_to_objects
     )
 
     def csv_record_to_objects(info):
@@ -878,6 +1326,7 @@ def _build_moves():
         )
 
     build_generic(
+        stage,
         (MoveMetaCategoryDescription,),
         "move_meta_category_prose.csv",
         csv_record_to_objects,
@@ -900,7 +1349,7 @@ def _build_moves():
             stat_chance=int(info[12]) if info[12] != "" else None,
         )
 
-    build_generic((MoveMeta,), "move_meta.csv", csv_record_to_objects)
+    build_generic(stage, (MoveMeta,), "move_meta.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield MoveMetaStatChange(
@@ -908,19 +1357,22 @@ def _build_moves():
         )
 
     build_generic(
-        (MoveMetaStatChange,), "move_meta_stat_changes.csv", csv_record_to_objects
+        stage,
+        (MoveMetaStatChange,),
+        "move_meta_stat_changes.csv",
+        csv_record_to_objects,
     )
 
     def csv_record_to_objects(info):
         yield ContestCombo(first_move_id=int(info[0]), second_move_id=int(info[1]))
 
-    build_generic((ContestCombo,), "contest_combos.csv", csv_record_to_objects)
+    build_generic(stage, (ContestCombo,), "contest_combos.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield SuperContestCombo(first_move_id=int(info[0]), second_move_id=int(info[1]))
 
     build_generic(
-        (SuperContestCombo,), "super_contest_combos.csv", csv_record_to_objects
+        stage, (SuperContestCombo,), "super_contest_combos.csv", csv_record_to_objects
     )
 
 
@@ -929,11 +1381,11 @@ def _build_moves():
 #############
 
 
-def _build_berries():
+def _build_berries(stage):
     def csv_record_to_objects(info):
         yield BerryFirmness(id=int(info[0]), name=info[1])
 
-    build_generic((BerryFirmness,), "berry_firmness.csv", csv_record_to_objects)
+    build_generic(stage, (BerryFirmness,), "berry_firmness.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield BerryFirmnessName(
@@ -941,7 +1393,7 @@ def _build_berries():
         )
 
     build_generic(
-        (BerryFirmnessName,), "berry_firmness_names.csv", csv_record_to_objects
+        stage, (BerryFirmnessName,), "berry_firmness_names.csv", csv_record_to_objects
     )
 
     def csv_record_to_objects(info):
@@ -960,7 +1412,7 @@ def _build_berries():
             smoothness=int(info[9]),
         )
 
-    build_generic((Berry,), "berries.csv", csv_record_to_objects)
+    build_generic(stage, (Berry,), "berries.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         # Get the english name for this contest type
@@ -974,7 +1426,7 @@ def _build_berries():
         )
 
     # This is not an error
-    build_generic((BerryFlavor,), "contest_types.csv", csv_record_to_objects)
+    build_generic(stage, (BerryFlavor,), "contest_types.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield BerryFlavorName(
@@ -982,7 +1434,9 @@ def _build_berries():
         )
 
     # This is not an error
-    build_generic((BerryFlavorName,), "contest_type_names.csv", csv_record_to_objects)
+    build_generic(
+        stage, (BerryFlavorName,), "contest_type_names.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield BerryFlavorMap(
@@ -990,7 +1444,7 @@ def _build_berries():
         )
 
     # This is not an error
-    build_generic((BerryFlavorMap,), "berry_flavors.csv", csv_record_to_objects)
+    build_generic(stage, (BerryFlavorMap,), "berry_flavors.csv", csv_record_to_objects)
 
 
 ############
@@ -998,7 +1452,7 @@ def _build_berries():
 ############
 
 
-def _build_natures():
+def _build_natures(stage):
     def csv_record_to_objects(info):
         decreased_stat = None
         increased_stat = None
@@ -1023,12 +1477,12 @@ def _build_natures():
             game_index=info[6],
         )
 
-    build_generic((Nature,), "natures.csv", csv_record_to_objects)
+    build_generic(stage, (Nature,), "natures.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield NatureName(nature_id=int(info[0]), language_id=int(info[1]), name=info[2])
 
-    build_generic((NatureName,), "nature_names.csv", csv_record_to_objects)
+    build_generic(stage, (NatureName,), "nature_names.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield NaturePokeathlonStat(
@@ -1036,7 +1490,10 @@ def _build_natures():
         )
 
     build_generic(
-        (NaturePokeathlonStat,), "nature_pokeathlon_stats.csv", csv_record_to_objects
+        stage,
+        (NaturePokeathlonStat,),
+        "nature_pokeathlon_stats.csv",
+        csv_record_to_objects,
     )
 
     def csv_record_to_objects(info):
@@ -1048,6 +1505,7 @@ def _build_natures():
         )
 
     build_generic(
+        stage,
         (NatureBattleStylePreference,),
         "nature_battle_style_preferences.csv",
         csv_record_to_objects,
@@ -1059,11 +1517,11 @@ def _build_natures():
 ###########
 
 
-def _build_genders():
+def _build_genders(stage):
     def csv_record_to_objects(info):
         yield Gender(id=int(info[0]), name=info[1])
 
-    build_generic((Gender,), "genders.csv", csv_record_to_objects)
+    build_generic(stage, (Gender,), "genders.csv", csv_record_to_objects)
 
 
 ################
@@ -1071,13 +1529,13 @@ def _build_genders():
 ################
 
 
-def _build_experiences():
+def _build_experiences(stage):
     def csv_record_to_objects(info):
         yield Experience(
             growth_rate_id=int(info[0]), level=int(info[1]), experience=int(info[2])
         )
 
-    build_generic((Experience,), "experience.csv", csv_record_to_objects)
+    build_generic(stage, (Experience,), "experience.csv", csv_record_to_objects)
 
 
 ##############
@@ -1085,7 +1543,7 @@ def _build_experiences():
 ##############
 
 
-def _build_machines():
+def _build_machines(stage):
     def csv_record_to_objects(info):
         yield Machine(
             machine_number=int(info[0]),
@@ -1094,7 +1552,7 @@ def _build_machines():
             move_id=int(info[3]),
         )
 
-    build_generic((Machine,), "machines.csv", csv_record_to_objects)
+    build_generic(stage, (Machine,), "machines.csv", csv_record_to_objects)
 
 
 ###############
@@ -1102,19 +1560,23 @@ def _build_machines():
 ###############
 
 
-def _build_evolutions():
+def _build_evolutions(stage):
     def csv_record_to_objects(info):
         yield EvolutionChain(
             id=int(info[0]),
             baby_trigger_item_id=int(info[1]) if info[1] != "" else None,
         )
 
-    build_generic((EvolutionChain,), "evolution_chains.csv", csv_record_to_objects)
+    build_generic(
+        stage, (EvolutionChain,), "evolution_chains.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield EvolutionTrigger(id=int(info[0]), name=info[1])
 
-    build_generic((EvolutionTrigger,), "evolution_triggers.csv", csv_record_to_objects)
+    build_generic(
+        stage, (EvolutionTrigger,), "evolution_triggers.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield EvolutionTriggerName(
@@ -1122,7 +1584,10 @@ def _build_evolutions():
         )
 
     build_generic(
-        (EvolutionTriggerName,), "evolution_trigger_prose.csv", csv_record_to_objects
+        stage,
+        (EvolutionTriggerName,),
+        "evolution_trigger_prose.csv",
+        csv_record_to_objects,
     )
 
 
@@ -1131,7 +1596,7 @@ def _build_evolutions():
 #############
 
 
-def _build_pokedexes():
+def _build_pokedexes(stage):
     def csv_record_to_objects(info):
         yield Pokedex(
             id=int(info[0]),
@@ -1140,7 +1605,7 @@ def _build_pokedexes():
             is_main_series=bool(int(info[3])),
         )
 
-    build_generic((Pokedex,), "pokedexes.csv", csv_record_to_objects)
+    build_generic(stage, (Pokedex,), "pokedexes.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield PokedexName(
@@ -1151,7 +1616,10 @@ def _build_pokedexes():
         )
 
     build_generic(
-        (PokedexName, PokedexDescription), "pokedex_prose.csv", csv_record_to_objects
+        stage,
+        (PokedexName, PokedexDescription),
+        "pokedex_prose.csv",
+        csv_record_to_objects,
     )
 
     def csv_record_to_objects(info):
@@ -1160,7 +1628,10 @@ def _build_pokedexes():
         )
 
     build_generic(
-        (PokedexVersionGroup,), "pokedex_version_groups.csv", csv_record_to_objects
+        stage,
+        (PokedexVersionGroup,),
+        "pokedex_version_groups.csv",
+        csv_record_to_objects,
     )
 
 
@@ -1169,7 +1640,7 @@ def _build_pokedexes():
 ##############
 
 
-def _build_locations():
+def _build_locations(stage):
     def csv_record_to_objects(info):
         yield Location(
             id=int(info[0]),
@@ -1177,14 +1648,14 @@ def _build_locations():
             name=info[2],
         )
 
-    build_generic((Location,), "locations.csv", csv_record_to_objects)
+    build_generic(stage, (Location,), "locations.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield LocationName(
             location_id=int(info[0]), language_id=int(info[1]), name=info[2]
         )
 
-    build_generic((LocationName,), "location_names.csv", csv_record_to_objects)
+    build_generic(stage, (LocationName,), "location_names.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield LocationGameIndex(
@@ -1194,7 +1665,7 @@ def _build_locations():
         )
 
     build_generic(
-        (LocationGameIndex,), "location_game_indices.csv", csv_record_to_objects
+        stage, (LocationGameIndex,), "location_game_indices.csv", csv_record_to_objects
     )
 
     def csv_record_to_objects(info):
@@ -1208,14 +1679,16 @@ def _build_locations():
             else "{}-{}".format(location.name, "area"),
         )
 
-    build_generic((LocationArea,), "location_areas.csv", csv_record_to_objects)
+    build_generic(stage, (LocationArea,), "location_areas.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield LocationAreaName(
             location_area_id=int(info[0]), language_id=int(info[1]), name=info[2]
         )
 
-    build_generic((LocationAreaName,), "location_area_prose.csv", csv_record_to_objects)
+    build_generic(
+        stage, (LocationAreaName,), "location_area_prose.csv", csv_record_to_objects
+    )
 
 
 #############
@@ -1223,23 +1696,25 @@ def _build_locations():
 #############
 
 
-def _build_pokemons():
+def _build_pokemons(stage):
     def csv_record_to_objects(info):
         yield PokemonColor(id=int(info[0]), name=info[1])
 
-    build_generic((PokemonColor,), "pokemon_colors.csv", csv_record_to_objects)
+    build_generic(stage, (PokemonColor,), "pokemon_colors.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield PokemonColorName(
             pokemon_color_id=int(info[0]), language_id=int(info[1]), name=info[2]
         )
 
-    build_generic((PokemonColorName,), "pokemon_color_names.csv", csv_record_to_objects)
+    build_generic(
+        stage, (PokemonColorName,), "pokemon_color_names.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield PokemonShape(id=int(info[0]), name=info[1])
 
-    build_generic((PokemonShape,), "pokemon_shapes.csv", csv_record_to_objects)
+    build_generic(stage, (PokemonShape,), "pokemon_shapes.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield PokemonShapeName(
@@ -1249,19 +1724,25 @@ def _build_pokemons():
             awesome_name=info[3],
         )
 
-    build_generic((PokemonShapeName,), "pokemon_shape_prose.csv", csv_record_to_objects)
+    build_generic(
+        stage, (PokemonShapeName,), "pokemon_shape_prose.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield PokemonHabitat(id=int(info[0]), name=info[1])
 
-    build_generic((PokemonHabitat,), "pokemon_habitats.csv", csv_record_to_objects)
+    build_generic(
+        stage, (PokemonHabitat,), "pokemon_habitats.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield PokemonSpecies(
             id=int(info[0]),
             name=info[1],
             generation_id=int(info[2]),
-            evolves_from_species=None,
+            # Species may evolve from one later in the file; foreign keys are only
+            # checked when the stage's transaction commits
+            evolves_from_species_id=int(info[3]) if info[3] != "" else None,
             evolution_chain_id=int(info[4]),
             pokemon_color_id=int(info[5]),
             pokemon_shape_id=int(info[6]),
@@ -1277,19 +1758,9 @@ def _build_pokemons():
             order=int(info[16]),
         )
 
-    build_generic((PokemonSpecies,), "pokemon_species.csv", csv_record_to_objects)
-
-    # PokemonSpecies.evolves_from_species can't be set until all the species are created
-    data = load_data("pokemon_species.csv")
-    for index, info in enumerate(data):
-        if index > 0:
-            evolves = (
-                PokemonSpecies.objects.get(pk=int(info[3])) if info[3] != "" else None
-            )
-            if evolves:
-                species = PokemonSpecies.objects.get(pk=int(info[0]))
-                species.evolves_from_species = evolves
-                species.save()
+    build_generic(
+        stage, (PokemonSpecies,), "pokemon_species.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield PokemonSpeciesName(
@@ -1300,7 +1771,7 @@ def _build_pokemons():
         )
 
     build_generic(
-        (PokemonSpeciesName,), "pokemon_species_names.csv", csv_record_to_objects
+        stage, (PokemonSpeciesName,), "pokemon_species_names.csv", csv_record_to_objects
     )
 
     def csv_record_to_objects(info):
@@ -1311,7 +1782,10 @@ def _build_pokemons():
         )
 
     build_generic(
-        (PokemonSpeciesDescription,), "pokemon_species_prose.csv", csv_record_to_objects
+        stage,
+        (PokemonSpeciesDescription,),
+        "pokemon_species_prose.csv",
+        csv_record_to_objects,
     )
 
     def csv_record_to_objects(info):
@@ -1323,6 +1797,7 @@ def _build_pokemons():
         )
 
     build_generic(
+        stage,
         (PokemonSpeciesFlavorText,),
         "pokemon_species_flavor_text.csv",
         csv_record_to_objects,
@@ -1340,38 +1815,18 @@ def _build_pokemons():
             is_default=bool(int(info[7])),
         )
 
-    build_generic((Pokemon,), "pokemon.csv", csv_record_to_objects)
+    build_generic(stage, (Pokemon,), "pokemon.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         file_name = "%s.png" % info[0]
-        poke_sprites = "pokemon/{0}"
-        sprites = {
-            "front_default": file_path_or_none(poke_sprites.format(file_name)),
-            "front_female": file_path_or_none(
-                poke_sprites.format("female/" + file_name)
-            ),
-            "front_shiny": file_path_or_none(poke_sprites.format("shiny/" + file_name)),
-            "front_shiny_female": file_path_or_none(
-                poke_sprites.format("shiny/female/" + file_name)
-            ),
-            "back_default": file_path_or_none(poke_sprites.format("back/" + file_name)),
-            "back_female": file_path_or_none(
-                poke_sprites.format("back/female/" + file_name)
-            ),
-            "back_shiny": file_path_or_none(
-                poke_sprites.format("back/shiny/" + file_name)
-            ),
-            "back_shiny_female": file_path_or_none(
-                poke_sprites.format("back/shiny/female/" + file_name)
-            ),
-        }
+        sprites = sprite_variants("pokemon/", POKEMON_SPRITE_VARIANTS, file_name)
         yield PokemonSprites(
             id=int(info[0]),
             pokemon=Pokemon.objects.get(pk=int(info[0])),
             sprites=json.dumps(sprites),
         )
 
-    build_generic((PokemonSprites,), "pokemon.csv", csv_record_to_objects)
+    build_generic(stage, (PokemonSprites,), "pokemon.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield PokemonAbility(
@@ -1381,7 +1836,9 @@ def _build_pokemons():
             slot=int(info[3]),
         )
 
-    build_generic((PokemonAbility,), "pokemon_abilities.csv", csv_record_to_objects)
+    build_generic(
+        stage, (PokemonAbility,), "pokemon_abilities.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield PokemonDexNumber(
@@ -1390,14 +1847,18 @@ def _build_pokemons():
             pokedex_number=int(info[2]),
         )
 
-    build_generic((PokemonDexNumber,), "pokemon_dex_numbers.csv", csv_record_to_objects)
+    build_generic(
+        stage, (PokemonDexNumber,), "pokemon_dex_numbers.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield PokemonEggGroup(
             pokemon_species_id=int(info[0]), egg_group_id=int(info[1])
         )
 
-    build_generic((PokemonEggGroup,), "pokemon_egg_groups.csv", csv_record_to_objects)
+    build_generic(
+        stage, (PokemonEggGroup,), "pokemon_egg_groups.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield PokemonEvolution(
@@ -1423,7 +1884,9 @@ def _build_pokemons():
             turn_upside_down=bool(int(info[19])),
         )
 
-    build_generic((PokemonEvolution,), "pokemon_evolution.csv", csv_record_to_objects)
+    build_generic(
+        stage, (PokemonEvolution,), "pokemon_evolution.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield PokemonForm(
@@ -1439,7 +1902,7 @@ def _build_pokemons():
             order=int(info[9]),
         )
 
-    build_generic((PokemonForm,), "pokemon_forms.csv", csv_record_to_objects)
+    build_generic(stage, (PokemonForm,), "pokemon_forms.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         pokemon = Pokemon.objects.get(pk=int(info[3]))
@@ -1453,20 +1916,14 @@ def _build_pokemons():
                 )
         else:
             file_name = "%s.png" % getattr(pokemon, "pokemon_species_id")
-        poke_sprites = "pokemon/{0}"
-        sprites = {
-            "front_default": file_path_or_none(poke_sprites.format(file_name)),
-            "front_shiny": file_path_or_none(poke_sprites.format("shiny/" + file_name)),
-            "back_default": file_path_or_none(poke_sprites.format("back/" + file_name)),
-            "back_shiny": file_path_or_none(
-                poke_sprites.format("back/shiny/" + file_name)
-            ),
-        }
+        sprites = sprite_variants("pokemon/", POKEMON_FORM_SPRITE_VARIANTS, file_name)
         yield PokemonFormSprites(
             id=int(info[0]), pokemon_form_id=int(info[0]), sprites=json.dumps(sprites)
         )
 
-    build_generic((PokemonFormSprites,), "pokemon_forms.csv", csv_record_to_objects)
+    build_generic(
+        stage, (PokemonFormSprites,), "pokemon_forms.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield PokemonFormName(
@@ -1476,7 +1933,9 @@ def _build_pokemons():
             pokemon_name=info[3],
         )
 
-    build_generic((PokemonFormName,), "pokemon_form_names.csv", csv_record_to_objects)
+    build_generic(
+        stage, (PokemonFormName,), "pokemon_form_names.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield PokemonFormGeneration(
@@ -1486,7 +1945,10 @@ def _build_pokemons():
         )
 
     build_generic(
-        (PokemonFormGeneration,), "pokemon_form_generations.csv", csv_record_to_objects
+        stage,
+        (PokemonFormGeneration,),
+        "pokemon_form_generations.csv",
+        csv_record_to_objects,
     )
 
     def csv_record_to_objects(info):
@@ -1495,7 +1957,7 @@ def _build_pokemons():
         )
 
     build_generic(
-        (PokemonGameIndex,), "pokemon_game_indices.csv", csv_record_to_objects
+        stage, (PokemonGameIndex,), "pokemon_game_indices.csv", csv_record_to_objects
     )
 
     def csv_record_to_objects(info):
@@ -1504,7 +1966,7 @@ def _build_pokemons():
         )
 
     build_generic(
-        (PokemonHabitatName,), "pokemon_habitat_names.csv", csv_record_to_objects
+        stage, (PokemonHabitatName,), "pokemon_habitat_names.csv", csv_record_to_objects
     )
 
     def csv_record_to_objects(info):
@@ -1515,7 +1977,7 @@ def _build_pokemons():
             rarity=int(info[3]),
         )
 
-    build_generic((PokemonItem,), "pokemon_items.csv", csv_record_to_objects)
+    build_generic(stage, (PokemonItem,), "pokemon_items.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield PokemonMove(
@@ -1527,7 +1989,7 @@ def _build_pokemons():
             order=int(info[5]) if info[5] != "" else None,
         )
 
-    build_generic((PokemonMove,), "pokemon_moves.csv", csv_record_to_objects)
+    build_generic(stage, (PokemonMove,), "pokemon_moves.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield PokemonStat(
@@ -1537,14 +1999,14 @@ def _build_pokemons():
             effort=int(info[3]),
         )
 
-    build_generic((PokemonStat,), "pokemon_stats.csv", csv_record_to_objects)
+    build_generic(stage, (PokemonStat,), "pokemon_stats.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield PokemonType(
             pokemon_id=int(info[0]), type_id=int(info[1]), slot=int(info[2])
         )
 
-    build_generic((PokemonType,), "pokemon_types.csv", csv_record_to_objects)
+    build_generic(stage, (PokemonType,), "pokemon_types.csv", csv_record_to_objects)
 
 
 ###############
@@ -1552,11 +2014,13 @@ def _build_pokemons():
 ###############
 
 
-def _build_encounters():
+def _build_encounters(stage):
     def csv_record_to_objects(info):
         yield EncounterMethod(id=int(info[0]), name=info[1], order=int(info[2]))
 
-    build_generic((EncounterMethod,), "encounter_methods.csv", csv_record_to_objects)
+    build_generic(
+        stage, (EncounterMethod,), "encounter_methods.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield LocationAreaEncounterRate(
@@ -1567,6 +2031,7 @@ def _build_encounters():
         )
 
     build_generic(
+        stage,
         (LocationAreaEncounterRate,),
         "location_area_encounter_rates.csv",
         csv_record_to_objects,
@@ -1578,14 +2043,17 @@ def _build_encounters():
         )
 
     build_generic(
-        (EncounterMethodName,), "encounter_method_prose.csv", csv_record_to_objects
+        stage,
+        (EncounterMethodName,),
+        "encounter_method_prose.csv",
+        csv_record_to_objects,
     )
 
     def csv_record_to_objects(info):
         yield EncounterCondition(id=int(info[0]), name=info[1])
 
     build_generic(
-        (EncounterCondition,), "encounter_conditions.csv", csv_record_to_objects
+        stage, (EncounterCondition,), "encounter_conditions.csv", csv_record_to_objects
     )
 
     def csv_record_to_objects(info):
@@ -1594,6 +2062,7 @@ def _build_encounters():
         )
 
     build_generic(
+        stage,
         (EncounterConditionName,),
         "encounter_condition_prose.csv",
         csv_record_to_objects,
@@ -1608,7 +2077,7 @@ def _build_encounters():
             rarity=int(info[4]),
         )
 
-    build_generic((EncounterSlot,), "encounter_slots.csv", csv_record_to_objects)
+    build_generic(stage, (EncounterSlot,), "encounter_slots.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield Encounter(
@@ -1621,7 +2090,7 @@ def _build_encounters():
             max_level=int(info[6]),
         )
 
-    build_generic((Encounter,), "encounters.csv", csv_record_to_objects)
+    build_generic(stage, (Encounter,), "encounters.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield EncounterConditionValue(
@@ -1632,6 +2101,7 @@ def _build_encounters():
         )
 
     build_generic(
+        stage,
         (EncounterConditionValue,),
         "encounter_condition_values.csv",
         csv_record_to_objects,
@@ -1645,6 +2115,7 @@ def _build_encounters():
         )
 
     build_generic(
+        stage,
         (EncounterConditionValueName,),
         "encounter_condition_value_prose.csv",
         csv_record_to_objects,
@@ -1656,6 +2127,7 @@ def _build_encounters():
         )
 
     build_generic(
+        stage,
         (EncounterConditionValueMap,),
         "encounter_condition_value_map.csv",
         csv_record_to_objects,
@@ -1667,18 +2139,20 @@ def _build_encounters():
 ##############
 
 
-def _build_pal_parks():
+def _build_pal_parks(stage):
     def csv_record_to_objects(info):
         yield PalParkArea(id=int(info[0]), name=info[1])
 
-    build_generic((PalParkArea,), "pal_park_areas.csv", csv_record_to_objects)
+    build_generic(stage, (PalParkArea,), "pal_park_areas.csv", csv_record_to_objects)
 
     def csv_record_to_objects(info):
         yield PalParkAreaName(
             pal_park_area_id=int(info[0]), language_id=int(info[1]), name=info[2]
         )
 
-    build_generic((PalParkAreaName,), "pal_park_area_names.csv", csv_record_to_objects)
+    build_generic(
+        stage, (PalParkAreaName,), "pal_park_area_names.csv", csv_record_to_objects
+    )
 
     def csv_record_to_objects(info):
         yield PalPark(
@@ -1688,35 +2162,217 @@ def _build_pal_parks():
             rate=int(info[3]),
         )
 
-    build_generic((PalPark,), "pal_park.csv", csv_record_to_objects)
-
-
-def build_all():
-    _build_languages()
-    _build_regions()
-    _build_generations()
-    _build_versions()
-    _build_damage_classes()
-    _build_stats()
-    _build_abilities()
-    _build_characteristics()
-    _build_egg_groups()
-    _build_growth_rates()
-    _build_items()
-    _build_types()
-    _build_contests()
-    _build_moves()
-    _build_berries()
-    _build_natures()
-    _build_genders()
-    _build_experiences()
-    _build_machines()
-    _build_evolutions()
-    _build_pokedexes()
-    _build_locations()
-    _build_pokemons()
-    _build_encounters()
-    _build_pal_parks()
+    build_generic(stage, (PalPark,), "pal_park.csv", csv_record_to_objects)
+
+
+# Every stage with the stages whose tables it references, in build order
+BUILD_STAGES = (
+    ("languages", _build_languages, ()),
+    ("regions", _build_regions, ("languages",)),
+    ("generations", _build_generations, ("languages", "regions")),
+    ("versions", _build_versions, ("generations", "languages", "regions")),
+    ("damage_classes", _build_damage_classes, ("languages",)),
+    ("stats", _build_stats, ("damage_classes", "languages")),
+    ("abilities", _build_abilities, ("generations", "languages", "versions")),
+    ("characteristics", _build_characteristics, ("languages", "stats")),
+    ("egg_groups", _build_egg_groups, ("languages",)),
+    ("growth_rates", _build_growth_rates, ("languages",)),
+    ("items", _build_items, ("generations", "languages", "versions")),
+    ("types", _build_types, ("damage_classes", "generations", "languages")),
+    ("contests", _build_contests, ("languages",)),
+    (
+        "moves",
+        _build_moves,
+        (
+            "contests",
+            "damage_classes",
+            "generations",
+            "languages",
+            "stats",
+            "types",
+            "versions",
+        ),
+    ),
+    ("berries", _build_berries, ("contests", "items", "languages", "types")),
+    ("natures", _build_natures, ("berries", "languages", "moves", "stats")),
+    ("genders", _build_genders, ()),
+    ("experiences", _build_experiences, ("growth_rates",)),
+    ("machines", _build_machines, ("growth_rates", "items", "moves", "versions")),
+    ("evolutions", _build_evolutions, ("items", "languages")),
+    ("pokedexes", _build_pokedexes, ("languages", "regions", "versions")),
+    ("locations", _build_locations, ("generations", "languages", "regions")),
+    (
+        "pokemon",
+        _build_pokemons,
+        (
+            "abilities",
+            "egg_groups",
+            "evolutions",
+            "genders",
+            "generations",
+            "growth_rates",
+            "items",
+            "languages",
+            "locations",
+            "moves",
+            "pokedexes",
+            "stats",
+            "types",
+            "versions",
+        ),
+    ),
+    ("encounters", _build_encounters, ("languages", "locations", "pokemon", "versions")),
+    ("pal_parks", _build_pal_parks, ("languages", "pokemon")),
+)
+
+
+def plan_stages(only=None, incremental=False):
+    """
+    Returns (name, build_function, incremental) for each stage to run, in build order.
+
+    With only, the named stages are rebuilt and the stages they depend on are synced
+    incrementally so they are present and current without being emptied. Unless the
+    named stages are synced themselves, emptying their tables also empties every
+    table referencing them, so the stages depending on them are rebuilt as well.
+    """
+    stage_names = [name for name, build_function, dependencies in BUILD_STAGES]
+    if only is None:
+        only = stage_names
+
+    unknown = set(only) - set(stage_names)
+    if unknown:
+        raise ValueError(
+            "Unknown build stages: %s (choose from %s)"
+            % (", ".join(sorted(unknown)), ", ".join(stage_names))
+        )
+
+    rebuilt = set(only)
+    if not incremental:
+        for name, _, dependencies in BUILD_STAGES:
+            if rebuilt.intersection(dependencies):
+                rebuilt.add(name)
+    synced = set()
+    for name, _, dependencies in reversed(BUILD_STAGES):
+        if name in rebuilt or name in synced:
+            synced.update(dependencies)
+
+    return [
+        (name, build_function, incremental or name not in rebuilt)
+        for name, build_function, dependencies in BUILD_STAGES
+        if name in rebuilt or name in synced
+    ]
+
+
+def peak_rss_kb():
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_stage(name, build_function, incremental):
+    """
+    Runs one stage in its own transaction and returns a report of the rows it built,
+    the time and queries it took and the peak memory of the process afterwards.
+    """
+    queries = 0
+
+    def count_query(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    stage = BuildStage(incremental)
+    started = time.perf_counter()
+    # A stage either lands completely or not at all
+    with connection.execute_wrapper(count_query), transaction.atomic():
+        build_function(stage)
+    seconds = time.perf_counter() - started
+
+    return {
+        "stage": name,
+        "incremental": incremental,
+        "rows": stage.rows,
+        "written": stage.written,
+        "seconds": seconds,
+        "rows_per_second": stage.rows / seconds if seconds else None,
+        "queries": queries,
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+def _build_documents(stage):
+    # Values cached for the recorded data version come from the tables being replaced
+    DATA_CACHE.clear()
+    stage.rows = stage.written = materialize_documents()
+
+
+def _drop_documents(stage):
+    stage.written = ResourceDocument.objects.all().delete()[0]
+
+
+def built_models():
+    """
+    Returns the models whose tables a build replaces: every model but the DataVersion,
+    which is only recorded once the build is done.
+    """
+    return [
+        model
+        for model in apps.get_app_config("pokemon_v2").get_models()
+        if model is not DataVersion
+    ]
+
+
+def record_data_version():
+    DataVersion.objects.update_or_create(
+        pk=1, defaults={"version": corpus_hash(DATA_LOCATION)}
+    )
+
+
+def build_all(defer_indexes=False, incremental=False, shadow=False, only=None,
+              documents=None):
+    """
+    Builds the stages to build, see plan_stages, and returns their reports.
+
+    The detail documents are rendered again afterwards when every stage was rebuilt,
+    or when documents is true. After a partial build that wrote any rows they are
+    dropped instead, so the API serves those details from the tables until the next
+    full build. A shadow build renders them before its tables are swapped in.
+    """
+    if incremental and shadow:
+        raise ValueError("A shadow build always starts from empty tables")
+    if only is not None and shadow:
+        raise ValueError("A shadow build always rebuilds every stage")
+    if documents is False and shadow:
+        raise ValueError("A shadow build always renders the documents")
+
+    stages = plan_stages(only, incremental)
+    model_list = built_models()
+    reports = []
+    with ExitStack() as build_context:
+        # The shadow schema has to exist before its indexes can be deferred
+        if shadow:
+            build_context.enter_context(cache_frozen(model_list))
+            build_context.enter_context(shadow_schema(model_list))
+        with ExitStack() as load_context:
+            if defer_indexes:
+                load_context.enter_context(deferred_indexes(model_list))
+
+            for name, build_function, incremental_stage in stages:
+                reports.append(run_stage(name, build_function, incremental_stage))
+
+        # Rendered once the indexes are back, and before the shadow tables are swapped
+        # in so the live documents keep serving until then. Any stage can change what a
+        # document shows, so all of them are rendered again
+        if documents is None:
+            documents = only is None and not incremental
+        if documents:
+            reports.append(run_stage("documents", _build_documents, False))
+        elif any(report["written"] for report in reports):
+            reports.append(run_stage("documents", _drop_documents, True))
+
+    record_data_version()
+
+    return reports
 
 
 if __name__ == "__main__":
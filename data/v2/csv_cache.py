@@ -0,0 +1,135 @@
+#  A parse-once cache for the CSV files in data/v2/csv.
+#
+#  Tokenizing the ~11 MB of CSV text is a noticeable part of every build, and the test
+#  and development loops rebuild often. read_csv parses a file once and keeps its
+#  columns, with integer columns already converted, in a pickle under a .cache
+#  directory next to the file. Later reads load the pickle as long as the CSV file is
+#  unchanged.
+#
+#  This module must not import Django; make-database.py uses it as well.
+
+
+import csv
+import hashlib
+import os
+import os.path
+import pickle
+import re
+
+CACHE_DIR = ".cache"
+CACHE_VERSION = 1
+INT_RGX = re.compile(r"^-?[1-9][0-9]*$|^0$")
+
+
+def file_hash(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as csv_file:
+        for chunk in iter(lambda: csv_file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def corpus_hash(directory):
+    """
+    Returns a hash over the names and contents of every CSV file in directory. It
+    identifies the version of the data a database was built from.
+    """
+    digest = hashlib.sha1()
+    for file_name in sorted(os.listdir(directory)):
+        if file_name.endswith(".csv"):
+            digest.update(file_name.encode("utf8"))
+            digest.update(file_hash(os.path.join(directory, file_name)).encode("ascii"))
+    return digest.hexdigest()
+
+
+def file_stamp(path, with_hash=True):
+    stat = os.stat(path)
+    return {
+        "version": CACHE_VERSION,
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+        "hash": file_hash(path) if with_hash else None,
+    }
+
+
+def cache_path(path):
+    directory, file_name = os.path.split(path)
+    return os.path.join(directory, CACHE_DIR, file_name + ".pickle")
+
+
+def typed_column(values):
+    """
+    Converts a column to ints when every non-empty value is written as a plain
+    integer. Empty values stay empty strings, so checks such as `info[3] != ""` keep
+    working. Anything else, including numbers with leading zeros, stays text.
+    """
+    if all(INT_RGX.match(value) for value in values if value):
+        return tuple(int(value) if value else value for value in values)
+    return tuple(values)
+
+
+def parse_csv(path):
+    with open(path, "rt", encoding="utf8") as csv_file:
+        rows = list(csv.reader(csv_file, delimiter=","))
+    header, records = rows[0], rows[1:]
+    width = len(header)
+    if any(len(record) != width for record in records):
+        raise ValueError("%s does not have %d fields on every row" % (path, width))
+    return tuple(header), tuple(typed_column(column) for column in zip(*records))
+
+
+def read_cache(path):
+    """
+    Returns the cached (header, columns) of the CSV file at path, or None if there is
+    no cache or the file changed since it was written.
+    """
+    try:
+        with open(cache_path(path), "rb") as cache_file:
+            stamp = pickle.load(cache_file)
+            current = file_stamp(path, with_hash=False)
+            if stamp["version"] != current["version"] or stamp["size"] != current["size"]:
+                return None
+            # A checkout may touch a file without changing it, so fall back to the hash
+            touched = stamp["mtime"] != current["mtime"]
+            if touched and stamp["hash"] != file_hash(path):
+                return None
+            data = pickle.load(cache_file)
+    except (OSError, EOFError, KeyError, pickle.UnpicklingError):
+        return None
+
+    if touched:
+        # Stamped with the new mtime, so later reads don't hash the file again
+        current["hash"] = stamp["hash"]
+        try:
+            write_cache(path, data, current)
+        except OSError:
+            pass
+    return data
+
+
+def write_cache(path, data, stamp=None):
+    os.makedirs(os.path.dirname(cache_path(path)), exist_ok=True)
+    temporary_path = cache_path(path) + ".tmp"
+    with open(temporary_path, "wb") as cache_file:
+        pickle.dump(stamp or file_stamp(path), cache_file, pickle.HIGHEST_PROTOCOL)
+        pickle.dump(data, cache_file, pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_path, cache_path(path))
+
+
+def read_csv(path):
+    """
+    Returns the rows of the CSV file at path as tuples, header row first. Columns
+    holding only integers (or blanks) contain ints, all other values are strings.
+    """
+    data = read_cache(path)
+    if data is None:
+        data = parse_csv(path)
+        try:
+            write_cache(path, data)
+        except OSError:
+            pass  # e.g. a read-only checkout, the file is parsed again next time
+
+    header, columns = data
+    if not columns:
+        return [header]
+    return [header] + list(zip(*columns))
@@ -0,0 +1,77 @@
+#  Rendering of the mark-up Veekun uses in its prose, e.g.
+#
+#     Lowers the target's [Speed]{mechanic:speed} and [HP]{mechanic:hp}.
+#     Has the same effect as []{move:dragon-tail}.
+#
+#  A link is a label in square brackets followed by a `kind:identifier` target in
+#  braces. An empty label means the text should be derived from the target.
+#
+#  Every renderer makes a single pass over the text with one compiled pattern, so the
+#  cost grows linearly with the length of the prose.
+#
+#  This module must not import Django; make-database.py uses it as well. For a
+#  micro-benchmark over the prose files run
+#
+#     $ python markup-benchmark.py
+
+
+import re
+
+LINK_RGX = re.compile(r"\[(.*?)\]\{(.*?)\}")
+
+
+def split_target(target):
+    """Splits `kind:identifier` into its parts. A bare target is its own identifier."""
+    parts = target.split(":")
+    if len(parts) == 1:
+        return None, parts[0]
+    return parts[0], parts[1]
+
+
+def _plain(match):
+    label, target = match.groups()
+    if label:
+        return label
+    return split_target(target)[1].replace("-", " ")
+
+
+def _html(match):
+    label, target = match.groups()
+    if ":" not in target:
+        return match.group(0)
+    return '<a href="%s">%s</a>' % (target, label or target.split(":", 1)[1])
+
+
+def render_plain(text):
+    """
+    Replaces each link with its label, or with its identifier (dashes as spaces) when
+    the label is empty.
+    Example:
+        []{move:dragon-tail} will effect the opponents [HP]{mechanic:hp}.
+    Becomes:
+        dragon tail will effect the opponents HP.
+    """
+    return LINK_RGX.sub(_plain, text)
+
+
+def render_html(text):
+    """
+    Replaces each link with an <a> element pointing at its target, e.g.
+    [HP]{mechanic:hp} becomes <a href="mechanic:hp">HP</a>.
+    """
+    return LINK_RGX.sub(_html, text)
+
+
+def render_names(text, names):
+    """
+    Replaces each link with the localized name found in names, a mapping from
+    (kind, identifier) to name. Links without a name there fall back to render_plain.
+    """
+
+    def localized(match):
+        name = names.get(split_target(match.group(2)))
+        if name is None:
+            return _plain(match)
+        return name
+
+    return LINK_RGX.sub(localized, text)
@@ -0,0 +1,114 @@
+#  Snapshots of a fully built database, so an environment can be brought up by
+#  restoring one file instead of running every loader in data/v2/build.py.
+#
+#     $ python manage.py snapshot_data
+#     $ python manage.py restore_data
+#
+#  Snapshots are named after the database vendor and the data version, a hash of the
+#  CSV files in data/v2/csv, so a stale snapshot is never picked up by accident.
+#  PostgreSQL snapshots are pg_dump archives in the custom format, SQLite snapshots
+#  are plain database files.
+
+
+import os
+import os.path
+import sqlite3
+import subprocess
+from cachalot.api import invalidate
+from django.db import connection
+
+from .build import DATA_LOCATION
+from .csv_cache import corpus_hash
+
+SNAPSHOT_DIR = "snapshots"
+SNAPSHOT_EXTENSIONS = {"postgresql": ".dump", "sqlite": ".sqlite3"}
+
+
+def data_version():
+    return corpus_hash(DATA_LOCATION)
+
+
+def snapshot_file_name(version=None):
+    if connection.vendor not in SNAPSHOT_EXTENSIONS:
+        raise ValueError("Snapshots are not supported on %s" % connection.vendor)
+    return "pokeapi-%s-%s%s" % (
+        connection.vendor,
+        (version or data_version())[:12],
+        SNAPSHOT_EXTENSIONS[connection.vendor],
+    )
+
+
+def postgres_arguments():
+    """Returns the connection arguments and environment for the PostgreSQL client tools."""
+    settings_dict = connection.settings_dict
+    arguments = ["--dbname", settings_dict["NAME"]]
+    if settings_dict["HOST"]:
+        arguments += ["--host", settings_dict["HOST"]]
+    if settings_dict["PORT"]:
+        arguments += ["--port", str(settings_dict["PORT"])]
+    if settings_dict["USER"]:
+        arguments += ["--username", settings_dict["USER"]]
+
+    environment = dict(os.environ)
+    if settings_dict["PASSWORD"]:
+        environment["PGPASSWORD"] = settings_dict["PASSWORD"]
+    return arguments, environment
+
+
+def create_snapshot(output_dir=SNAPSHOT_DIR):
+    """Writes a snapshot of the database to output_dir and returns its path."""
+    path = os.path.join(output_dir, snapshot_file_name())
+    os.makedirs(output_dir, exist_ok=True)
+
+    if connection.vendor == "postgresql":
+        arguments, environment = postgres_arguments()
+        subprocess.run(
+            ["pg_dump", "--format=custom", "--no-owner", "--file", path] + arguments,
+            env=environment,
+            check=True,
+        )
+    else:
+        # The backup API copies a consistent state even while the database is in use
+        connection.ensure_connection()
+        snapshot = sqlite3.connect(path)
+        try:
+            connection.connection.backup(snapshot)
+        finally:
+            snapshot.close()
+
+    return path
+
+
+def find_snapshot(path=SNAPSHOT_DIR):
+    """
+    Returns the snapshot at path. When path is a directory, the snapshot matching the
+    current data version is looked up in it.
+    """
+    if os.path.isdir(path):
+        path = os.path.join(path, snapshot_file_name())
+    if not os.path.isfile(path):
+        raise FileNotFoundError("No snapshot at %s" % path)
+    return path
+
+
+def restore_snapshot(path):
+    """Replaces the contents of the database with the snapshot at path."""
+    if connection.vendor == "postgresql":
+        arguments, environment = postgres_arguments()
+        subprocess.run(
+            ["pg_restore", "--clean", "--if-exists", "--no-owner", "--single-transaction"]
+            + arguments
+            + [path],
+            env=environment,
+            check=True,
+        )
+    else:
+        connection.ensure_connection()
+        snapshot = sqlite3.connect(path)
+        try:
+            snapshot.backup(connection.connection)
+        finally:
+            snapshot.close()
+
+    # Nothing cached from before the restore is valid anymore
+    invalidate()
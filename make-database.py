@@ -1,12 +1,15 @@
 #!/bin/python
 # Tested for Python 3.7.3
 import argparse
-import csv
 import os
-import re
 import sqlite3
 import sys
 
+# data/v2/__init__.py pulls in the Django build script, so import these modules directly
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "v2"))
+from csv_cache import read_csv
+from markup import render_html
+
 DB_VERSION = 1
 
 parser = argparse.ArgumentParser(description="Generate the SQLITE database from the PokéApi files");
@@ -393,34 +396,17 @@ logd(" - Created move_effect_prose")
 logd("Filling tables...")
 
 def fill_table(table_name, field_names, file_name):
-    with open(args.input_dir + file_name, "r") as csvfile:
-        csvreader = csv.reader(csvfile)
-        qmarks = "("
-        for i in range(0, len(field_names)):
-            qmarks += "?,"
-        qmarks = qmarks[:-1]
-        qmarks += ")"
-        i = 0
-        for row in csvreader:
-            if i == 0:
-                i += 1
-                continue;
-            # SQL injection lol
-            c.execute(f"INSERT INTO {table_name} {str(field_names)}  VALUES {qmarks}", row)
+    # Rows come from the parse-once cache shared with data/v2/build.py
+    rows = read_csv(args.input_dir + file_name)
+    qmarks = "("
+    for i in range(0, len(field_names)):
+        qmarks += "?,"
+    qmarks = qmarks[:-1]
+    qmarks += ")"
+    # SQL injection lol
+    c.executemany(f"INSERT INTO {table_name} {str(field_names)}  VALUES {qmarks}", rows[1:])
     logd(f" - Filled {table_name} table")
 
-def replace_func(match):
-    link = match.group(2)
-    if len(match.group(1)) > 0:
-        text = match.group(1)
-    else:
-        text = match.group(3)
-    return f"<a href=\"{link}\">{text}</a>"
-
-def link(string):
-    pattern = r"\[(.*?)\]{(.*?\:(.*?))}"
-    return re.sub(pattern, replace_func, string)
-
 def link_row(table_name, field_names):
     if len(field_names) == 1:
         fields = field_names[0]
@@ -432,7 +418,7 @@ def link_row(table_name, field_names):
     c.execute(f"SELECT rowid, {fields} FROM {table_name}")
     for row in c.fetchall():
         for field in field_names:
-             c.execute(f"UPDATE {table_name} SET {field}=? WHERE rowid=?", (link(row[field]), row["rowid"]))
+             c.execute(f"UPDATE {table_name} SET {field}=? WHERE rowid=?", (render_html(row[field]), row["rowid"]))
     logd(f" - Added links in fields {str(fields)} in {table_name}")
 
 fill_table("languages", ("id", "iso639", "iso3166", "identifier", "official", "order"), "languages.csv")
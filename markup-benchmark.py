@@ -0,0 +1,39 @@
+#!/bin/python
+# Micro-benchmark of the prose renderers in data/v2/markup.py over the prose files
+import csv
+import os
+import sys
+import timeit
+
+# data/v2/__init__.py pulls in the Django build script, so import the module directly
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "v2"))
+from markup import render_html, render_names, render_plain
+
+CSV_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "v2", "csv")
+
+
+def benchmark(file_names=("move_effect_prose.csv", "ability_prose.csv"), number=20):
+    renderers = (
+        ("plain", render_plain),
+        ("html", render_html),
+        ("names", lambda text: render_names(text, {})),
+    )
+
+    for file_name in file_names:
+        with open(os.path.join(CSV_DIR, file_name), "rt", encoding="utf8") as csv_file:
+            rows = list(csv.reader(csv_file))[1:]
+        texts = [value for row in rows for value in row[2:]]
+        size = sum(len(text) for text in texts)
+
+        for renderer_name, renderer in renderers:
+            seconds = timeit.timeit(
+                lambda: [renderer(text) for text in texts], number=number
+            ) / number
+            print(
+                "%-24s %-6s %8.2f ms %10.1f MB/s"
+                % (file_name, renderer_name, seconds * 1000, size / seconds / 1e6)
+            )
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -1,12 +1,20 @@
+from collections import OrderedDict
+from itertools import groupby
+from operator import attrgetter
 import re
 from rest_framework import viewsets
+from rest_framework.exceptions import NotFound, ParseError
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.core.exceptions import ObjectDoesNotExist
 from django.shortcuts import get_object_or_404
-from django.http import Http404
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 
+from .dataset import preloaded_documents
+from .documents import document_body, swap_origin
 from .models import *
 from .serializers import *
+from .type_chart import type_chart
 
 # pylint: disable=no-member, attribute-defined-outside-init
 
@@ -54,8 +62,317 @@ class NameOrIdRetrieval():
         return resp
 
 
-class PokeapiCommonViewset(ListOrDetailSerialRelation,
-                           NameOrIdRetrieval, viewsets.ReadOnlyModelViewSet):
+class DocumentRetrieval():
+    """
+    Mixin to serve details from the documents the build materialized, when the
+    request asks for nothing but the plain detail response. The documents come from
+    the preloaded dataset when there is one.
+    """
+
+    def get_document(self):
+        """
+        Returns the stored body of the requested document, or None.
+        """
+        lookup = self.kwargs['pk']
+        preloaded = preloaded_documents(self.basename, self.request)
+        documents = ResourceDocument.objects.filter(
+            resource=self.basename).values_list('json', flat=True)
+
+        if NameOrIdRetrieval.idPattern.match(lookup):
+            if preloaded is not None:
+                return preloaded.by_id(int(lookup))
+            document = documents.filter(resource_id=lookup).first()
+        elif (isinstance(self, NameOrIdRetrieval) and
+              NameOrIdRetrieval.namePattern.match(lookup)):
+            if preloaded is not None:
+                return preloaded.by_name(lookup)
+            document = documents.filter(name=lookup).first()
+        else:
+            return None
+
+        return None if document is None else document.encode('utf-8')
+
+    def retrieve(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        if not request.query_params and request.accepted_media_type == renderer.media_type:
+            document = self.get_document()
+            if document is not None:
+                return HttpResponse(
+                    document_body(document, request), content_type=renderer.media_type)
+
+        return super().retrieve(request, *args, **kwargs)
+
+
+class BatchRetrieval():
+    """
+    Mixin to retrieve the details of several resources in one request, with
+    ?ids=1,4,7 or ?names=bulbasaur,charmander on the list route. The details
+    come back in the order asked for, and share the lookups of summaries they
+    have in common.
+    """
+
+    batch_limit = 50
+
+    def get_batch_lookups(self):
+        query_params = self.request.query_params
+        if 'ids' not in query_params and 'names' not in query_params:
+            return None
+
+        ids = [lookup for lookup in query_params.get('ids', '').split(',') if lookup]
+        names = [lookup for lookup in query_params.get('names', '').split(',') if lookup]
+
+        if not all(NameOrIdRetrieval.idPattern.match(lookup) for lookup in ids):
+            raise ParseError('ids must be numbers')
+        if names and not isinstance(self, NameOrIdRetrieval):
+            raise ParseError('%s can only be looked up by id' % self.basename)
+        if not ids and not names:
+            raise ParseError('No ids or names given')
+        if len(ids) + len(names) > self.batch_limit:
+            raise ParseError('At most %d resources can be retrieved at once' % self.batch_limit)
+
+        return [int(lookup) for lookup in ids], names
+
+    def get_serializer_class(self):
+        if self.action == 'list' and self.get_batch_lookups() is not None:
+            return self.serializer_class
+        return super().get_serializer_class()
+
+    def get_batch_documents(self, ids, names):
+        """
+        Returns the stored bodies of the requested documents, or None unless all of
+        them are stored.
+        """
+        if set(self.request.query_params) - {'ids', 'names'}:
+            return None
+
+        preloaded = preloaded_documents(self.basename, self.request)
+        if preloaded is not None:
+            documents = ([preloaded.by_id(lookup) for lookup in ids] +
+                         [preloaded.by_name(lookup) for lookup in names])
+            return None if None in documents else documents
+
+        documents = ResourceDocument.objects.filter(resource=self.basename)
+        by_id = by_name = {}
+        if ids:
+            by_id = dict(documents.filter(resource_id__in=ids).values_list('resource_id', 'json'))
+        if names:
+            by_name = dict(documents.filter(name__in=names).values_list('name', 'json'))
+
+        if len(by_id) < len(set(ids)) or len(by_name) < len(set(names)):
+            return None
+        return [by_id[lookup].encode('utf-8') for lookup in ids] + [
+            by_name[lookup].encode('utf-8') for lookup in names]
+
+    def list(self, request, *args, **kwargs):
+        lookups = self.get_batch_lookups()
+        if lookups is None:
+            return super().list(request, *args, **kwargs)
+        ids, names = lookups
+
+        renderer = request.accepted_renderer
+        if request.accepted_media_type == renderer.media_type:
+            documents = self.get_batch_documents(ids, names)
+            if documents is not None:
+                body = b'[' + b','.join(documents) + b']'
+                return HttpResponse(
+                    swap_origin(body, request.build_absolute_uri('/')[:-1]),
+                    content_type=renderer.media_type)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        by_id = by_name = {}
+        if ids:
+            by_id = {instance.pk: instance for instance in queryset.filter(pk__in=ids)}
+        if names:
+            by_name = {instance.name: instance for instance in queryset.filter(name__in=names)}
+
+        missing = ([str(lookup) for lookup in ids if lookup not in by_id] +
+                   [lookup for lookup in names if lookup not in by_name])
+        if missing:
+            raise NotFound('Not found: %s' % ', '.join(missing))
+
+        serializer = self.get_serializer(
+            [by_id[lookup] for lookup in ids] + [by_name[lookup] for lookup in names],
+            many=True)
+        return Response(serializer.data)
+
+
+def parse_field_paths(value):
+    """
+    Turns comma separated, dotted field paths into a tree of nested dicts,
+    e.g. 'name,moves.move' becomes {'name': {}, 'moves': {'move': {}}}.
+    """
+    tree = {}
+    for path in value.split(','):
+        if path:
+            node = tree
+            for name in path.split('.'):
+                node = node.setdefault(name, {})
+    return tree
+
+
+def select_fields(data, selected, excluded):
+    """
+    Returns data with only the fields in the selected tree, or all of them when it is
+    empty, minus the leaves of the excluded tree. Lists are filtered item by item.
+    """
+    if isinstance(data, list):
+        return [select_fields(item, selected, excluded) for item in data]
+    if not isinstance(data, dict):
+        return data
+
+    result = OrderedDict()
+    for name, value in data.items():
+        if (selected and name not in selected) or excluded.get(name) == {}:
+            continue
+        result[name] = select_fields(value, selected.get(name, {}), excluded.get(name, {}))
+    return result
+
+
+class FieldSelection():
+    """
+    Mixin to let clients pick fields with ?fields= and leave them out with
+    ?exclude=, e.g. ?fields=name,moves.move. Top level fields that are left
+    out are dropped from the serializer, so they are never computed.
+    """
+
+    def get_field_selection(self):
+        query_params = self.request.query_params
+        return (parse_field_paths(query_params.get('fields', '')),
+                parse_field_paths(query_params.get('exclude', '')))
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        selected, excluded = self.get_field_selection()
+        fields = getattr(serializer, 'child', serializer).fields
+
+        unknown = set(selected).union(excluded).difference(fields)
+        if unknown:
+            raise ParseError('Unknown fields: %s' % ', '.join(sorted(unknown)))
+
+        for name in list(fields):
+            if (selected and name not in selected) or excluded.get(name) == {}:
+                del fields[name]
+
+        return serializer
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        selected, excluded = self.get_field_selection()
+        if ((selected or excluded) and isinstance(response, Response) and
+                response.status_code == 200):
+            # Nested fields can only be picked from what the serializer produced
+            if self.action == 'list' and 'results' in response.data:
+                response.data['results'] = select_fields(
+                    response.data['results'], selected, excluded)
+            else:
+                response.data = select_fields(response.data, selected, excluded)
+
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+def split_envelope(renderer, envelope, key='results'):
+    """
+    Renders the envelope around its list under key, as the bytes before the first
+    item of the list and those after the last one.
+    """
+    # Renderers render None as an empty body rather than as null
+    members = [renderer.render(name) + b':' + (b'null' if value is None else renderer.render(value))
+               for name, value in envelope.items() if name != key]
+    position = list(envelope).index(key)
+    head = b''.join(member + b',' for member in members[:position])
+    tail = b''.join(b',' + member for member in members[position:])
+    return b'{' + head + renderer.render(key) + b':[', b']' + tail + b'}'
+
+
+class StreamingList():
+    """
+    Mixin to stream list pages of more than streaming_limit resources one resource
+    at a time, instead of serializing the whole page in memory first.
+    """
+
+    streaming_limit = 500
+
+    def list(self, request, *args, **kwargs):
+        paginator = self.paginator
+        if (not hasattr(paginator, 'paginate_queryset_lazily') or
+                (paginator.get_limit(request) or 0) <= self.streaming_limit):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = paginator.paginate_queryset_lazily(queryset, request, view=self)
+        serializer = self.get_serializer(queryset.none(), many=True)
+        selection = self.get_field_selection() if isinstance(self, FieldSelection) else None
+        renderer = request.accepted_renderer
+        head, tail = split_envelope(renderer, paginator.get_paginated_response([]).data)
+
+        def stream():
+            yield head
+            for index, instance in enumerate(page):
+                data = serializer.child.to_representation(instance)
+                if selection is not None:
+                    data = select_fields(data, *selection)
+                yield (b',' if index else b'') + renderer.render(data)
+            yield tail
+
+        return StreamingHttpResponse(stream(), content_type=renderer.media_type)
+
+
+class NDJSONExport():
+    """
+    Mixin to stream the details of every resource as newline delimited JSON, so
+    a resource can be mirrored with one request. Routed as {resource}/export.ndjson
+    with NDJSONRenderer.
+    """
+
+    export_chunk_size = 100
+
+    def export_documents(self, request):
+        if request.query_params:
+            return None
+
+        origin = request.build_absolute_uri('/')[:-1]
+        preloaded = preloaded_documents(self.basename, self.request)
+        if preloaded is not None:
+            return (swap_origin(document, origin) + b'\n' for document in preloaded.bodies)
+
+        documents = ResourceDocument.objects.filter(resource=self.basename)
+        if not documents.exists():
+            return None
+        return (
+            swap_origin(document.encode('utf-8'), origin) + b'\n'
+            for document in documents.order_by('resource_id')
+            .values_list('json', flat=True).iterator(chunk_size=self.export_chunk_size))
+
+    def export(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        lines = self.export_documents(request)
+        if lines is not None:
+            return StreamingHttpResponse(lines, content_type=renderer.media_type)
+
+        queryset = self.filter_queryset(self.get_queryset()).order_by('pk')
+        serializer = self.get_serializer(queryset.none(), many=True)
+        selection = self.get_field_selection() if isinstance(self, FieldSelection) else None
+
+        def stream():
+            # The resources are fetched a chunk at a time, so anything prefetched
+            # for them is as well
+            ids = list(queryset.values_list('pk', flat=True))
+            for start in range(0, len(ids), self.export_chunk_size):
+                for instance in queryset.filter(pk__in=ids[start:start + self.export_chunk_size]):
+                    try:
+                        data = serializer.child.to_representation(instance)
+                    except ObjectDoesNotExist:
+                        # Left out like the stored documents leave it out
+                        continue
+                    if selection is not None:
+                        data = select_fields(data, *selection)
+                    yield renderer.render(data)
+
+        return StreamingHttpResponse(stream(), content_type=renderer.media_type)
+
+
+class PokeapiCommonViewset(BatchRetrieval, StreamingList, ListOrDetailSerialRelation,
+                           DocumentRetrieval, FieldSelection, NDJSONExport, NameOrIdRetrieval,
+                           viewsets.ReadOnlyModelViewSet):
     pass
 
 
@@ -224,7 +541,9 @@ class LocationResource(PokeapiCommonViewset):
     list_serializer_class = LocationSummarySerializer
 
 
-class LocationAreaResource(ListOrDetailSerialRelation, viewsets.ReadOnlyModelViewSet):
+class LocationAreaResource(BatchRetrieval, StreamingList, ListOrDetailSerialRelation,
+                           DocumentRetrieval, FieldSelection, NDJSONExport,
+                           viewsets.ReadOnlyModelViewSet):
 
     queryset = LocationArea.objects.all()
     serializer_class = LocationAreaDetailSerializer
@@ -413,69 +732,68 @@ class PokemonEncounterView(APIView):
         except Pokemon.DoesNotExist:
             raise Http404
 
-        encounter_objects = Encounter.objects.filter(pokemon=pokemon)
-
-        area_ids = (encounter_objects
-                    .order_by('location_area')
-                    .distinct('location_area')
-                    .values_list('location_area', flat=True))
-
-        location_area_objects = LocationArea.objects.filter(pk__in=area_ids)
-        version_objects = Version.objects
-
+        # One query for the encounters joined with their area and details, one for
+        # their condition values. The ordering lets them be grouped by area and then
+        # version in a single pass.
+        encounter_objects = (encounters_with_details(pokemon=pokemon)
+                             .select_related('location_area')
+                             .order_by('location_area_id', 'version_id',
+                                       'encounter_slot_id', 'id'))
+        cache = {}
         encounters_list = []
 
-        for area_id in area_ids:
-
-            location_area = location_area_objects.get(pk=area_id)
-
-            area_encounters = encounter_objects.filter(location_area_id=area_id)
-
-            version_ids = (area_encounters
-                           .order_by('version_id')
-                           .distinct('version_id')
-                           .values_list('version_id', flat=True))
-
-            version_details_list = []
+        for _, area_encounters in groupby(encounter_objects,
+                                          key=attrgetter('location_area_id')):
 
-            for version_id in version_ids:
+            area_encounters = list(area_encounters)
 
-                version = version_objects.get(pk=version_id)
-
-                version_encounters = (area_encounters
-                                      .filter(version_id=version_id)
-                                      .order_by('encounter_slot_id'))
-
-                encounters_data = EncounterDetailSerializer(
-                    version_encounters, many=True, context=self.context).data
-
-                max_chance = 0
-                encounter_details_list = []
+            encounters_list.append({
+                'location_area': LocationAreaSummarySerializer(
+                    area_encounters[0].location_area, context=self.context).data,
+                'version_details': group_encounter_versions(
+                    area_encounters, self.context, cache)
+            })
 
-                for encounter in encounters_data:
-                    slot = EncounterSlot.objects.get(pk=encounter['encounter_slot'])
-                    slot_data = EncounterSlotSerializer(slot, context=self.context).data
+        return Response(encounters_list)
 
-                    del encounter['pokemon']
-                    del encounter['encounter_slot']
-                    del encounter['location_area']
-                    del encounter['version']
-                    encounter['chance'] = slot_data['chance']
-                    max_chance += slot_data['chance']
-                    encounter['method'] = slot_data['encounter_method']
 
-                    encounter_details_list.append(encounter)
+class TypeMatchupView(APIView):
+    """
+    Handles the combined damage multipliers against a defender of one or more types,
+    e.g. ?types=fire,flying
+    """
 
-                version_details_list.append({
-                    'version': VersionSummarySerializer(version, context=self.context).data,
-                    'max_chance': max_chance,
-                    'encounter_details': encounter_details_list
-                })
+    def get(self, request):
 
-            encounters_list.append({
-                'location_area': LocationAreaSummarySerializer(
-                    location_area, context=self.context).data,
-                'version_details': version_details_list
-            })
+        self.context = dict(request=request)
 
-        return Response(encounters_list)
+        lookups = [lookup for lookup in request.query_params.get('types', '').split(',')
+                   if lookup]
+        if not lookups:
+            raise ParseError('Pass the types to combine, e.g. ?types=fire,flying')
+
+        defending_types = []
+
+        for lookup in lookups:
+            if NameOrIdRetrieval.idPattern.match(lookup):
+                defending_types.append(get_object_or_404(Type, pk=lookup))
+            elif NameOrIdRetrieval.namePattern.match(lookup):
+                defending_types.append(get_object_or_404(Type, name=lookup))
+            else:
+                raise Http404
+
+        chart = type_chart()
+        multipliers = []
+
+        for attacking_type, multiplier in chart.defensive_multipliers(
+                [defending_type.pk for defending_type in defending_types]):
+            multipliers.append(OrderedDict([
+                ('type', TypeSummarySerializer(attacking_type, context=self.context).data),
+                ('multiplier', multiplier),
+            ]))
+
+        return Response(OrderedDict([
+            ('types', TypeSummarySerializer(
+                defending_types, many=True, context=self.context).data),
+            ('damage_multipliers', multipliers),
+        ]))
@@ -0,0 +1,29 @@
+from .models import DataVersion
+
+##########################
+#  DATA VERSION CACHING  #
+##########################
+
+# Values derived from the built data are kept per process together with the data
+# version they were derived from, and derived again once a build records a new one.
+# Without a recorded version, e.g. a database that wasn't filled by the build,
+# nothing is cached.
+
+DATA_CACHE = {}
+
+
+def cached_for_data_version(key, load):
+    """
+    Returns load() for key, calling it only once per data version.
+    """
+    version = DataVersion.current()
+    if version is None:
+        return load()
+
+    cached = DATA_CACHE.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    value = load()
+    DATA_CACHE[key] = (version, value)
+    return value
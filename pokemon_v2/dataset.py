@@ -0,0 +1,102 @@
+import gc
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+from django.db import connections
+
+from .models import DataVersion, ResourceDocument
+
+#######################
+#  PRELOADED DATASET  #
+#######################
+
+# The stored detail documents, loaded into memory once so details, batches and
+# exports are served without going to the database for them. Under gunicorn with
+# preload_app the master loads them before forking, and the workers share them
+# copy-on-write:
+#
+#     def when_ready(server):
+#         preload_dataset()
+#
+# The dataset is only used while the data version it was loaded for is current.
+# After a build the documents come from the database again, until a restart
+# preloads the new ones.
+
+PRELOAD_CHUNK_SIZE = 500
+
+# Holds the loaded Dataset under 'dataset'
+PRELOADED = {}
+
+Dataset = namedtuple('Dataset', ['version', 'resources'])
+
+
+class PreloadedDocuments(namedtuple('PreloadedDocuments', ['ids', 'bodies', 'names'])):
+    """
+    The documents of one resource: their bodies in order of id, the ids as a sorted
+    array and the index of every name.
+    """
+
+    def by_id(self, resource_id):
+        index = bisect_left(self.ids, resource_id)
+        if index < len(self.ids) and self.ids[index] == resource_id:
+            return self.bodies[index]
+        return None
+
+    def by_name(self, name):
+        index = self.names.get(name)
+        return None if index is None else self.bodies[index]
+
+
+def load_dataset():
+    """
+    Returns a Dataset of all stored documents, or None without a recorded data version.
+    """
+    version = DataVersion.current()
+    if version is None:
+        return None
+
+    rows = {}
+    documents = ResourceDocument.objects.order_by('resource', 'resource_id').values_list(
+        'resource', 'resource_id', 'name', 'json')
+    for resource, resource_id, name, json in documents.iterator(chunk_size=PRELOAD_CHUNK_SIZE):
+        rows.setdefault(resource, []).append((resource_id, name, json.encode('utf-8')))
+
+    return Dataset(version, {
+        resource: PreloadedDocuments(
+            array('l', (resource_id for resource_id, name, body in resource_rows)),
+            tuple(body for resource_id, name, body in resource_rows),
+            {name: index for index, (resource_id, name, body) in enumerate(resource_rows)
+             if name is not None})
+        for resource, resource_rows in rows.items()
+    })
+
+
+def preload_dataset():
+    """
+    Loads the dataset for this process and the ones forked from it, and returns how
+    many documents it holds.
+    """
+    loaded = PRELOADED['dataset'] = load_dataset()
+
+    # Forked workers mustn't share the connection, and the garbage collector would
+    # copy the pages of every object it visits in them
+    connections.close_all()
+    gc.freeze()
+
+    if loaded is None:
+        return 0
+    return sum(len(documents.ids) for documents in loaded.resources.values())
+
+
+def preloaded_documents(resource, request):
+    """
+    Returns the PreloadedDocuments of resource, or None when there are none for the
+    current data version, as looked up for request by DataVersionETagMiddleware.
+    """
+    loaded = PRELOADED.get('dataset')
+    if loaded is None:
+        return None
+    version = getattr(request, 'data_version', None) or DataVersion.current()
+    if loaded.version != version:
+        return None
+    return loaded.resources.get(resource)
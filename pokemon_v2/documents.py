@@ -0,0 +1,99 @@
+import hashlib
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import HttpRequest
+from rest_framework.settings import api_settings
+
+from .models import ResourceDocument
+
+######################
+#  DETAIL DOCUMENTS  #
+######################
+
+# The build renders the detail response of every resource once and stores it as a
+# ResourceDocument. Urls in the documents start with DOCUMENT_ORIGIN, which is
+# swapped for the origin of the request they are served to.
+
+DOCUMENT_HOST = 'documents.invalid'
+DOCUMENT_ORIGIN = 'http://' + DOCUMENT_HOST
+DOCUMENT_BATCH_SIZE = 100
+
+
+class DocumentRequest(HttpRequest):
+    """
+    A request for rendering documents, whose absolute urls start with DOCUMENT_ORIGIN.
+    """
+
+    def get_host(self):
+        return DOCUMENT_HOST
+
+
+def document_renderer():
+    return api_settings.DEFAULT_RENDERER_CLASSES[0]()
+
+
+def detail_routes():
+    """
+    Returns (resource, viewset) for every resource the API has a detail route for.
+    """
+    from .urls import router
+
+    return [(basename, viewset) for prefix, viewset, basename in router.registry]
+
+
+def render_documents(resource, viewset):
+    request = DocumentRequest()
+    renderer = document_renderer()
+    queryset = viewset.queryset.model.objects.order_by('pk')
+    has_name = any(field.name == 'name' for field in queryset.model._meta.fields)
+
+    for instance in queryset.iterator():
+        serializer = viewset.serializer_class(instance, context={'request': request})
+        try:
+            json = renderer.render(serializer.data)
+        except ObjectDoesNotExist:
+            # Incomplete data can't be rendered, so it is left to fail the usual way
+            continue
+        yield ResourceDocument(
+            resource=resource,
+            resource_id=instance.pk,
+            name=instance.name if has_name else None,
+            json=json.decode('utf-8'),
+            etag=hashlib.md5(json).hexdigest(),
+        )
+
+
+def materialize_documents():
+    """
+    Replaces the stored documents with freshly rendered ones and returns how many
+    were written.
+    """
+    ResourceDocument.objects.all().delete()
+
+    written = 0
+    for resource, viewset in detail_routes():
+        batch = []
+        for document in render_documents(resource, viewset):
+            batch.append(document)
+            if len(batch) == DOCUMENT_BATCH_SIZE:
+                ResourceDocument.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        ResourceDocument.objects.bulk_create(batch)
+        written += len(batch)
+
+    return written
+
+
+def swap_origin(body, origin):
+    """
+    Returns body, rendered for a DocumentRequest, with its urls pointing at origin.
+    """
+    renderer = document_renderer()
+    return body.replace(renderer.render(DOCUMENT_ORIGIN)[1:-1], renderer.render(origin)[1:-1])
+
+
+def document_body(body, request):
+    """
+    Returns the stored body of a document with its urls pointing at the origin of request.
+    """
+    return swap_origin(body, request.build_absolute_uri('/')[:-1])
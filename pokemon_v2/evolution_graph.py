@@ -0,0 +1,47 @@
+from .datacache import cached_for_data_version
+from .models import PokemonEvolution, PokemonSpecies
+
+# The relations PokemonEvolutionSerializer shows a summary of
+EVOLUTION_RELATIONS = (
+    'evolution_item', 'evolution_trigger', 'held_item', 'known_move', 'known_move_type',
+    'location', 'party_species', 'party_type', 'trade_species',
+)
+
+
+class EvolutionGraph():
+    """
+    The species of an evolution chain in chain order, together with the evolution rows
+    that lead to each of them.
+    """
+
+    def __init__(self, species, evolutions):
+        self.species = tuple(species)
+
+        evolutions_by_species = {}
+        for evolution in evolutions:
+            evolutions_by_species.setdefault(evolution.evolved_species_id, []).append(evolution)
+        self.evolutions = {
+            species_id: tuple(species_evolutions)
+            for species_id, species_evolutions in evolutions_by_species.items()
+        }
+
+    @classmethod
+    def load(cls, chain_id):
+        species = (PokemonSpecies.objects
+                   .filter(evolution_chain_id=chain_id)
+                   .only('id', 'name', 'is_baby', 'evolves_from_species_id', 'order')
+                   .order_by('order'))
+        evolutions = (PokemonEvolution.objects
+                      .filter(evolved_species__evolution_chain_id=chain_id)
+                      .select_related(*EVOLUTION_RELATIONS)
+                      .order_by('id'))
+
+        return cls(species, evolutions)
+
+    def evolutions_to(self, species_id):
+        return self.evolutions.get(species_id, ())
+
+
+def evolution_graph(chain_id):
+    return cached_for_data_version(
+        ('evolution_graph', chain_id), lambda: EvolutionGraph.load(chain_id))
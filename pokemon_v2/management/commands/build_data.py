@@ -0,0 +1,75 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from data.v2.build import BUILD_STAGES, build_all
+
+
+class Command(BaseCommand):
+    help = "Loads the CSV data from data/v2/csv into the database."
+
+    def add_arguments(self, parser):
+        stage_names = ", ".join(name for name, build_function, dependencies in BUILD_STAGES)
+        parser.add_argument(
+            '--only',
+            help="Comma separated stages to rebuild, e.g. pokemon,moves. The stages they "
+                 "depend on are synced as well. One of: %s" % stage_names)
+        parser.add_argument(
+            '--incremental', action='store_true',
+            help="Only write the rows that differ from the CSV files.")
+        parser.add_argument(
+            '--defer-indexes', action='store_true',
+            help="Drop indexes and foreign keys while loading (PostgreSQL only).")
+        parser.add_argument(
+            '--shadow', action='store_true',
+            help="Load into a shadow schema and swap it in at the end (PostgreSQL only).")
+        parser.add_argument(
+            '--documents', action='store_true', default=None,
+            help="Render the stored detail documents again, which only full builds "
+                 "do by default.")
+        parser.add_argument(
+            '--report', metavar='PATH',
+            help="Also write the per stage report as JSON to PATH.")
+
+    def handle(self, *args, **options):
+        only = options['only'].split(',') if options['only'] else None
+
+        try:
+            reports = build_all(
+                defer_indexes=options['defer_indexes'],
+                incremental=options['incremental'],
+                shadow=options['shadow'],
+                only=only,
+                documents=options['documents'],
+            )
+        except ValueError as error:
+            raise CommandError(error)
+
+        self.stdout.write(self.format_reports(reports))
+
+        if options['report']:
+            with open(options['report'], 'w') as report_file:
+                json.dump(reports, report_file, indent=2)
+
+    @staticmethod
+    def format_reports(reports):
+        lines = ['%-16s %-7s %9s %9s %10s %9s %12s' % (
+            'stage', 'mode', 'rows', 'seconds', 'rows/s', 'queries', 'peak rss kb')]
+
+        for report in reports:
+            lines.append('%-16s %-7s %9d %9.2f %10.0f %9d %12s' % (
+                report['stage'],
+                'sync' if report['incremental'] else 'rebuild',
+                report['rows'],
+                report['seconds'],
+                report['rows_per_second'] or 0,
+                report['queries'],
+                report['peak_rss_kb'] if report['peak_rss_kb'] is not None else '-',
+            ))
+
+        lines.append('%-16s %-7s %9d %9.2f' % (
+            'total', '',
+            sum(report['rows'] for report in reports),
+            sum(report['seconds'] for report in reports)))
+
+        return '\n'.join(lines)
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from pokemon_v2.static_api import STATIC_API_DIR, export_static_api
+
+
+class Command(BaseCommand):
+    help = "Writes the read-only API as static, precompressed JSON files for nginx."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--origin', default='http://localhost',
+            help="Scheme and host the API is served from, used in the urls of the "
+                 "resources (default: http://localhost).")
+        parser.add_argument(
+            '--output-dir', default=STATIC_API_DIR,
+            help="Directory to write the files to (default: %s)." % STATIC_API_DIR)
+        parser.add_argument(
+            '--workers', type=int,
+            help="Number of worker processes (default: one per CPU).")
+
+    def handle(self, *args, **options):
+        written = export_static_api(
+            options['origin'].rstrip('/'),
+            output_dir=options['output_dir'],
+            workers=options['workers'],
+        )
+
+        self.stdout.write('wrote %d paths to %s' % (written, options['output_dir']))
@@ -0,0 +1,28 @@
+import os.path
+from subprocess import CalledProcessError
+
+from django.core.management.base import BaseCommand, CommandError
+
+from data.v2.snapshot import SNAPSHOT_DIR, find_snapshot, restore_snapshot, snapshot_file_name
+
+
+class Command(BaseCommand):
+    help = "Replaces the database with a snapshot written by snapshot_data."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', nargs='?', default=SNAPSHOT_DIR,
+            help="Snapshot file, or a directory holding the snapshot for the current "
+                 "data version (default: %s)." % SNAPSHOT_DIR)
+
+    def handle(self, *args, **options):
+        try:
+            path = find_snapshot(options['path'])
+            if os.path.basename(path) != snapshot_file_name():
+                self.stderr.write(
+                    '%s does not match the current data in data/v2/csv' % path)
+            restore_snapshot(path)
+        except (ValueError, OSError, CalledProcessError) as error:
+            raise CommandError(error)
+
+        self.stdout.write('restored %s' % path)
@@ -0,0 +1,22 @@
+from subprocess import CalledProcessError
+
+from django.core.management.base import BaseCommand, CommandError
+
+from data.v2.snapshot import SNAPSHOT_DIR, create_snapshot
+
+
+class Command(BaseCommand):
+    help = "Writes a snapshot of the built database, named after the data version."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output-dir', default=SNAPSHOT_DIR,
+            help="Directory to write the snapshot to (default: %s)." % SNAPSHOT_DIR)
+
+    def handle(self, *args, **options):
+        try:
+            path = create_snapshot(options['output_dir'])
+        except (ValueError, CalledProcessError) as error:
+            raise CommandError(error)
+
+        self.stdout.write('wrote %s' % path)
@@ -0,0 +1,69 @@
+import hashlib
+import os
+from functools import lru_cache
+import rest_framework
+from django.conf import settings
+from django.http import HttpResponseNotModified
+from django.utils.cache import parse_etags, patch_cache_control
+
+from .models import DataVersion
+
+
+@lru_cache(maxsize=None)
+def code_version():
+    """
+    Returns a hash of the source of this app and the version of the framework that
+    renders it, which changes with any release that could change a response.
+    """
+    digest = hashlib.md5(rest_framework.VERSION.encode('utf-8'))
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for file_name in sorted(os.listdir(directory)):
+        if file_name.endswith('.py'):
+            with open(os.path.join(directory, file_name), 'rb') as source_file:
+                digest.update(source_file.read())
+    return digest.hexdigest()
+
+
+class DataVersionETagMiddleware():
+    """
+    Tags API responses with an ETag derived from the data version, the release of the
+    code and the requested url, which only changes when a build records new data or a
+    new release is deployed. A request that already holds the current ETag gets a 304
+    before any view runs, at the cost of looking up the data version, which cachalot
+    keeps cached.
+
+    As the ETag isn't derived from the body itself it is a weak one, and it is compared
+    as one, so it also matches after e.g. nginx compressed the response.
+
+    The version is kept as request.data_version for the views. Without a recorded
+    data version responses are left untagged.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method not in ('GET', 'HEAD') or not request.path.startswith('/api/'):
+            return self.get_response(request)
+
+        version = request.data_version = DataVersion.current()
+        if version is None:
+            return self.get_response(request)
+
+        opaque_tag = '"%s"' % hashlib.md5(('%s %s %s' % (
+            version, code_version(), request.build_absolute_uri())).encode('utf-8')).hexdigest()
+
+        if_none_match = [
+            tag[2:] if tag.startswith('W/') else tag
+            for tag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+        ]
+        if opaque_tag in if_none_match or '*' in if_none_match:
+            response = HttpResponseNotModified()
+        else:
+            response = self.get_response(request)
+            if response.status_code != 200:
+                return response
+
+        response['ETag'] = 'W/' + opaque_tag
+        patch_cache_control(response, public=True, max_age=settings.API_CACHE_MAX_AGE)
+        return response
@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pokemon_v2', '0004_dataversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResourceDocument',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource', models.CharField(max_length=100)),
+                ('resource_id', models.IntegerField()),
+                ('name', models.CharField(blank=True, max_length=100, null=True)),
+                ('json', models.TextField()),
+                ('etag', models.CharField(max_length=32)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='resourcedocument',
+            unique_together={('resource', 'resource_id')},
+        ),
+        migrations.AlterIndexTogether(
+            name='resourcedocument',
+            index_together={('resource', 'name')},
+        ),
+    ]
@@ -1483,3 +1483,41 @@ class PokemonType(HasPokemon, HasType):
 class PokemonSprites(HasPokemon):
 
     sprites = models.CharField(max_length=500)
+
+
+#################
+#  DATA MODELS  #
+#################
+
+class DataVersion(models.Model):
+    """
+    Hash of the CSV files the tables were last built from. A single row, written by
+    data/v2/build.py, that lets derived data be cached until the next build.
+    """
+
+    version = models.CharField(max_length=40)
+
+    @classmethod
+    def current(cls):
+        return cls.objects.values_list('version', flat=True).first()
+
+
+class ResourceDocument(models.Model):
+    """
+    The rendered detail response of one resource, materialized by data/v2/build.py so
+    the API can serve it without querying and serializing the resource again.
+    """
+
+    resource = models.CharField(max_length=100)
+
+    resource_id = models.IntegerField()
+
+    name = models.CharField(max_length=100, blank=True, null=True)
+
+    json = models.TextField()
+
+    etag = models.CharField(max_length=32)
+
+    class Meta:
+        unique_together = (('resource', 'resource_id'),)
+        index_together = (('resource', 'name'),)
@@ -0,0 +1,92 @@
+from collections import OrderedDict
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from rest_framework.response import Response
+
+from .datacache import cached_for_data_version
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Pages through a list by id with opaque cursors, so a page costs the same
+    however deep into the list it is.
+    """
+
+    ordering = 'id'
+    page_size_query_param = 'limit'
+
+    count = None
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.count),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+
+class PokeapiPagination(LimitOffsetPagination):
+    """
+    Limit and offset pagination, or keyset pagination when the request has a
+    cursor param, empty for the first page. The total count of a list is only
+    counted once per data version.
+    """
+
+    cursor_query_param = 'cursor'
+
+    count = None
+    limit = None
+    offset = None
+    request = None
+    keyset = None
+
+    lazy_chunk_size = 500
+
+    def get_count(self, queryset):
+        return cached_for_data_version(('count', str(queryset.query)), queryset.count)
+
+    def is_keyset(self, request):
+        return self.cursor_query_param in request.query_params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_keyset(request):
+            return super().paginate_queryset(queryset, request, view)
+
+        self.count = self.get_count(queryset)
+        self.keyset = KeysetPagination()
+        self.keyset.count = self.count
+        return self.keyset.paginate_queryset(queryset, request, view)
+
+    def paginate_queryset_lazily(self, queryset, request, view=None):
+        """
+        Like paginate_queryset, but returns an iterator over the page that fetches its
+        resources lazy_chunk_size at a time, so the page is never held in memory.
+        """
+        if self.is_keyset(request):
+            # Only the ids of a keyset page are fetched up front, to find its cursors
+            ids_only = queryset.select_related(None).prefetch_related(None).only('pk')
+            page = self.paginate_queryset(ids_only, request, view)
+            return self.iterate_ids(queryset, [instance.pk for instance in page])
+
+        self.count = self.get_count(queryset)
+        self.limit = self.get_limit(request)
+        self.offset = self.get_offset(request)
+        self.request = request
+
+        if self.count == 0 or self.offset > self.count:
+            return iter(())
+        return queryset[self.offset:self.offset + self.limit].iterator(
+            chunk_size=self.lazy_chunk_size)
+
+    def iterate_ids(self, queryset, ids):
+        for start in range(0, len(ids), self.lazy_chunk_size):
+            chunk = ids[start:start + self.lazy_chunk_size]
+            instances = queryset.in_bulk(chunk)
+            for resource_id in chunk:
+                if resource_id in instances:
+                    yield instances[resource_id]
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
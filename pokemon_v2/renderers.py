@@ -0,0 +1,14 @@
+from drf_ujson.renderers import UJSONRenderer
+
+
+class NDJSONRenderer(UJSONRenderer):
+    """
+    Renders data as one line of newline delimited JSON. A stream of resources is
+    rendered one resource at a time.
+    """
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def render(self, data, *args, **kwargs):
+        return super().render(data, *args, **kwargs) + b'\n'
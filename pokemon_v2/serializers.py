@@ -1,13 +1,19 @@
 from collections import OrderedDict
+from functools import lru_cache
+from itertools import groupby
+from operator import attrgetter
 import json
-from django.urls import reverse
+from django.db.models import Prefetch
+from django.urls import NoReverseMatch, get_script_prefix, reverse
 from rest_framework import serializers
 
 # pylint: disable=redefined-builtin
 
 # PokeAPI v2 serializers in order of dependency
 
+from .evolution_graph import evolution_graph
 from .models import *
+from .type_chart import type_chart
 
 
 #########################
@@ -19,342 +25,408 @@ from .models import *
 # Putting summary serializers up top so there are no conflicts
 # with reference accross models due to script running order
 
-class AbilitySummarySerializer(serializers.HyperlinkedModelSerializer):
+URL_TEMPLATE_SENTINEL = 987654321
+
+
+@lru_cache(maxsize=None)
+def url_template(view_name, lookup_url_kwarg):
+    """
+    Returns the path of view_name below the script prefix split around its lookup
+    value, e.g. ('api/v2/move/', '/'), or None when the route can't be reversed that
+    way. The URLconf is only resolved once per route.
+    """
+    try:
+        path = reverse(view_name, kwargs={lookup_url_kwarg: URL_TEMPLATE_SENTINEL})
+    except NoReverseMatch:
+        return None
+    # reverse() starts the path with the script prefix of the current request
+    path = path[len(get_script_prefix()):]
+    prefix, sentinel, suffix = path.partition(str(URL_TEMPLATE_SENTINEL))
+    if not sentinel:
+        return None
+    return prefix, suffix
+
+
+class TemplateHyperlinkedIdentityField(serializers.HyperlinkedIdentityField):
+    """
+    Formats the url of an object into the template of its route instead of
+    reversing the URLconf for each object.
+    """
+
+    def get_url(self, obj, view_name, request, format):
+        template = url_template(view_name, self.lookup_url_kwarg)
+
+        if template is None or format or getattr(request, 'versioning_scheme', None):
+            return super().get_url(obj, view_name, request, format)
+
+        lookup_value = getattr(obj, self.lookup_field)
+        if lookup_value in (None, ''):
+            return None
+
+        path = get_script_prefix() + template[0] + str(lookup_value) + template[1]
+        return request.build_absolute_uri(path) if request is not None else path
+
+
+class SummarySerializer(serializers.HyperlinkedModelSerializer):
+
+    serializer_url_field = TemplateHyperlinkedIdentityField
+
+
+class AbilitySummarySerializer(SummarySerializer):
 
     class Meta:
         model = Ability
         fields = ('name', 'url')
 
 
-class BerryFirmnessSummarySerializer(serializers.HyperlinkedModelSerializer):
+class BerryFirmnessSummarySerializer(SummarySerializer):
 
     class Meta:
         model = BerryFirmness
         fields = ('name', 'url')
 
 
-class BerryFlavorSummarySerializer(serializers.HyperlinkedModelSerializer):
+class BerryFlavorSummarySerializer(SummarySerializer):
 
     class Meta:
         model = BerryFlavor
         fields = ('name', 'url')
 
 
-class BerrySummarySerializer(serializers.HyperlinkedModelSerializer):
+class BerrySummarySerializer(SummarySerializer):
 
     class Meta:
         model = Berry
         fields = ('name', 'url')
 
 
-class CharacteristicSummarySerializer(serializers.HyperlinkedModelSerializer):
+class CharacteristicSummarySerializer(SummarySerializer):
 
     class Meta:
         model = Characteristic
         fields = ('url',)
 
 
-class ContestEffectSummarySerializer(serializers.HyperlinkedModelSerializer):
+class ContestEffectSummarySerializer(SummarySerializer):
 
     class Meta:
         model = ContestEffect
         fields = ('url',)
 
 
-class ContestTypeSummarySerializer(serializers.HyperlinkedModelSerializer):
+class ContestTypeSummarySerializer(SummarySerializer):
 
     class Meta:
         model = ContestType
         fields = ('name', 'url')
 
 
-class EggGroupSummarySerializer(serializers.HyperlinkedModelSerializer):
+class EggGroupSummarySerializer(SummarySerializer):
 
     class Meta:
         model = EggGroup
         fields = ('name', 'url')
 
 
-class EncounterConditionSummarySerializer(serializers.HyperlinkedModelSerializer):
+class EncounterConditionSummarySerializer(SummarySerializer):
 
     class Meta:
         model = EncounterCondition
         fields = ('name', 'url')
 
 
-class EncounterConditionValueSummarySerializer(serializers.HyperlinkedModelSerializer):
+class EncounterConditionValueSummarySerializer(SummarySerializer):
 
     class Meta:
         model = EncounterConditionValue
         fields = ('name', 'url')
 
 
-class EncounterMethodSummarySerializer(serializers.HyperlinkedModelSerializer):
+class EncounterMethodSummarySerializer(SummarySerializer):
 
     class Meta:
         model = EncounterMethod
         fields = ('name', 'url')
 
 
-class EvolutionTriggerSummarySerializer(serializers.HyperlinkedModelSerializer):
+class EvolutionTriggerSummarySerializer(SummarySerializer):
 
     class Meta:
         model = EvolutionTrigger
         fields = ('name', 'url')
 
 
-class EvolutionChainSummarySerializer(serializers.HyperlinkedModelSerializer):
+class EvolutionChainSummarySerializer(SummarySerializer):
 
     class Meta:
         model = EvolutionChain
         fields = ('url',)
 
 
-class GenerationSummarySerializer(serializers.HyperlinkedModelSerializer):
+class GenerationSummarySerializer(SummarySerializer):
 
     class Meta:
         model = Generation
         fields = ('name', 'url')
 
 
-class GenderSummarySerializer(serializers.HyperlinkedModelSerializer):
+class GenderSummarySerializer(SummarySerializer):
 
     class Meta:
         model = Gender
         fields = ('name', 'url')
 
 
-class GrowthRateSummarySerializer(serializers.HyperlinkedModelSerializer):
+class GrowthRateSummarySerializer(SummarySerializer):
 
     class Meta:
         model = GrowthRate
         fields = ('name', 'url')
 
 
-class ItemPocketSummarySerializer(serializers.HyperlinkedModelSerializer):
+class ItemPocketSummarySerializer(SummarySerializer):
 
     class Meta:
         model = ItemPocket
         fields = ('name', 'url')
 
 
-class ItemCategorySummarySerializer(serializers.HyperlinkedModelSerializer):
+class ItemCategorySummarySerializer(SummarySerializer):
 
     class Meta:
         model = ItemCategory
         fields = ('name', 'url')
 
 
-class ItemAttributeSummarySerializer(serializers.HyperlinkedModelSerializer):
+class ItemAttributeSummarySerializer(SummarySerializer):
 
     class Meta:
         model = ItemAttribute
         fields = ('name', 'url')
 
 
-class ItemFlingEffectSummarySerializer(serializers.HyperlinkedModelSerializer):
+class ItemFlingEffectSummarySerializer(SummarySerializer):
 
     class Meta:
         model = ItemFlingEffect
         fields = ('name', 'url')
 
 
-class ItemSummarySerializer(serializers.HyperlinkedModelSerializer):
+class ItemSummarySerializer(SummarySerializer):
 
     class Meta:
         model = Item
         fields = ('name', 'url')
 
 
-class LanguageSummarySerializer(serializers.HyperlinkedModelSerializer):
+class LanguageSummarySerializer(SummarySerializer):
 
     class Meta:
         model = Language
         fields = ('name', 'url')
 
 
-class LocationSummarySerializer(serializers.HyperlinkedModelSerializer):
+class LocationSummarySerializer(SummarySerializer):
 
     class Meta:
         model = Location
         fields = ('name', 'url')
 
 
-class LocationAreaSummarySerializer(serializers.HyperlinkedModelSerializer):
+class LocationAreaSummarySerializer(SummarySerializer):
 
     class Meta:
         model = LocationArea
         fields = ('name', 'url')
 
 
-class MachineSummarySerializer(serializers.HyperlinkedModelSerializer):
+class MachineSummarySerializer(SummarySerializer):
 
     class Meta:
         model = Machine
         fields = ('url',)
 
 
-class MoveBattleStyleSummarySerializer(serializers.HyperlinkedModelSerializer):
+class MoveBattleStyleSummarySerializer(SummarySerializer):
 
     class Meta:
         model = MoveBattleStyle
         fields = ('name', 'url')
 
 
-class MoveDamageClassSummarySerializer(serializers.HyperlinkedModelSerializer):
+class MoveDamageClassSummarySerializer(SummarySerializer):
 
     class Meta:
         model = MoveDamageClass
         fields = ('name', 'url')
 
 
-class MoveMetaAilmentSummarySerializer(serializers.HyperlinkedModelSerializer):
+class MoveMetaAilmentSummarySerializer(SummarySerializer):
 
     class Meta:
         model = MoveMetaAilment
         fields = ('name', 'url')
 
 
-class MoveMetaCategorySummarySerializer(serializers.HyperlinkedModelSerializer):
+class MoveMetaCategorySummarySerializer(SummarySerializer):
 
     class Meta:
         model = MoveMetaCategory
         fields = ('name', 'url')
 
 
-class MoveTargetSummarySerializer(serializers.HyperlinkedModelSerializer):
+class MoveTargetSummarySerializer(SummarySerializer):
 
     class Meta:
         model = MoveTarget
         fields = ('name', 'url')
 
 
-class MoveSummarySerializer(serializers.HyperlinkedModelSerializer):
+class MoveSummarySerializer(SummarySerializer):
 
     class Meta:
         model = Move
         fields = ('name', 'url')
 
 
-class MoveLearnMethodSummarySerializer(serializers.HyperlinkedModelSerializer):
+class MoveLearnMethodSummarySerializer(SummarySerializer):
 
     class Meta:
         model = MoveLearnMethod
         fields = ('name', 'url')
 
 
-class NatureSummarySerializer(serializers.HyperlinkedModelSerializer):
+class NatureSummarySerializer(SummarySerializer):
 
     class Meta:
         model = Nature
         fields = ('name', 'url')
 
 
-class PalParkAreaSummarySerializer(serializers.HyperlinkedModelSerializer):
+class PalParkAreaSummarySerializer(SummarySerializer):
 
     class Meta:
         model = PalParkArea
         fields = ('name', 'url')
 
 
-class PokeathlonStatSummarySerializer(serializers.HyperlinkedModelSerializer):
+class PokeathlonStatSummarySerializer(SummarySerializer):
 
     class Meta:
         model = PokeathlonStat
         fields = ('name', 'url')
 
 
-class PokedexSummarySerializer(serializers.HyperlinkedModelSerializer):
+class PokedexSummarySerializer(SummarySerializer):
 
     class Meta:
         model = Pokedex
         fields = ('name', 'url')
 
 
-class PokemonColorSummarySerializer(serializers.HyperlinkedModelSerializer):
+class PokemonColorSummarySerializer(SummarySerializer):
 
     class Meta:
         model = PokemonColor
         fields = ('name', 'url')
 
 
-class PokemonHabitatSummarySerializer(serializers.HyperlinkedModelSerializer):
+class PokemonHabitatSummarySerializer(SummarySerializer):
 
     class Meta:
         model = PokemonHabitat
         fields = ('name', 'url')
 
 
-class PokemonShapeSummarySerializer(serializers.HyperlinkedModelSerializer):
+class PokemonShapeSummarySerializer(SummarySerializer):
 
     class Meta:
         model = PokemonShape
         fields = ('name', 'url')
 
 
-class PokemonSummarySerializer(serializers.HyperlinkedModelSerializer):
+class PokemonSummarySerializer(SummarySerializer):
 
     class Meta:
         model = Pokemon
         fields = ('name', 'url')
 
 
-class PokemonSpeciesSummarySerializer(serializers.HyperlinkedModelSerializer):
+class PokemonSpeciesSummarySerializer(SummarySerializer):
 
     class Meta:
         model = PokemonSpecies
         fields = ('name', 'url')
 
 
-class PokemonFormSummarySerializer(serializers.HyperlinkedModelSerializer):
+class PokemonFormSummarySerializer(SummarySerializer):
 
     class Meta:
         model = PokemonForm
         fields = ('name', 'url')
 
 
-class RegionSummarySerializer(serializers.HyperlinkedModelSerializer):
+class RegionSummarySerializer(SummarySerializer):
 
     class Meta:
         model = Region
         fields = ('name', 'url')
 
 
-class StatSummarySerializer(serializers.HyperlinkedModelSerializer):
+class StatSummarySerializer(SummarySerializer):
 
     class Meta:
         model = Stat
         fields = ('name', 'url')
 
 
-class SuperContestEffectSummarySerializer(serializers.HyperlinkedModelSerializer):
+class SuperContestEffectSummarySerializer(SummarySerializer):
 
     class Meta:
         model = SuperContestEffect
         fields = ('url',)
 
 
-class TypeSummarySerializer(serializers.HyperlinkedModelSerializer):
+class TypeSummarySerializer(SummarySerializer):
 
     class Meta:
         model = Type
         fields = ('name', 'url')
 
 
-class VersionSummarySerializer(serializers.HyperlinkedModelSerializer):
+class VersionSummarySerializer(SummarySerializer):
 
     class Meta:
         model = Version
         fields = ('name', 'url')
 
 
-class VersionGroupSummarySerializer(serializers.HyperlinkedModelSerializer):
+class VersionGroupSummarySerializer(SummarySerializer):
 
     class Meta:
         model = VersionGroup
         fields = ('name', 'url')
 
 
+def cached_summary(cache, serializer_class, instance, context):
+    """
+    Returns the summary of instance, serializing it only the first time its id is seen.
+    For lists where the same few version groups or methods are referenced many times.
+    """
+    key = (serializer_class, instance.pk)
+    if key not in cache:
+        cache[key] = serializer_class(instance, context=context).data
+    return cache[key]
+
+
+def summary_cache(context):
+    """
+    Returns the cache for cached_summary kept in a serializer context, so every
+    resource serialized with that context, e.g. each one in a batch, shares it.
+    """
+    return context.setdefault('summary_cache', {})
+
+
 #####################
 #  MAP SERIALIZERS  #
 #####################
@@ -871,6 +943,61 @@ class EncounterDetailSerializer(serializers.ModelSerializer):
         return values
 
 
+def encounters_with_details(**filters):
+    """
+    Returns the encounters matching filters with everything their details show joined
+    in, plus one prefetch query for their condition values.
+    """
+    return (Encounter.objects
+            .filter(**filters)
+            .select_related('version', 'encounter_slot__encounter_method')
+            .prefetch_related(Prefetch(
+                'encounterconditionvaluemap_set',
+                queryset=(EncounterConditionValueMap.objects
+                          .select_related('encounter_condition_value')
+                          .order_by('id')))))
+
+
+def group_encounter_versions(encounters, context, cache):
+    """
+    Groups encounters, ordered by version, into the version details of the encounter
+    listings: the details of each encounter and the summed chance per version.
+    """
+    version_details_list = []
+
+    for _, version_encounters in groupby(encounters, key=attrgetter('version_id')):
+
+        version_encounters = list(version_encounters)
+        version_detail = OrderedDict()
+        version_detail['version'] = cached_summary(
+            cache, VersionSummarySerializer, version_encounters[0].version, context)
+        version_detail['max_chance'] = 0
+        version_detail['encounter_details'] = []
+
+        for encounter in version_encounters:
+
+            slot = encounter.encounter_slot
+            encounter_detail = OrderedDict()
+            encounter_detail['min_level'] = encounter.min_level
+            encounter_detail['max_level'] = encounter.max_level
+            encounter_detail['condition_values'] = [
+                cached_summary(
+                    cache, EncounterConditionValueSummarySerializer,
+                    condition_value_map.encounter_condition_value, context)
+                for condition_value_map in encounter.encounterconditionvaluemap_set.all()
+            ]
+            encounter_detail['chance'] = slot.rarity
+            encounter_detail['method'] = cached_summary(
+                cache, EncounterMethodSummarySerializer, slot.encounter_method, context)
+
+            version_detail['max_chance'] += slot.rarity
+            version_detail['encounter_details'].append(encounter_detail)
+
+        version_details_list.append(version_detail)
+
+    return version_details_list
+
+
 class LocationAreaEncounterRateSerializer(serializers.ModelSerializer):
 
     encounter_method = EncounterMethodSummarySerializer()
@@ -906,35 +1033,30 @@ class LocationAreaDetailSerializer(serializers.ModelSerializer):
 
     def get_method_rates(self, obj):
 
-        # Get encounters related to this area and pull out unique encounter methods
-        encounter_rates = LocationAreaEncounterRate.objects.filter(
-            location_area=obj).order_by('encounter_method_id')
-        method_ids = encounter_rates.values('encounter_method_id').distinct()
+        # All rates of this area in one query, grouped by encounter method
+        encounter_rates = (LocationAreaEncounterRate.objects
+                           .filter(location_area=obj)
+                           .select_related('encounter_method', 'version')
+                           .order_by('encounter_method_id', 'id'))
+        cache = summary_cache(self.context)
         encounter_rate_list = []
 
-        for id in method_ids:
+        for _, method_rates in groupby(encounter_rates,
+                                       key=attrgetter('encounter_method_id')):
 
+            method_rates = list(method_rates)
             encounter_rate_details = OrderedDict()
-
-            # Get each Unique Item by ID
-            encounter_method_object = EncounterMethod.objects.get(pk=id['encounter_method_id'])
-            encounter_method_data = EncounterMethodSummarySerializer(
-                encounter_method_object, context=self.context).data
-            encounter_rate_details['encounter_method'] = encounter_method_data
-
-            # Get Versions associated with each unique item
-            area_encounter_objects = encounter_rates.filter(
-                encounter_method_id=id['encounter_method_id'])
-            serializer = LocationAreaEncounterRateSerializer(
-                area_encounter_objects, many=True, context=self.context)
+            encounter_rate_details['encounter_method'] = EncounterMethodSummarySerializer(
+                method_rates[0].encounter_method, context=self.context).data
             encounter_rate_details['version_details'] = []
 
-            for area_encounter in serializer.data:
+            for area_encounter in method_rates:
 
                 version_detail = OrderedDict()
 
-                version_detail['rate'] = area_encounter['rate']
-                version_detail['version'] = area_encounter['version']
+                version_detail['rate'] = area_encounter.rate
+                version_detail['version'] = cached_summary(
+                    cache, VersionSummarySerializer, area_encounter.version, self.context)
 
                 encounter_rate_details['version_details'].append(version_detail)
 
@@ -944,54 +1066,22 @@ class LocationAreaDetailSerializer(serializers.ModelSerializer):
 
     def get_encounters(self, obj):
 
-        # get versions for later use
-        version_objects = Version.objects.all()
-        version_data = VersionSummarySerializer(
-            version_objects, many=True, context=self.context).data
-
-        # all encounters associated with location area
-        all_encounters = Encounter.objects.filter(location_area=obj).order_by('pokemon')
+        # all encounters associated with location area, ordered to group them by
+        # pokemon and then by version
+        all_encounters = (encounters_with_details(location_area=obj)
+                          .select_related('pokemon')
+                          .order_by('pokemon_id', 'version_id', 'id'))
+        cache = summary_cache(self.context)
         encounters_list = []
 
-        # break encounters into pokemon groupings
-        for poke in all_encounters.values('pokemon').distinct():
-
-            pokemon_object = Pokemon.objects.get(pk=poke['pokemon'])
+        for _, pokemon_encounters in groupby(all_encounters, key=attrgetter('pokemon_id')):
 
+            pokemon_encounters = list(pokemon_encounters)
             pokemon_detail = OrderedDict()
             pokemon_detail['pokemon'] = PokemonSummarySerializer(
-                pokemon_object, context=self.context).data
-            pokemon_detail['version_details'] = []
-
-            poke_encounters = all_encounters.filter(pokemon=poke['pokemon']).order_by('version')
-
-            # each pokemon has multiple versions it could be encountered in
-            for ver in poke_encounters.values('version').distinct():
-                version_detail = OrderedDict()
-                version_detail['version'] = version_data[ver['version'] - 1]
-                version_detail['max_chance'] = 0
-                version_detail['encounter_details'] = []
-
-                poke_data = EncounterDetailSerializer(
-                    poke_encounters.filter(version=ver['version']),
-                    many=True, context=self.context).data
-
-                # each version has multiple ways a pokemon can be encountered
-                for encounter in poke_data:
-
-                    slot = EncounterSlot.objects.get(pk=encounter['encounter_slot'])
-                    slot_data = EncounterSlotSerializer(slot, context=self.context).data
-                    del encounter['pokemon']
-                    del encounter['encounter_slot']
-                    del encounter['location_area']
-                    del encounter['version']
-                    encounter['chance'] = slot_data['chance']
-                    version_detail['max_chance'] += slot_data['chance']
-                    encounter['method'] = slot_data['encounter_method']
-
-                    version_detail['encounter_details'].append(encounter)
-
-                pokemon_detail['version_details'].append(version_detail)
+                pokemon_encounters[0].pokemon, context=self.context).data
+            pokemon_detail['version_details'] = group_encounter_versions(
+                pokemon_encounters, self.context, cache)
 
             encounters_list.append(pokemon_detail)
 
@@ -1715,35 +1805,29 @@ class TypeDetailSerializer(serializers.ModelSerializer):
         relations['half_damage_from'] = []
         relations['double_damage_from'] = []
 
-        # Damage To
-        results = TypeEfficacy.objects.filter(damage_type=obj)
-        serializer = TypeEfficacySerializer(results, many=True, context=self.context)
+        chart = type_chart()
 
-        for relation in serializer.data:
-            type = Type.objects.get(pk=relation['target_type'])
-            if relation['damage_factor'] == 200:
+        # Damage To
+        for type, damage_factor in chart.damage_to(obj.pk):
+            if damage_factor == 200:
                 relations['double_damage_to'].append(
                     TypeSummarySerializer(type, context=self.context).data)
-            elif relation['damage_factor'] == 50:
+            elif damage_factor == 50:
                 relations['half_damage_to'].append(
                     TypeSummarySerializer(type, context=self.context).data)
-            elif relation['damage_factor'] == 0:
+            elif damage_factor == 0:
                 relations['no_damage_to'].append(
                     TypeSummarySerializer(type, context=self.context).data)
 
         # Damage From
-        results = TypeEfficacy.objects.filter(target_type=obj)
-        serializer = TypeEfficacySerializer(results, many=True, context=self.context)
-
-        for relation in serializer.data:
-            type = Type.objects.get(pk=relation['damage_type'])
-            if relation['damage_factor'] == 200:
+        for type, damage_factor in chart.damage_from(obj.pk):
+            if damage_factor == 200:
                 relations['double_damage_from'].append(
                     TypeSummarySerializer(type, context=self.context).data)
-            elif relation['damage_factor'] == 50:
+            elif damage_factor == 50:
                 relations['half_damage_from'].append(
                     TypeSummarySerializer(type, context=self.context).data)
-            elif relation['damage_factor'] == 0:
+            elif damage_factor == 0:
                 relations['no_damage_from'].append(
                     TypeSummarySerializer(type, context=self.context).data)
 
@@ -2531,44 +2615,33 @@ class PokemonDetailSerializer(serializers.ModelSerializer):
 
     def get_pokemon_moves(self, obj):
 
-        version_objects = VersionGroup.objects.all()
-        version_data = VersionGroupSummarySerializer(
-            version_objects, many=True, context=self.context).data
-        method_objects = MoveLearnMethod.objects.all()
-        method_data = MoveLearnMethodSummarySerializer(
-            method_objects, many=True, context=self.context).data
-
-        # Get moves related to this pokemon and pull out unique Move IDs.
-        # Note that it's important to order by the same column we're using to
-        # determine if the entries are unique.  Otherwise distinct() will
-        # return apparent duplicates.
+        # Fetch the whole learnset in one query. Ordering by move keeps the entries of
+        # each move together for groupby, ordering by id keeps them in load order.
+        pokemon_moves = PokemonMove.objects.filter(pokemon_id=obj).select_related(
+            'move', 'version_group', 'move_learn_method').order_by('move_id', 'id')
 
-        pokemon_moves = PokemonMove.objects.filter(pokemon_id=obj).order_by('move_id')
-        move_ids = pokemon_moves.values('move_id').distinct()
+        cache = summary_cache(self.context)
         move_list = []
 
-        for id in move_ids:
+        for _, move_entries in groupby(pokemon_moves, key=attrgetter('move_id')):
 
+            move_entries = list(move_entries)
             pokemon_move_details = OrderedDict()
-
-            # Get each Unique Move by ID
-            move_object = Move.objects.get(pk=id['move_id'])
-            move_data = MoveSummarySerializer(move_object, context=self.context).data
-            pokemon_move_details['move'] = move_data
-
-            # Get Versions and Move Methods associated with each unique move
-            pokemon_move_objects = pokemon_moves.filter(move_id=id['move_id'])
-            serializer = PokemonMoveSerializer(
-                pokemon_move_objects, many=True, context=self.context)
+            pokemon_move_details['move'] = MoveSummarySerializer(
+                move_entries[0].move, context=self.context).data
             pokemon_move_details['version_group_details'] = []
 
-            for move in serializer.data:
+            for pokemon_move in move_entries:
 
                 version_detail = OrderedDict()
 
-                version_detail['level_learned_at'] = move['level']
-                version_detail['version_group'] = version_data[move['version_group'] - 1]
-                version_detail['move_learn_method'] = method_data[move['move_learn_method'] - 1]
+                version_detail['level_learned_at'] = pokemon_move.level
+                version_detail['version_group'] = cached_summary(
+                    cache, VersionGroupSummarySerializer,
+                    pokemon_move.version_group, self.context)
+                version_detail['move_learn_method'] = cached_summary(
+                    cache, MoveLearnMethodSummarySerializer,
+                    pokemon_move.move_learn_method, self.context)
 
                 pokemon_move_details['version_group_details'].append(version_detail)
 
@@ -2705,16 +2778,6 @@ class PokemonSpeciesNameSerializer(serializers.ModelSerializer):
         fields = ('name', 'genus', 'language')
 
 
-class PokemonSpeciesEvolutionSerializer(serializers.ModelSerializer):
-    """
-    This is here purely to help build pokemon evolution chains
-    """
-
-    class Meta:
-        model = PokemonSpecies
-        fields = ('name', 'id', 'evolves_from_species', 'is_baby')
-
-
 class PokemonSpeciesDetailSerializer(serializers.ModelSerializer):
 
     names = serializers.SerializerMethodField('get_pokemon_names')
@@ -2805,16 +2868,17 @@ class PokemonSpeciesDetailSerializer(serializers.ModelSerializer):
 
     def get_pokemon_varieties(self, obj):
 
-        results = Pokemon.objects.filter(pokemon_species=obj)
+        # Only the summary and is_default of each variety are shown, so there is no
+        # need to load anything beyond those columns
+        results = Pokemon.objects.filter(pokemon_species=obj).only('id', 'name', 'is_default')
         summary_data = PokemonSummarySerializer(results, many=True, context=self.context).data
-        detail_data = PokemonDetailSerializer(results, many=True, context=self.context).data
 
         varieties = []
 
-        for index, pokemon in enumerate(detail_data):
+        for pokemon, summary in zip(results, summary_data):
             entry = OrderedDict()
-            entry['is_default'] = pokemon['is_default']
-            entry['pokemon'] = summary_data[index]
+            entry['is_default'] = pokemon.is_default
+            entry['pokemon'] = summary
             varieties.append(entry)
 
         return varieties
@@ -2883,14 +2947,7 @@ class EvolutionChainDetailSerializer(serializers.ModelSerializer):
 
     def build_chain(self, obj):
 
-        chain_id = obj.id
-
-        pokemon_objects = PokemonSpecies.objects.filter(
-            evolution_chain_id=chain_id).order_by('order')
-        summary_data = PokemonSpeciesSummarySerializer(
-            pokemon_objects, many=True, context=self.context).data
-        ref_data = PokemonSpeciesEvolutionSerializer(
-            pokemon_objects, many=True, context=self.context).data
+        graph = evolution_graph(obj.id)
 
         chain = entry = OrderedDict()
         current_evolutions = None
@@ -2898,28 +2955,26 @@ class EvolutionChainDetailSerializer(serializers.ModelSerializer):
         previous_entry = None
         previous_species = None
 
-        for index, species in enumerate(ref_data):
+        for species in graph.species:
 
             # If evolves from something
-            if species['evolves_from_species']:
+            if species.evolves_from_species_id:
 
                 # In case this pokemon is one of multiple evolutions a pokemon can make
                 if previous_species:
-                    if previous_species['id'] == species['evolves_from_species']:
+                    if previous_species.id == species.evolves_from_species_id:
                         current_evolutions = previous_entry['evolves_to']
 
                 entry = OrderedDict()
 
-                evolution_object = PokemonEvolution.objects.filter(
-                    evolved_species=species['id'])
-
                 evolution_data = PokemonEvolutionSerializer(
-                    evolution_object, many=True, context=self.context).data
+                    graph.evolutions_to(species.id), many=True, context=self.context).data
 
                 current_evolutions.append(entry)
 
-            entry['is_baby'] = species['is_baby']
-            entry['species'] = summary_data[index]
+            entry['is_baby'] = species.is_baby
+            entry['species'] = PokemonSpeciesSummarySerializer(
+                species, context=self.context).data
             entry['evolution_details'] = evolution_data or []
             entry['evolves_to'] = []
 
@@ -0,0 +1,162 @@
+import gzip
+import os
+import os.path
+import shutil
+from functools import lru_cache
+from multiprocessing import Pool
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import connections
+from django.urls import resolve
+
+from .api import NameOrIdRetrieval
+from .documents import DocumentRequest, swap_origin
+from .models import Pokemon
+
+################
+#  STATIC API  #
+################
+
+# The read-only API written out as files, so a web server can answer requests
+# without involving Django:
+#
+#     $ python manage.py export_static_api --origin https://pokeapi.co
+#
+# Every path the export covers is written as <path>/index.json together with a
+# gzipped index.json.gz for nginx's gzip_static, and detail routes that can be looked
+# up by name get a symlink from the name to the id. Requests with a query string,
+# e.g. other list pages, are left to Django.
+
+STATIC_API_DIR = 'static-api'
+API_ROOT = '/api/v2/'
+EXPORT_CHUNK_SIZE = 200
+
+
+@lru_cache(maxsize=None)
+def unthrottled(view):
+    """
+    Returns view without throttling, which would turn away an export after the
+    first few hundred paths.
+    """
+    initkwargs = dict(view.initkwargs, throttle_classes=())
+    if hasattr(view, 'actions'):
+        return view.cls.as_view(view.actions, **initkwargs)
+    return view.cls.as_view(**initkwargs)
+
+
+def render_path(path):
+    """
+    Returns the body of a GET of path as rendered for a DocumentRequest, or None when
+    there is no such resource.
+    """
+    match = resolve(path)
+    request = DocumentRequest()
+    request.method = 'GET'
+    request.path = request.path_info = path
+    request.resolver_match = match
+
+    try:
+        response = unthrottled(match.func)(request, *match.args, **match.kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+    except ObjectDoesNotExist:
+        return None
+
+    if response.status_code != 200:
+        return None
+    return response.content
+
+
+def export_routes():
+    """
+    Returns the paths to export, in chunks to hand to the workers, and the names of
+    the detail routes as (resource directory, name, id).
+    """
+    from .urls import router
+
+    chunks = [[API_ROOT]]
+    names = []
+    for prefix, viewset, _ in router.registry:
+        model = viewset.queryset.model
+        resource = API_ROOT + prefix + '/'
+        has_name = any(field.name == 'name' for field in model._meta.fields)
+
+        ids = list(model.objects.order_by('pk').values_list('pk', flat=True))
+        paths = [resource] + ['%s%s/' % (resource, pk) for pk in ids]
+        if model is Pokemon:
+            paths += ['%s%s/encounters' % (resource, pk) for pk in ids]
+        chunks += [
+            paths[start:start + EXPORT_CHUNK_SIZE]
+            for start in range(0, len(paths), EXPORT_CHUNK_SIZE)
+        ]
+
+        if has_name and issubclass(viewset, NameOrIdRetrieval):
+            names += [
+                (resource, name, pk)
+                for pk, name in model.objects.values_list('pk', 'name')
+                if name and NameOrIdRetrieval.namePattern.match(name)
+                and not NameOrIdRetrieval.idPattern.match(name)
+            ]
+
+    return chunks, names
+
+
+def write_file(path, body):
+    with open(path, 'wb') as body_file:
+        body_file.write(body)
+    # A fixed mtime keeps the archives identical between exports of the same data
+    with gzip.GzipFile(path + '.gz', 'wb', compresslevel=9, mtime=0) as archive:
+        archive.write(body)
+
+
+def export_paths(arguments):
+    """
+    Writes the given paths below directory and returns how many were written.
+    Runs in the worker processes.
+    """
+    directory, origin, paths = arguments
+
+    written = 0
+    for path in paths:
+        body = render_path(path)
+        if body is None:
+            continue
+
+        path_directory = os.path.join(directory, path.strip('/'))
+        os.makedirs(path_directory, exist_ok=True)
+        write_file(os.path.join(path_directory, 'index.json'), swap_origin(body, origin))
+        written += 1
+
+    return written
+
+
+def export_static_api(origin, output_dir=STATIC_API_DIR, workers=None):
+    """
+    Writes the API to output_dir as served from origin, e.g. https://pokeapi.co, and
+    returns how many paths were written.
+
+    The files are written to a new directory that replaces output_dir at the end, so
+    a server never sees a partial export. Until the replacement it keeps serving the
+    previous one, and during it everything briefly falls back to Django.
+    """
+    directory = output_dir.rstrip('/') + '.new'
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+
+    chunks, names = export_routes()
+
+    # Every worker has to open its own database connection
+    connections.close_all()
+    with Pool(workers) as pool:
+        written = sum(pool.imap_unordered(
+            export_paths, [(directory, origin, paths) for paths in chunks]))
+
+    for resource, name, pk in names:
+        resource_directory = os.path.join(directory, resource.strip('/'))
+        link = os.path.join(resource_directory, name)
+        if os.path.isdir(os.path.join(resource_directory, str(pk))) and not os.path.lexists(link):
+            os.symlink(str(pk), link)
+
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.rename(directory, output_dir)
+
+    return written
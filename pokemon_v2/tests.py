@@ -1,7 +1,33 @@
+import csv
+import gzip
 import json
+import os.path
+import re
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock, skipUnless
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import set_script_prefix
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.relations import HyperlinkedIdentityField
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+from data.v2.build import (DATA_LOCATION, _build_languages, build_all, built_models, plan_stages,
+                           run_stage, shadow_schema)
+from data.v2 import csv_cache
+from data.v2.csv_cache import corpus_hash, read_csv, typed_column
+from data.v2.markup import render_html, render_names, render_plain
+from data.v2.snapshot import create_snapshot, find_snapshot
+from pokemon_v2 import dataset
+from pokemon_v2.api import PokemonResource
+from pokemon_v2.documents import materialize_documents
 from pokemon_v2.models import *
+from pokemon_v2.serializers import PokemonDetailSerializer, TemplateHyperlinkedIdentityField
+from pokemon_v2.static_api import export_paths
 
 # pylint: disable=redefined-builtin
 
@@ -20,7 +46,6 @@ class APIData():
         gender = Gender.objects.create(
             name=name,
         )
-        gender.save()
 
         return gender
 
@@ -35,7 +60,6 @@ class APIData():
             official=True,
             order=1,
         )
-        language.save()
 
         return language
 
@@ -50,7 +74,6 @@ class APIData():
             local_language=local_language,
             name=name
         )
-        language_name.save()
 
         return language_name
 
@@ -61,7 +84,6 @@ class APIData():
         region = Region.objects.create(
             name=name
         )
-        region.save()
 
         return region
 
@@ -76,7 +98,6 @@ class APIData():
             language=language,
             name=name
         )
-        region_name.save()
 
         return region_name
 
@@ -91,7 +112,6 @@ class APIData():
             region=region,
             name=name
         )
-        generation.save()
 
         return generation
 
@@ -106,7 +126,6 @@ class APIData():
             language=language,
             name=name
         )
-        generation_name.save()
 
         return generation_name
 
@@ -122,7 +141,6 @@ class APIData():
             generation=generation,
             order=1
         )
-        version_group.save()
 
         return version_group
 
@@ -133,7 +151,6 @@ class APIData():
             version_group=version_group,
             region=region
         )
-        version_group_region.save()
 
         return version_group_region
 
@@ -144,7 +161,6 @@ class APIData():
             name=name,
             version_group=version_group,
         )
-        version.save()
 
         return version
 
@@ -159,7 +175,6 @@ class APIData():
             language=language,
             name=name
         )
-        version_name.save()
 
         return version_name
 
@@ -175,7 +190,6 @@ class APIData():
             generation=generation,
             is_main_series=False
         )
-        ability.save()
 
         return ability
 
@@ -190,7 +204,6 @@ class APIData():
             language=language,
             name=name
         )
-        ability_name.save()
 
         return ability_name
 
@@ -207,7 +220,6 @@ class APIData():
             short_effect=short_effect,
             effect=effect
         )
-        ability_effect_text.save()
 
         return ability_effect_text
 
@@ -221,7 +233,6 @@ class APIData():
             ability=ability,
             version_group=version_group
         )
-        ability_change.save()
 
         return ability_change
 
@@ -236,7 +247,6 @@ class APIData():
             language=language,
             effect=effect
         )
-        ability_change_effect_text.save()
 
         return ability_change_effect_text
 
@@ -255,7 +265,6 @@ class APIData():
             language=language,
             flavor_text=flavor_text
         )
-        ability_flavor_text.save()
 
         return ability_flavor_text
 
@@ -266,7 +275,6 @@ class APIData():
         item_attribute = ItemAttribute.objects.create(
             name=name,
         )
-        item_attribute.save()
 
         return item_attribute
 
@@ -281,7 +289,6 @@ class APIData():
             name=name,
             language=language
         )
-        item_attribute_name.save()
 
         return item_attribute_name
 
@@ -296,7 +303,6 @@ class APIData():
             description=description,
             language=language
         )
-        item_attribute_description.save()
 
         return item_attribute_description
 
@@ -317,7 +323,6 @@ class APIData():
         item_fling_effect = ItemFlingEffect.objects.create(
             name=name,
         )
-        item_fling_effect.save()
 
         return item_fling_effect
 
@@ -333,7 +338,6 @@ class APIData():
             effect=effect,
             language=language
         )
-        item_fling_effect_effect_text.save()
 
         return item_fling_effect_effect_text
 
@@ -343,7 +347,6 @@ class APIData():
         item_pocket = ItemPocket.objects.create(
             name=name,
         )
-        item_pocket.save()
 
         return item_pocket
 
@@ -358,7 +361,6 @@ class APIData():
             name=name,
             language=language
         )
-        item_pocket_name.save()
 
         return item_pocket_name
 
@@ -372,7 +374,6 @@ class APIData():
             name=name,
             item_pocket=item_pocket
         )
-        item_category.save()
 
         return item_category
 
@@ -387,7 +388,6 @@ class APIData():
             name=name,
             language=language
         )
-        item_category_name.save()
 
         return item_category_name
 
@@ -404,7 +404,6 @@ class APIData():
             item=item,
             sprites=json.dumps(sprites)
         )
-        item_sprites.save()
 
         return item_sprites
 
@@ -419,7 +418,6 @@ class APIData():
             fling_power=fling_power,
             item_fling_effect=item_fling_effect
         )
-        item.save()
 
         return item
 
@@ -434,7 +432,6 @@ class APIData():
             name=name,
             language=language
         )
-        item_name.save()
 
         return item_name
 
@@ -451,7 +448,6 @@ class APIData():
             short_effect=short_effect,
             effect=effect
         )
-        item_effect_text.save()
 
         return item_effect_text
 
@@ -470,7 +466,6 @@ class APIData():
             language=language,
             flavor_text=flavor_text
         )
-        item_flavor_text.save()
 
         return item_flavor_text
 
@@ -485,7 +480,6 @@ class APIData():
             game_index=game_index,
             generation=generation
         )
-        item_game_index.save()
 
         return item_game_index
 
@@ -496,7 +490,6 @@ class APIData():
         contest_type = ContestType.objects.create(
             name=name,
         )
-        contest_type.save()
 
         return contest_type
 
@@ -511,7 +504,6 @@ class APIData():
             name=name,
             contest_type=contest_type
         )
-        contest_type_name.save()
 
         return contest_type_name
 
@@ -522,7 +514,6 @@ class APIData():
             appeal=appeal,
             jam=jam
         )
-        contest_effect.save()
 
         return contest_effect
 
@@ -538,7 +529,6 @@ class APIData():
             flavor_text=flavor_text,
             contest_effect=contest_effect
         )
-        contest_effect_flavor_text.save()
 
         return contest_effect_flavor_text
 
@@ -553,7 +543,6 @@ class APIData():
             effect=effect,
             contest_effect=contest_effect
         )
-        contest_effect_effect_text.save()
 
         return contest_effect_effect_text
 
@@ -563,7 +552,6 @@ class APIData():
         super_contest_effect = SuperContestEffect.objects.create(
             appeal=appeal,
         )
-        super_contest_effect.save()
 
         return super_contest_effect
 
@@ -579,7 +567,6 @@ class APIData():
             flavor_text=flavor_text,
             super_contest_effect=super_contest_effect
         )
-        super_contest_effect_flavor_text.save()
 
         return super_contest_effect_flavor_text
 
@@ -594,7 +581,6 @@ class APIData():
             name=name,
             contest_type=contest_type
         )
-        berry_flavor.save()
 
         return berry_flavor
 
@@ -609,7 +595,6 @@ class APIData():
             name=name,
             berry_flavor=berry_flavor
         )
-        berry_flavor_name.save()
 
         return berry_flavor_name
 
@@ -619,7 +604,6 @@ class APIData():
         berry_firmness = BerryFirmness.objects.create(
             name=name,
         )
-        berry_firmness.save()
 
         return berry_firmness
 
@@ -634,7 +618,6 @@ class APIData():
             name=name,
             berry_firmness=berry_firmness
         )
-        berry_firmness_name.save()
 
         return berry_firmness_name
 
@@ -673,7 +656,6 @@ class APIData():
             soil_dryness=soil_dryness,
             smoothness=smoothness
         )
-        berry.save()
 
         return berry
 
@@ -684,7 +666,6 @@ class APIData():
         egg_group = EggGroup.objects.create(
             name=name,
         )
-        egg_group.save()
 
         return egg_group
 
@@ -699,7 +680,6 @@ class APIData():
             language=language,
             name=name
         )
-        egg_group_name.save()
 
         return egg_group_name
 
@@ -726,7 +706,6 @@ class APIData():
             description=description,
             language=language
         )
-        growth_rate_description.save()
 
         return growth_rate_description
 
@@ -756,7 +735,6 @@ class APIData():
             game_index=game_index,
             generation=generation
         )
-        location_game_index.save()
 
         return location_game_index
 
@@ -771,7 +749,6 @@ class APIData():
             name=name,
             location=location
         )
-        location_name.save()
 
         return location_name
 
@@ -801,7 +778,6 @@ class APIData():
             name=name,
             location_area=location_area
         )
-        location_area_name.save()
 
         return location_area_name
 
@@ -835,7 +811,6 @@ class APIData():
             name=name,
             type=type
         )
-        type_name.save()
 
         return type_name
 
@@ -850,7 +825,6 @@ class APIData():
             game_index=game_index,
             generation=generation
         )
-        type_game_index.save()
 
         return type_game_index
 
@@ -861,7 +835,6 @@ class APIData():
         move_ailment = MoveMetaAilment.objects.create(
             name=name
         )
-        move_ailment.save()
 
         return move_ailment
 
@@ -876,7 +849,6 @@ class APIData():
             language=language,
             name=name
         )
-        move_ailment_name.save()
 
         return move_ailment_name
 
@@ -886,7 +858,6 @@ class APIData():
         move_battle_style = MoveBattleStyle.objects.create(
             name=name
         )
-        move_battle_style.save()
 
         return move_battle_style
 
@@ -901,7 +872,6 @@ class APIData():
             language=language,
             name=name
         )
-        move_battle_style_name.save()
 
         return move_battle_style_name
 
@@ -911,7 +881,6 @@ class APIData():
         move_category = MoveMetaCategory.objects.create(
             name=name
         )
-        move_category.save()
 
         return move_category
 
@@ -926,7 +895,6 @@ class APIData():
             language=language,
             description=description
         )
-        move_category_description.save()
 
         return move_category_description
 
@@ -934,7 +902,6 @@ class APIData():
     def setup_move_effect_data(cls):
 
         move_effect = MoveEffect.objects.create()
-        move_effect.save()
 
         return move_effect
 
@@ -951,7 +918,6 @@ class APIData():
             move_effect=move_effect,
             language=language
         )
-        effect_effect_text.save()
 
         return effect_effect_text
 
@@ -961,7 +927,6 @@ class APIData():
         move_damage_class = MoveDamageClass.objects.create(
             name=name
         )
-        move_damage_class.save()
 
         return move_damage_class
 
@@ -976,7 +941,6 @@ class APIData():
             language=language,
             name=name
         )
-        move_damage_class_name.save()
 
         return move_damage_class_name
 
@@ -992,7 +956,6 @@ class APIData():
             language=language,
             description=description
         )
-        move_damage_class_description.save()
 
         return move_damage_class_description
 
@@ -1002,7 +965,6 @@ class APIData():
         move_learn_method = MoveLearnMethod.objects.create(
             name=name
         )
-        move_learn_method.save()
 
         return move_learn_method
 
@@ -1017,7 +979,6 @@ class APIData():
             language=language,
             name=name
         )
-        move_learn_method_name.save()
 
         return move_learn_method_name
 
@@ -1033,7 +994,6 @@ class APIData():
             language=language,
             description=description
         )
-        move_learn_method_description.save()
 
         return move_learn_method_description
 
@@ -1043,7 +1003,6 @@ class APIData():
         move_target = MoveTarget.objects.create(
             name=name
         )
-        move_target.save()
 
         return move_target
 
@@ -1058,7 +1017,6 @@ class APIData():
             language=language,
             name=name
         )
-        move_target_name.save()
 
         return move_target_name
 
@@ -1073,7 +1031,6 @@ class APIData():
             language=language,
             description=description
         )
-        move_target_description.save()
 
         return move_target_description
 
@@ -1084,7 +1041,6 @@ class APIData():
             first_move=first_move,
             second_move=second_move
         )
-        contest_combo.save()
 
         return contest_combo
 
@@ -1096,7 +1052,6 @@ class APIData():
             version_group=version_group,
             move_learn_method=move_learn_method
         )
-        version_group_move_learn_method.save()
 
         return version_group_move_learn_method
 
@@ -1107,7 +1062,6 @@ class APIData():
             first_move=first_move,
             second_move=second_move
         )
-        super_contest_combo.save()
 
         return super_contest_combo
 
@@ -1125,7 +1079,6 @@ class APIData():
             language=language,
             flavor_text=flavor_text
         )
-        move_flavor_text.save()
 
         return move_flavor_text
 
@@ -1170,7 +1123,6 @@ class APIData():
             contest_effect=contest_effect,
             super_contest_effect=super_contest_effect
         )
-        move.save()
 
         return move
 
@@ -1185,7 +1137,6 @@ class APIData():
             language=language,
             name=name
         )
-        move_name.save()
 
         return move_name
 
@@ -1236,7 +1187,6 @@ class APIData():
             move_effect=move_effect,
             move_effect_chance=effect_chance
         )
-        move_change.save()
 
         return move_change
 
@@ -1250,7 +1200,6 @@ class APIData():
             move_effect=move_effect,
             version_group=version_group
         )
-        move_effect_change.save()
 
         return move_effect_change
 
@@ -1266,7 +1215,6 @@ class APIData():
             language=language,
             effect=effect
         )
-        move_effect_change_effect_text.save()
 
         return move_effect_change_effect_text
 
@@ -1283,7 +1231,6 @@ class APIData():
             move_damage_class=move_damage_class,
             game_index=game_index
         )
-        stat.save()
 
         return stat
 
@@ -1298,7 +1245,6 @@ class APIData():
             language=language,
             name=name
         )
-        stat_name.save()
 
         return stat_name
 
@@ -1313,7 +1259,6 @@ class APIData():
             stat=stat,
             change=change
         )
-        move_stat_change.save()
 
         return move_stat_change
 
@@ -1323,7 +1268,6 @@ class APIData():
         pokeathlon_stat = PokeathlonStat.objects.create(
             name=name
         )
-        pokeathlon_stat.save()
 
         return pokeathlon_stat
 
@@ -1338,7 +1282,6 @@ class APIData():
             language=language,
             name=name
         )
-        pokeathlon_stat_name.save()
 
         return pokeathlon_stat_name
 
@@ -1353,7 +1296,6 @@ class APIData():
             stat=stat,
             gene_mod_5=gene_mod_5
         )
-        characteristic.save()
 
         return characteristic
 
@@ -1368,7 +1310,6 @@ class APIData():
             language=language,
             description=description
         )
-        characteristic_description.save()
 
         return characteristic_description
 
@@ -1385,7 +1326,6 @@ class APIData():
             likes_flavor=likes_flavor,
             game_index=game_index
         )
-        nature.save()
 
         return nature
 
@@ -1400,7 +1340,6 @@ class APIData():
             language=language,
             name=name
         )
-        nature_name.save()
 
         return nature_name
 
@@ -1412,7 +1351,6 @@ class APIData():
             pokeathlon_stat=pokeathlon_stat,
             max_change=max_change,
         )
-        nature_pokeathlon_stat.save()
 
         return nature_pokeathlon_stat
 
@@ -1426,7 +1364,6 @@ class APIData():
             low_hp_preference=low_hp_preference,
             high_hp_preference=high_hp_preference
         )
-        nature_battle_style_preference.save()
 
         return nature_battle_style_preference
 
@@ -1441,7 +1378,6 @@ class APIData():
             name=name,
             region=region,
         )
-        pokedex.save()
 
         return pokedex
 
@@ -1456,7 +1392,6 @@ class APIData():
             language=language,
             name=name
         )
-        pokedex_name.save()
 
         return pokedex_name
 
@@ -1471,7 +1406,6 @@ class APIData():
             language=language,
             description=description
         )
-        pokedex_description.save()
 
         return pokedex_description
 
@@ -1485,7 +1419,6 @@ class APIData():
             pokedex=pokedex,
             version_group=version_group
         )
-        pokedex_version_group.save()
 
         return pokedex_version_group
 
@@ -1496,7 +1429,6 @@ class APIData():
         pokemon_habitat = PokemonHabitat.objects.create(
             name=name,
         )
-        pokemon_habitat.save()
 
         return pokemon_habitat
 
@@ -1511,7 +1443,6 @@ class APIData():
             language=language,
             name=name
         )
-        pokemon_habitat_name.save()
 
         return pokemon_habitat_name
 
@@ -1521,7 +1452,6 @@ class APIData():
         pokemon_color = PokemonColor.objects.create(
             name=name,
         )
-        pokemon_color.save()
 
         return pokemon_color
 
@@ -1536,7 +1466,6 @@ class APIData():
             language=language,
             name=name
         )
-        pokemon_color_name.save()
 
         return pokemon_color_name
 
@@ -1546,7 +1475,6 @@ class APIData():
         pokemon_shape = PokemonShape.objects.create(
             name=name,
         )
-        pokemon_shape.save()
 
         return pokemon_shape
 
@@ -1563,7 +1491,6 @@ class APIData():
             name=name,
             awesome_name=awesome_name
         )
-        pokemon_shape_name.save()
 
         return pokemon_shape_name
 
@@ -1579,7 +1506,6 @@ class APIData():
             language=language,
             description=description
         )
-        pokemon_species_form_description.save()
 
         return pokemon_species_form_description
 
@@ -1599,7 +1525,6 @@ class APIData():
             language=language,
             flavor_text=flavor_text
         )
-        pokemon_species_flavor_text.save()
 
         return pokemon_species_flavor_text
 
@@ -1644,7 +1569,6 @@ class APIData():
             forms_switchable=forms_switchable,
             order=order
         )
-        pokemon_species.save()
 
         return pokemon_species
 
@@ -1661,7 +1585,6 @@ class APIData():
             name=name,
             genus=genus
         )
-        pokemon_species_name.save()
 
         return pokemon_species_name
 
@@ -1704,7 +1627,6 @@ class APIData():
             order=order,
             is_default=is_default
         )
-        pokemon.save()
 
         return pokemon
 
@@ -1719,7 +1641,6 @@ class APIData():
             game_index=game_index,
             version=version
         )
-        pokemon_game_index.save()
 
         return pokemon_game_index
 
@@ -1742,7 +1663,6 @@ class APIData():
             pokemon_form=pokemon_form,
             sprites=json.dumps(sprites)
         )
-        pokemon_form_sprites.save()
 
         return pokemon_form_sprites
 
@@ -1851,7 +1771,6 @@ class APIData():
             level=level,
             order=order
         )
-        pokemon_move.save()
 
         return pokemon_move
 
@@ -1880,7 +1799,6 @@ class APIData():
             pokemon=pokemon,
             sprites=json.dumps(sprites)
         )
-        pokemon_sprites.save()
 
         return pokemon_sprites
 
@@ -1891,7 +1809,6 @@ class APIData():
         evolution_trigger = EvolutionTrigger.objects.create(
             name=name,
         )
-        evolution_trigger.save()
 
         return evolution_trigger
 
@@ -1906,7 +1823,6 @@ class APIData():
             language=language,
             name=name
         )
-        evolution_trigger_name.save()
 
         return evolution_trigger_name
 
@@ -1916,7 +1832,6 @@ class APIData():
         evolution_chain = EvolutionChain.objects.create(
             baby_trigger_item=baby_trigger_item,
         )
-        evolution_chain.save()
 
         return evolution_chain
 
@@ -1956,7 +1871,6 @@ class APIData():
             needs_overworld_rain=needs_overworld_rain,
             turn_upside_down=turn_upside_down
         )
-        pokemon_evolution.save()
 
         return pokemon_evolution
 
@@ -1968,7 +1882,6 @@ class APIData():
             name=name,
             order=order
         )
-        encounter_method.save()
 
         return encounter_method
 
@@ -1983,7 +1896,6 @@ class APIData():
             language=language,
             name=name
         )
-        encounter_method_name.save()
 
         return encounter_method_name
 
@@ -1993,7 +1905,6 @@ class APIData():
         encounter_condition = EncounterCondition.objects.create(
             name=name
         )
-        encounter_condition.save()
 
         return encounter_condition
 
@@ -2008,7 +1919,6 @@ class APIData():
             language=language,
             name=name
         )
-        encounter_condition_name.save()
 
         return encounter_condition_name
 
@@ -2021,7 +1931,6 @@ class APIData():
             name=name,
             is_default=is_default
         )
-        encounter_condition_value.save()
 
         return encounter_condition_value
 
@@ -2037,7 +1946,6 @@ class APIData():
             language=language,
             name=name
         )
-        encounter_condition_value_name.save()
 
         return encounter_condition_value_name
 
@@ -2048,7 +1956,6 @@ class APIData():
             encounter=encounter,
             encounter_condition_value=encounter_condition_value
         )
-        encounter_condition_value_map.save()
 
         return encounter_condition_value_map
 
@@ -2067,7 +1974,6 @@ class APIData():
             slot=slot,
             rarity=rarity
         )
-        encounter_slot.save()
 
         return encounter_slot
 
@@ -2083,7 +1989,6 @@ class APIData():
             location_area=location_area,
             rate=rate
         )
-        location_area_encounter_rate.save()
 
         return location_area_encounter_rate
 
@@ -2110,7 +2015,6 @@ class APIData():
             min_level=min_level,
             max_level=max_level
         )
-        encounter.save()
 
         return encounter
 
@@ -2121,7 +2025,6 @@ class APIData():
         pal_park_area = PalParkArea.objects.create(
             name=name
         )
-        pal_park_area.save()
 
         return pal_park_area
 
@@ -2136,7 +2039,6 @@ class APIData():
             language=language,
             name=name
         )
-        pal_park_area_name.save()
 
         return pal_park_area_name
 
@@ -2152,10 +2054,48 @@ class APIData():
             pal_park_area=pal_park_area,
             rate=rate
         )
-        pal_park.save()
 
         return pal_park
 
+    # Bulk Data
+    @classmethod
+    def setup_bulk_copies(cls, instance, names):
+        """
+        Creates a copy of instance for each of names with a single insert and returns
+        the copies. They share every foreign key with instance, so a large dataset costs
+        one setup_*_data call per model instead of one per row.
+        """
+        model = instance.__class__
+        values = {
+            field.attname: getattr(instance, field.attname)
+            for field in model._meta.concrete_fields if not field.primary_key
+        }
+
+        model.objects.bulk_create([model(**dict(values, name=name)) for name in names])
+
+        return list(model.objects.filter(name__in=names).order_by('pk'))
+
+    @classmethod
+    def setup_learnset_data(cls, pokemon, moves, version_groups):
+
+        move_learn_method = cls.setup_move_learn_method_data(
+            name='mv lrn mthd for lrnst')
+
+        PokemonMove.objects.bulk_create([
+            PokemonMove(
+                pokemon=pokemon,
+                version_group=version_group,
+                move=move,
+                move_learn_method=move_learn_method,
+                level=level,
+                order=1
+            )
+            for level, move in enumerate(moves)
+            for version_group in version_groups
+        ])
+
+        return move_learn_method
+
 
 # Tests
 class APITests(APIData, APITestCase):
@@ -3120,47 +3060,14 @@ class APITests(APIData, APITestCase):
         double_damage_from = self.setup_type_data(name='double damage from tp')
 
         # type relations
-        no_damage_to_relation = TypeEfficacy(
-            damage_type=type,
-            target_type=no_damage_to,
-            damage_factor=0
-        )
-        no_damage_to_relation.save()
-
-        half_damage_to_type_relation = TypeEfficacy(
-            damage_type=type,
-            target_type=half_damage_to,
-            damage_factor=50
-        )
-        half_damage_to_type_relation.save()
-
-        double_damage_to_type_relation = TypeEfficacy(
-            damage_type=type,
-            target_type=double_damage_to,
-            damage_factor=200
-        )
-        double_damage_to_type_relation.save()
-
-        no_damage_from_relation = TypeEfficacy(
-            damage_type=no_damage_from,
-            target_type=type,
-            damage_factor=0
-        )
-        no_damage_from_relation.save()
-
-        half_damage_from_type_relation = TypeEfficacy(
-            damage_type=half_damage_from,
-            target_type=type,
-            damage_factor=50
-        )
-        half_damage_from_type_relation.save()
-
-        double_damage_from_type_relation = TypeEfficacy(
-            damage_type=double_damage_from,
-            target_type=type,
-            damage_factor=200
-        )
-        double_damage_from_type_relation.save()
+        TypeEfficacy.objects.bulk_create([
+            TypeEfficacy(damage_type=type, target_type=no_damage_to, damage_factor=0),
+            TypeEfficacy(damage_type=type, target_type=half_damage_to, damage_factor=50),
+            TypeEfficacy(damage_type=type, target_type=double_damage_to, damage_factor=200),
+            TypeEfficacy(damage_type=no_damage_from, target_type=type, damage_factor=0),
+            TypeEfficacy(damage_type=half_damage_from, target_type=type, damage_factor=50),
+            TypeEfficacy(damage_type=double_damage_from, target_type=type, damage_factor=200),
+        ])
 
         response = self.client.get('{}/type/{}/'.format(API_V2, type.pk))
 
@@ -3236,6 +3143,46 @@ class APITests(APIData, APITestCase):
             response.data['game_indices'][0]['generation']['url'],
             '{}{}/generation/{}/'.format(TEST_HOST, API_V2, type_game_index.generation.pk))
 
+    def test_type_matchup_api(self):
+
+        fire = self.setup_type_data(name='fire-tp-for-mtchp')
+        flying = self.setup_type_data(name='flying-tp-for-mtchp')
+        rock = self.setup_type_data(name='rock-tp-for-mtchp')
+        ground = self.setup_type_data(name='ground-tp-for-mtchp')
+        water = self.setup_type_data(name='water-tp-for-mtchp')
+
+        TypeEfficacy.objects.bulk_create([
+            TypeEfficacy(damage_type=rock, target_type=fire, damage_factor=200),
+            TypeEfficacy(damage_type=rock, target_type=flying, damage_factor=200),
+            TypeEfficacy(damage_type=ground, target_type=fire, damage_factor=200),
+            TypeEfficacy(damage_type=ground, target_type=flying, damage_factor=0),
+            TypeEfficacy(damage_type=water, target_type=fire, damage_factor=200),
+            TypeEfficacy(damage_type=fire, target_type=fire, damage_factor=50),
+        ])
+
+        response = self.client.get(
+            '{}/type-matchup/?types={},{}'.format(API_V2, fire.name, flying.pk))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [type['name'] for type in response.data['types']], [fire.name, flying.name])
+        self.assertEqual(
+            response.data['types'][0]['url'],
+            '{}{}/type/{}/'.format(TEST_HOST, API_V2, fire.pk))
+
+        multipliers = {
+            multiplier['type']['name']: multiplier['multiplier']
+            for multiplier in response.data['damage_multipliers']
+        }
+        self.assertEqual(multipliers, {
+            fire.name: 0.5, flying.name: 1, rock.name: 4, ground.name: 0, water.name: 2})
+
+        response = self.client.get('{}/type-matchup/'.format(API_V2))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get('{}/type-matchup/?types=unknown-tp'.format(API_V2))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     # Pokedex Tests
     def test_pokedex_api(self):
 
@@ -4551,3 +4498,795 @@ class APITests(APIData, APITestCase):
         self.assertEqual(
             response.data['pokemon_encounters'][0]['pokemon_species']['url'],
             '{}{}/pokemon-species/{}/'.format(TEST_HOST, API_V2, pokemon_species.pk))
+
+
+class APIBulkTests(APIData, APITestCase):
+    """ Tests against a larger dataset, built once for the whole class """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.pokemon = cls.setup_bulk_copies(
+            cls.setup_pokemon_data(name='pkmn for bulk'),
+            ['pkmn {} for bulk'.format(i) for i in range(30)])
+        cls.moves = cls.setup_bulk_copies(
+            cls.setup_move_data(name='mv for bulk'),
+            ['mv {} for bulk'.format(i) for i in range(40)])
+        cls.version_groups = cls.setup_bulk_copies(
+            cls.setup_version_group_data(name='ver grp for bulk'),
+            ['ver grp {} for bulk'.format(i) for i in range(4)])
+        cls.move_learn_method = cls.setup_learnset_data(
+            cls.pokemon[0], cls.moves, cls.version_groups)
+        cls.setup_pokemon_sprites_data(cls.pokemon[0])
+
+    def test_pokemon_list_api(self):
+
+        response = self.client.get('{}/pokemon/?limit=10'.format(API_V2))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # the copies plus the pokemon they were copied from
+        self.assertEqual(response.data['count'], len(self.pokemon) + 1)
+        self.assertEqual(len(response.data['results']), 10)
+
+    def test_pokemon_learnset_api(self):
+
+        response = self.client.get('{}/pokemon/{}/'.format(API_V2, self.pokemon[0].pk))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['moves']), len(self.moves))
+
+        for move_data, move in zip(response.data['moves'], self.moves):
+            self.assertEqual(move_data['move']['name'], move.name)
+            self.assertEqual(
+                [detail['version_group']['name']
+                 for detail in move_data['version_group_details']],
+                [version_group.name for version_group in self.version_groups])
+            self.assertEqual(
+                move_data['version_group_details'][0]['move_learn_method']['name'],
+                self.move_learn_method.name)
+
+    def test_pokemon_learnset_queries(self):
+
+        request = APIRequestFactory().get('{}/pokemon/{}/'.format(API_V2, self.pokemon[0].pk))
+        serializer = PokemonDetailSerializer(self.pokemon[0], context={'request': request})
+
+        with self.assertNumQueries(1):
+            moves = serializer.get_pokemon_moves(self.pokemon[0])
+
+        self.assertEqual(len(moves), len(self.moves))
+
+    def test_summary_url_template(self):
+
+        move = self.moves[0]
+        self.addCleanup(set_script_prefix, '/')
+
+        for script_name in ('', '/mounted'):
+            request = Request(APIRequestFactory().get(
+                '{}/move/'.format(API_V2), SCRIPT_NAME=script_name))
+            set_script_prefix(script_name + '/')
+
+            url = TemplateHyperlinkedIdentityField(view_name='move-detail').get_url(
+                move, 'move-detail', request, None)
+
+            self.assertEqual(url, HyperlinkedIdentityField(view_name='move-detail').get_url(
+                move, 'move-detail', request, None))
+            self.assertEqual(url, '{}{}{}/move/{}/'.format(
+                TEST_HOST, script_name, API_V2, move.pk))
+
+    def test_pokemon_learnset_sparse_ids_api(self):
+
+        # leave a gap in the version group ids
+        self.version_groups[0].delete()
+
+        response = self.client.get('{}/pokemon/{}/'.format(API_V2, self.pokemon[0].pk))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [detail['version_group']['name']
+             for detail in response.data['moves'][0]['version_group_details']],
+            [version_group.name for version_group in self.version_groups[1:]])
+
+    def test_pokemon_species_varieties_queries(self):
+
+        pokemon_species = self.pokemon[0].pokemon_species
+
+        # the varieties cost the same few queries however many there are
+        with self.assertNumQueries(14):
+            response = self.client.get(
+                '{}/pokemon-species/{}/'.format(API_V2, pokemon_species.pk))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['varieties']), len(self.pokemon) + 1)
+        self.assertEqual(
+            response.data['varieties'][1]['pokemon']['url'],
+            '{}{}/pokemon/{}/'.format(TEST_HOST, API_V2, self.pokemon[0].pk))
+
+    def test_pokemon_encounters_queries(self):
+
+        pokemon = self.pokemon[1]
+        encounter_slot = self.setup_encounter_slot_data(rarity=10)
+        encounter = self.setup_encounter_data(pokemon=pokemon, encounter_slot=encounter_slot)
+        condition_value = self.setup_encounter_condition_value_data(
+            self.setup_encounter_condition_data(name='encntr cndtn for bulk'))
+        location_areas = self.setup_bulk_copies(
+            encounter.location_area, ['lctn area {} for bulk'.format(i) for i in range(10)])
+        versions = self.setup_bulk_copies(
+            encounter.version, ['ver {} for bulk'.format(i) for i in range(3)])
+
+        Encounter.objects.bulk_create([
+            Encounter(
+                pokemon=pokemon,
+                location_area=location_area,
+                version=version,
+                encounter_slot=encounter_slot,
+                min_level=level,
+                max_level=level + 5
+            )
+            for location_area in location_areas
+            for version in versions
+            for level in range(10)
+        ])
+        EncounterConditionValueMap.objects.bulk_create([
+            EncounterConditionValueMap(
+                encounter=encounter, encounter_condition_value=condition_value)
+            for encounter in Encounter.objects.filter(pokemon=pokemon)
+        ])
+
+        # the hundreds of encounters are grouped in memory
+        with self.assertNumQueries(4):
+            response = self.client.get('{}/pokemon/{}/encounters'.format(API_V2, pokemon.pk))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), len(location_areas) + 1)
+        self.assertEqual(response.data[1]['location_area']['name'], location_areas[0].name)
+
+        version_details = response.data[1]['version_details']
+        self.assertEqual(
+            [version_detail['version']['name'] for version_detail in version_details],
+            [version.name for version in versions])
+        self.assertEqual(version_details[0]['max_chance'], 100)
+        self.assertEqual(len(version_details[0]['encounter_details']), 10)
+
+        encounter_detail = version_details[0]['encounter_details'][3]
+        self.assertEqual(encounter_detail['min_level'], 3)
+        self.assertEqual(encounter_detail['max_level'], 8)
+        self.assertEqual(encounter_detail['chance'], 10)
+        self.assertEqual(
+            encounter_detail['method']['name'], encounter_slot.encounter_method.name)
+        self.assertEqual(encounter_detail['condition_values'][0]['name'], condition_value.name)
+
+    def test_location_area_encounters_queries(self):
+
+        location_area = self.setup_location_area_data(name='lctn area for bulk')
+        encounter_method = self.setup_encounter_method_data(name='encntr mthd for bulk')
+        encounter_slot = self.setup_encounter_slot_data(encounter_method, rarity=10)
+        rate = self.setup_location_area_encounter_rate_data(location_area, encounter_method)
+        versions = self.setup_bulk_copies(
+            rate.version, ['ver {} for bulk'.format(i) for i in range(3)])
+
+        LocationAreaEncounterRate.objects.bulk_create([
+            LocationAreaEncounterRate(
+                location_area=location_area,
+                encounter_method=encounter_method,
+                version=version,
+                rate=5
+            )
+            for version in versions
+        ])
+        Encounter.objects.bulk_create([
+            Encounter(
+                pokemon=pokemon,
+                location_area=location_area,
+                version=version,
+                encounter_slot=encounter_slot,
+                min_level=level,
+                max_level=level + 5
+            )
+            for pokemon in self.pokemon
+            for version in versions
+            for level in range(4)
+        ])
+
+        # data version, document, names, location, rates, encounters and their condition values
+        with self.assertNumQueries(8):
+            response = self.client.get(
+                '{}/location-area/{}/'.format(API_V2, location_area.pk))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            len(response.data['encounter_method_rates'][0]['version_details']),
+            len(versions) + 1)
+        self.assertEqual(len(response.data['pokemon_encounters']), len(self.pokemon))
+
+        pokemon_encounter = response.data['pokemon_encounters'][0]
+        self.assertEqual(pokemon_encounter['pokemon']['name'], self.pokemon[0].name)
+        self.assertEqual(len(pokemon_encounter['version_details']), len(versions))
+        self.assertEqual(pokemon_encounter['version_details'][0]['max_chance'], 40)
+        self.assertEqual(
+            pokemon_encounter['version_details'][0]['encounter_details'][1]['min_level'], 1)
+
+    def test_evolution_chain_queries(self):
+
+        evolution_chain = self.setup_evolution_chain_data()
+        basic = self.setup_pokemon_species_data(
+            name='bsc for bulk evo chn', evolution_chain=evolution_chain)
+        evolved = self.setup_pokemon_species_data(
+            name='evlvd for bulk evo chn', evolves_from_species=basic,
+            evolution_chain=evolution_chain)
+        evolution = self.setup_pokemon_evolution_data(
+            evolved_species=evolved, evolution_item=self.setup_item_data(name='itm for bulk'))
+        branches = self.setup_bulk_copies(
+            evolved, ['evlvd {} for bulk evo chn'.format(i) for i in range(8)])
+
+        PokemonEvolution.objects.bulk_create([
+            PokemonEvolution(
+                evolved_species=species,
+                evolution_trigger=evolution.evolution_trigger,
+                evolution_item=evolution.evolution_item,
+                min_level=level
+            )
+            for species in branches
+            for level in (10, 20)
+        ])
+
+        # data version, document, the chain, its species and their evolutions
+        with self.assertNumQueries(5):
+            response = self.client.get(
+                '{}/evolution-chain/{}/'.format(API_V2, evolution_chain.pk))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        evolves_to = response.data['chain']['evolves_to']
+        self.assertEqual(response.data['chain']['species']['name'], basic.name)
+        self.assertEqual(
+            [entry['species']['name'] for entry in evolves_to],
+            [evolved.name] + [species.name for species in branches])
+        self.assertEqual(
+            evolves_to[0]['evolution_details'][0]['item']['name'], evolution.evolution_item.name)
+        self.assertEqual(
+            [detail['min_level'] for detail in evolves_to[1]['evolution_details']], [10, 20])
+
+    def test_pokemon_document_api(self):
+
+        url = '{}/pokemon/{}/'.format(API_V2, self.pokemon[0].pk)
+        rendered = self.client.get(url)
+
+        materialize_documents()
+
+        # the stored document is the only query
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, rendered.content)
+        self.assertEqual(response['Content-Type'], rendered['Content-Type'])
+
+        # query parameters are left to the serializers
+        response = self.client.get(url + '?limit=1')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, rendered.content)
+
+    def test_pokemon_preloaded_dataset_api(self):
+
+        Pokemon.objects.filter(pk=self.pokemon[0].pk).update(name='pkmn-for-preload')
+        url = '{}/pokemon/{}/'.format(API_V2, self.pokemon[0].pk)
+        rendered = self.client.get(url)
+
+        materialize_documents()
+        data_version = DataVersion.objects.create(version='data version for preload')
+        dataset.PRELOADED['dataset'] = dataset.load_dataset()
+        self.addCleanup(dataset.PRELOADED.clear)
+
+        # only the data version is looked up, which cachalot already holds
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, rendered.content)
+
+        response = self.client.get('{}/pokemon/pkmn-for-preload/'.format(API_V2))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, rendered.content)
+
+        # after a new build the version and the document are looked up again
+        data_version.version = 'new data version for preload'
+        data_version.save()
+
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+
+        self.assertEqual(response.content, rendered.content)
+
+    def test_static_api_export(self):
+
+        paths = [
+            '{}/pokemon/'.format(API_V2),
+            '{}/pokemon/{}/'.format(API_V2, self.pokemon[0].pk),
+            '{}/pokemon/{}/encounters'.format(API_V2, self.pokemon[0].pk),
+            '{}/pokemon/0/'.format(API_V2),
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            # the missing pokemon is left out
+            self.assertEqual(export_paths((directory, TEST_HOST, paths)), 3)
+
+            for path in paths[:3]:
+                file_name = os.path.join(directory, path.strip('/'), 'index.json')
+                with open(file_name, 'rb') as body_file:
+                    body = body_file.read()
+                with gzip.open(file_name + '.gz') as archive:
+                    self.assertEqual(archive.read(), body)
+
+                self.assertEqual(body, self.client.get(path).content)
+
+    def test_data_version_etag_api(self):
+
+        url = '{}/pokemon/{}/'.format(API_V2, self.pokemon[0].pk)
+
+        # untagged until a build records the data version
+        self.assertFalse(self.client.get(url).has_header('ETag'))
+
+        data_version = DataVersion.objects.create(version='data version for etag')
+        response = self.client.get(url)
+        etag = response['ETag']
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('max-age', response['Cache-Control'])
+        self.assertNotEqual(
+            self.client.get('{}/pokemon/'.format(API_V2))['ETag'], etag)
+
+        # answered from the data version, which cachalot already holds
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+        # weak, so still matching once nginx gzipped the response
+        self.assertTrue(etag.startswith('W/"'))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag[2:])
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # a release that changes the code changes the tags too
+        with mock.patch('pokemon_v2.middleware.code_version', return_value='next release'):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+        data_version.version = 'new data version for etag'
+        data_version.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_pokemon_sparse_fields_api(self):
+
+        url = '{}/pokemon/{}/'.format(API_V2, self.pokemon[0].pk)
+
+        # the fields left out are never computed
+        with self.assertNumQueries(2):
+            response = self.client.get(url + '?fields=name')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'name': self.pokemon[0].name})
+
+        response = self.client.get(url + '?fields=name,moves.move')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data), ['name', 'moves'])
+        self.assertEqual(len(response.data['moves']), len(self.moves))
+        self.assertEqual(list(response.data['moves'][0]), ['move'])
+        self.assertEqual(response.data['moves'][0]['move']['name'], self.moves[0].name)
+
+        response = self.client.get(url + '?exclude=moves,sprites,species.url')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('moves', response.data)
+        self.assertNotIn('sprites', response.data)
+        self.assertIn('abilities', response.data)
+        self.assertEqual(list(response.data['species']), ['name'])
+
+        response = self.client.get('{}/pokemon/?limit=2&fields=name'.format(API_V2))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data['results'][0]), ['name'])
+
+        response = self.client.get(url + '?fields=name,nickname')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_move_batch_api(self):
+
+        moves = self.moves[:3]
+        details = [
+            self.client.get('{}/move/{}/'.format(API_V2, move.pk)).data for move in moves]
+
+        response = self.client.get('{}/move/?ids={}'.format(
+            API_V2, ','.join(str(move.pk) for move in reversed(moves))))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, list(reversed(details)))
+
+        materialize_documents()
+
+        # joined from the stored documents, fetched in one query
+        with self.assertNumQueries(1):
+            response = self.client.get('{}/move/?ids={}'.format(
+                API_V2, ','.join(str(move.pk) for move in moves)))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content.decode('utf-8')), details)
+
+        response = self.client.get('{}/move/?ids={}&names={}'.format(
+            API_V2, moves[0].pk, 'mv-for-bulk'))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.get('{}/move/?ids={}'.format(
+            API_V2, ','.join([str(moves[0].pk)] * 51)))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_pokemon_keyset_pagination_api(self):
+
+        names = [pokemon['name'] for pokemon in self.client.get(
+            '{}/pokemon/?limit=100'.format(API_V2)).data['results']]
+
+        keyset_names = []
+        url = '{}/pokemon/?cursor=&limit=7'.format(API_V2)
+        while url:
+            response = self.client.get(url)
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data['count'], len(self.pokemon) + 1)
+            keyset_names += [pokemon['name'] for pokemon in response.data['results']]
+            url = response.data['next']
+
+        self.assertEqual(keyset_names, names)
+
+        response = self.client.get('{}/pokemon/?cursor=bm9wZQ'.format(API_V2))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_pokemon_streaming_list_api(self):
+
+        page = self.client.get('{}/pokemon/?limit=100&fields=name'.format(API_V2))
+
+        # pages longer than the streaming limit come out one pokemon at a time
+        response = self.client.get('{}/pokemon/?limit=1000&fields=name'.format(API_V2))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(b''.join(response.streaming_content), page.content)
+
+        # and so do keyset pages, whichever cursor they start from
+        second_page = self.client.get('{}/pokemon/?cursor=&limit=2'.format(API_V2)).data['next']
+        for url in ['{}/pokemon/?cursor=&limit=1000&fields=name'.format(API_V2),
+                    second_page.replace('limit=2', 'limit=1000&fields=name')]:
+            with mock.patch.object(PokemonResource, 'streaming_limit', 1000):
+                page = self.client.get(url)
+            response = self.client.get(url)
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(response.streaming)
+            self.assertEqual(b''.join(response.streaming_content), page.content)
+
+    def test_move_export_api(self):
+
+        moves = Move.objects.order_by('pk')
+        details = [
+            self.client.get('{}/move/{}/'.format(API_V2, move.pk)).content for move in moves]
+
+        response = self.client.get('{}/move/export.ndjson'.format(API_V2))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertTrue(response.streaming)
+        self.assertEqual(b''.join(response.streaming_content), b''.join(
+            detail + b'\n' for detail in details))
+
+        materialize_documents()
+
+        # streamed from the stored documents
+        response = self.client.get('{}/move/export.ndjson'.format(API_V2))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b''.join(response.streaming_content), b''.join(
+            detail + b'\n' for detail in details))
+
+        response = self.client.get('{}/move/export.ndjson?fields=name'.format(API_V2))
+
+        self.assertEqual(
+            [json.loads(line.decode('utf-8')) for line in b''.join(
+                response.streaming_content).splitlines()],
+            [{'name': move.name} for move in moves])
+
+
+class BuildTests(TestCase):
+    """ The build script, reading CSV files of its own """
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        patcher = mock.patch('data.v2.build.DATA_LOCATION', directory + '/')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.directory = directory
+
+    def write_csv(self, file_name, rows):
+        with open(os.path.join(self.directory, file_name), 'w', encoding='utf8') as csv_file:
+            csv.writer(csv_file).writerows(rows)
+
+    def test_incremental_stage(self):
+
+        for language_id, name in [(1, 'en'), (2, 'de'), (3, 'fr')]:
+            Language.objects.create(
+                id=language_id, iso639=name, iso3166='', name=name, official=True,
+                order=language_id)
+        for language_id, local_language_id, name in [
+                (1, 1, 'English'), (2, 1, 'German'), (2, 2, 'Deutsch')]:
+            LanguageName.objects.create(
+                language_id=language_id, local_language_id=local_language_id, name=name)
+
+        # language 2 changes, 3 is removed and 4 added, and one name changes
+        self.write_csv('languages.csv', [
+            ['id', 'iso639', 'iso3166', 'identifier', 'official', 'order'],
+            [1, 'en', '', 'en', 1, 1],
+            [2, 'de', '', 'de', 0, 2],
+            [4, 'ja', '', 'ja', 1, 4],
+        ])
+        self.write_csv('language_names.csv', [
+            ['language_id', 'local_language_id', 'name'],
+            [1, 1, 'English'],
+            [2, 1, 'German language'],
+            [2, 2, 'Deutsch'],
+        ])
+
+        report = run_stage('languages', _build_languages, True)
+
+        # an insert, an update and a delete of languages, a name deleted and inserted
+        self.assertEqual(report['rows'], 6)
+        self.assertEqual(report['written'], 5)
+        self.assertEqual(
+            list(Language.objects.order_by('id').values_list('id', 'name', 'official')),
+            [(1, 'en', True), (2, 'de', False), (4, 'ja', True)])
+        self.assertEqual(
+            sorted(LanguageName.objects.values_list(
+                'language_id', 'local_language_id', 'name')),
+            [(1, 1, 'English'), (2, 1, 'German language'), (2, 2, 'Deutsch')])
+
+        # once in line with the CSV files, the tables are only read
+        with CaptureQueriesContext(connection) as queries:
+            report = run_stage('languages', _build_languages, True)
+
+        self.assertEqual(report['written'], 0)
+        self.assertEqual(
+            [query['sql'] for query in queries.captured_queries
+             if not query['sql'].startswith(('SELECT', 'SAVEPOINT', 'RELEASE SAVEPOINT'))],
+            [])
+
+
+    def test_plan_stages(self):
+
+        # upstream stages are synced, the stages emptied along with moves are rebuilt
+        self.assertEqual(
+            [(name, incremental) for name, _, incremental in plan_stages(['moves'])],
+            [('languages', True), ('regions', True), ('generations', True),
+             ('versions', True), ('damage_classes', True), ('stats', True),
+             ('abilities', True), ('egg_groups', True), ('growth_rates', True),
+             ('items', True), ('types', True), ('contests', True), ('moves', False),
+             ('berries', True), ('natures', False), ('genders', True), ('machines', False),
+             ('evolutions', True), ('pokedexes', True), ('locations', True),
+             ('pokemon', False), ('encounters', False), ('pal_parks', False)])
+
+        # nothing is emptied when moves are synced as well
+        self.assertEqual(
+            [(name, incremental) for name, _, incremental in plan_stages(['moves'], True)],
+            [('languages', True), ('regions', True), ('generations', True),
+             ('versions', True), ('damage_classes', True), ('stats', True),
+             ('types', True), ('contests', True), ('moves', True)])
+
+        with self.assertRaisesMessage(ValueError, 'Unknown build stages: move, nope'):
+            plan_stages(['moves', 'move', 'nope'])
+
+class CSVCacheTests(SimpleTestCase):
+    """ The parse-once cache of the CSV files """
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'things.csv')
+
+    def write_csv(self, text, mtime_ns=None):
+        with open(self.path, 'w', encoding='utf8') as csv_file:
+            csv_file.write(text)
+        if mtime_ns is not None:
+            os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def test_typed_column(self):
+
+        self.assertEqual(typed_column(['1', '-20', '0', '']), (1, -20, 0, ''))
+        self.assertEqual(typed_column(['', '']), ('', ''))
+
+        # leading zeros, signs and other values keep the whole column text
+        self.assertEqual(typed_column(['1', '007']), ('1', '007'))
+        self.assertEqual(typed_column(['1', '-0']), ('1', '-0'))
+        self.assertEqual(typed_column(['1', '+2']), ('1', '+2'))
+        self.assertEqual(typed_column(['1', '2.5', 'x']), ('1', '2.5', 'x'))
+
+    def test_read_csv(self):
+
+        self.write_csv('id,name\n1,one\n2,two\n', mtime_ns=10 ** 18)
+
+        self.assertEqual(read_csv(self.path), [('id', 'name'), (1, 'one'), (2, 'two')])
+        self.assertTrue(os.path.exists(csv_cache.cache_path(self.path)))
+
+        # a changed file is parsed again, even when its size stayed the same
+        self.write_csv('id,name\n1,one\n2,owt\n', mtime_ns=10 ** 18 + 1)
+
+        self.assertEqual(read_csv(self.path), [('id', 'name'), (1, 'one'), (2, 'owt')])
+
+        # a touched file is hashed once, and comes from the cache from then on
+        os.utime(self.path, ns=(2 * 10 ** 18, 2 * 10 ** 18))
+        with mock.patch('data.v2.csv_cache.parse_csv') as parse_csv, \
+                mock.patch('data.v2.csv_cache.file_hash', wraps=csv_cache.file_hash) as file_hash:
+            for _ in range(2):
+                self.assertEqual(
+                    read_csv(self.path), [('id', 'name'), (1, 'one'), (2, 'owt')])
+
+        parse_csv.assert_not_called()
+        self.assertEqual(file_hash.call_count, 1)
+
+
+class MarkupTests(SimpleTestCase):
+    """ The prose renderers, against the implementations they replaced """
+
+    prose = ('[]{move:dragon-tail} will effect the opponents [HP]{mechanic:hp}, '
+             'like [Thunder Wave]{move:thunder-wave} does.')
+
+    @staticmethod
+    def scrub_str(string):
+        # The earlier scrub_str of data/v2/build.py
+        groups = re.findall(r"\[(.*?)\]\{(.*?)\}", string)
+        for group in groups:
+            if group[0]:
+                sub = group[0]
+            else:
+                sub = group[1].split(":")[1]
+                sub = sub.replace("-", " ")
+            string = re.sub(r"\[.*?\]\{.*?\}", sub, string, 1)
+        return string
+
+    @staticmethod
+    def link(string):
+        # The earlier link of make-database.py
+        def replace_func(match):
+            text = match.group(1) if match.group(1) else match.group(3)
+            return '<a href="{}">{}</a>'.format(match.group(2), text)
+
+        return re.sub(r"\[(.*?)\]{(.*?\:(.*?))}", replace_func, string)
+
+    def marked_up_fields(self):
+        for file_name in sorted(os.listdir(DATA_LOCATION)):
+            if file_name.endswith('_prose.csv'):
+                with open(os.path.join(DATA_LOCATION, file_name), encoding='utf8') as csv_file:
+                    for row in csv.reader(csv_file):
+                        for field in row:
+                            if ']{' in field:
+                                yield field
+
+    def test_render_plain(self):
+
+        self.assertEqual(
+            render_plain(self.prose),
+            'dragon tail will effect the opponents HP, like Thunder Wave does.')
+
+        fields = list(self.marked_up_fields())
+
+        self.assertGreater(len(fields), 1000)
+        for field in fields:
+            self.assertEqual(render_plain(field), self.scrub_str(field))
+
+    def test_render_html(self):
+
+        self.assertEqual(
+            render_html(self.prose),
+            '<a href="move:dragon-tail">dragon-tail</a> will effect the opponents '
+            '<a href="mechanic:hp">HP</a>, like '
+            '<a href="move:thunder-wave">Thunder Wave</a> does.')
+
+        for field in self.marked_up_fields():
+            self.assertEqual(render_html(field), self.link(field))
+
+    def test_render_names(self):
+
+        names = {('move', 'dragon-tail'): 'Drachenrute', ('move', 'thunder-wave'): 'Donnerwelle'}
+
+        # links without a localized name are rendered as plain text
+        self.assertEqual(
+            render_names(self.prose, names),
+            'Drachenrute will effect the opponents HP, like Donnerwelle does.')
+        self.assertEqual(render_names(self.prose, {}), render_plain(self.prose))
+
+
+class SnapshotTests(TransactionTestCase):
+    """ Snapshots restore into the database itself, outside of a test transaction """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_snapshot_round_trip(self):
+
+        Language.objects.create(name='lang for snapshot', official=True, order=1)
+        path = create_snapshot(self.directory)
+
+        # named after the data in data/v2/csv
+        self.assertIn(corpus_hash(DATA_LOCATION)[:12], os.path.basename(path))
+        self.assertEqual(find_snapshot(self.directory), path)
+
+        Language.objects.all().delete()
+        Language.objects.create(name='lang after snapshot', official=True, order=2)
+
+        stdout = StringIO()
+        call_command('restore_data', self.directory, stdout=stdout)
+
+        self.assertEqual(stdout.getvalue().strip(), 'restored %s' % path)
+        self.assertEqual(
+            list(Language.objects.values_list('name', flat=True)), ['lang for snapshot'])
+
+    def test_snapshot_of_other_data(self):
+
+        Language.objects.create(name='lang for snapshot', official=True, order=1)
+        stale_path = os.path.join(
+            self.directory, os.path.basename(create_snapshot(self.directory)).replace(
+                corpus_hash(DATA_LOCATION)[:12], 'otherversion'))
+        os.rename(find_snapshot(self.directory), stale_path)
+
+        # not picked up for the current data, so the caller builds instead
+        with self.assertRaises(CommandError):
+            call_command('restore_data', self.directory, stdout=StringIO())
+
+        # restored when asked for by name, with a warning
+        Language.objects.all().delete()
+        stderr = StringIO()
+        call_command('restore_data', stale_path, stdout=StringIO(), stderr=stderr)
+
+        self.assertIn('does not match the current data', stderr.getvalue())
+        self.assertEqual(Language.objects.count(), 1)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'shadow builds need PostgreSQL')
+class ShadowBuildTests(TransactionTestCase):
+    """ Shadow builds move tables between schemas, outside of a test transaction """
+
+    def test_shadow_build_after_recorded_version(self):
+
+        DataVersion.objects.create(version='version before')
+        Language.objects.create(name='lang before', official=True, order=1)
+
+        with shadow_schema(built_models()):
+            Language.objects.create(name='lang in shadow', official=True, order=1)
+
+        # the recorded version stays in place for the build to replace
+        self.assertEqual(
+            list(Language.objects.values_list('name', flat=True)), ['lang in shadow'])
+        self.assertEqual(DataVersion.current(), 'version before')
+
+    def test_shadow_build_documents(self):
+
+        # the documents of the first build are rendered into the second one's shadow
+        with mock.patch('data.v2.build.BUILD_STAGES', (('languages', _build_languages, ()),)):
+            for _ in range(2):
+                build_all(shadow=True)
+
+                self.assertEqual(DataVersion.current(), corpus_hash(DATA_LOCATION))
+                self.assertEqual(
+                    ResourceDocument.objects.filter(resource='language').count(),
+                    Language.objects.count())
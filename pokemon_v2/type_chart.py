@@ -0,0 +1,73 @@
+from .datacache import cached_for_data_version
+from .models import Type, TypeEfficacy
+
+# pylint: disable=redefined-builtin
+
+
+class TypeChart():
+    """
+    The damage factors between types as a matrix. factors[attacker][defender] is a
+    percentage like TypeEfficacy.damage_factor, rows and columns follow types.
+    Pairs without a TypeEfficacy row deal regular damage.
+    """
+
+    def __init__(self, types, efficacies):
+        self.types = tuple(types)
+        self.positions = {type.pk: position for position, type in enumerate(self.types)}
+
+        factors = [[100] * len(self.types) for _ in self.types]
+        for damage_type_id, target_type_id, damage_factor in efficacies:
+            factors[self.positions[damage_type_id]][self.positions[target_type_id]] = \
+                damage_factor
+        self.factors = tuple(tuple(row) for row in factors)
+
+    @classmethod
+    def load(cls):
+        efficacies = list(TypeEfficacy.objects.values_list(
+            'damage_type_id', 'target_type_id', 'damage_factor'))
+        type_ids = {damage_type_id for damage_type_id, target_type_id, factor in efficacies}
+        type_ids.update(target_type_id for damage_type_id, target_type_id, factor in efficacies)
+        types = Type.objects.filter(pk__in=type_ids).only('id', 'name').order_by('id')
+
+        return cls(types, efficacies)
+
+    def damage_to(self, type_id):
+        """
+        Returns (type, factor) for each type, the factor being the damage type_id
+        deals to it.
+        """
+        position = self.positions.get(type_id)
+        if position is None:
+            return []
+        return list(zip(self.types, self.factors[position]))
+
+    def damage_from(self, type_id):
+        """
+        Returns (type, factor) for each type, the factor being the damage it deals
+        to type_id.
+        """
+        position = self.positions.get(type_id)
+        if position is None:
+            return []
+        return [(type, row[position]) for type, row in zip(self.types, self.factors)]
+
+    def defensive_multipliers(self, type_ids):
+        """
+        Returns (type, multiplier) for each type, the multiplier being the damage it
+        deals to a defender of all of type_ids. That is the product of their columns.
+        """
+        multipliers = [1.0] * len(self.types)
+
+        for type_id in type_ids:
+            position = self.positions.get(type_id)
+            if position is not None:
+                multipliers = [
+                    multiplier * row[position] / 100
+                    for multiplier, row in zip(multipliers, self.factors)
+                ]
+
+        return list(zip(self.types, multipliers))
+
+
+def type_chart():
+    return cached_for_data_version('type_chart', TypeChart.load)
@@ -8,6 +8,7 @@ from django.conf.urls import include, url
 
 from rest_framework import routers
 from pokemon_v2.api import *
+from pokemon_v2.renderers import NDJSONRenderer
 
 # pylint: disable=invalid-name
 
@@ -69,8 +70,18 @@ router.register(r"version-group", VersionGroupResource)
 #
 ###########################
 
-urlpatterns = [
+# Before the router's urls, whose detail routes with a format suffix match them too
+export_urlpatterns = [
+    url(r'^api/v2/%s/export\.ndjson$' % prefix,
+        viewset.as_view({'get': 'export'}, basename=basename, detail=False,
+                        renderer_classes=(NDJSONRenderer,)),
+        name='%s-export' % basename)
+    for prefix, viewset, basename in router.registry
+]
+
+urlpatterns = export_urlpatterns + [
     url(r'^api/v2/', include(router.urls)),
     url(r'^api/v2/pokemon/(?P<pokemon_id>\d+)/encounters',
-        PokemonEncounterView.as_view(), name='pokemon_encounters')
+        PokemonEncounterView.as_view(), name='pokemon_encounters'),
+    url(r'^api/v2/type-matchup/$', TypeMatchupView.as_view(), name='type_matchup')
 ]